@@ -4,15 +4,26 @@ Gerador de Apresentações PowerPoint com IA
 """
 
 import os
+import collections
+import json
 import logging
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, g, stream_with_context
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 from config import config
 import threading
 import time
 import shutil
-from utils import check_and_install_missing_packages, extract_pdf_images
+from src.document_processor import run_job, settings_from_config
+from src.job_executor import JobCancelledError, JobExecutor, QueueFullError, notify_parent
+from src.job_notifier import JobNotifier
+from src.job_store import JobStore, ProgressReporter, CANCELLED, COMPLETED, FAILED, QUEUED
+from src.result_cache import ResultCache, file_digest
+from src.template_processor import TemplateRegistry
+from src.upload_store import ChunkedUploadStore, UploadOffsetError
+from src.storage_manager import StorageManager
+from src.metrics import PipelineMetrics
+from src import lazy_imports
 
 # Configure logging
 logging.basicConfig(
@@ -21,592 +32,231 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def create_app(config_name=None):
-    """Application factory pattern"""
+def create_app(config_name=None, test_config=None):
+    """
+    Application factory pattern
+
+    Args:
+        config_name: Nome da configuração (padrão: FLASK_ENV)
+        test_config: Valores que substituem os da configuração (ex.: nos testes)
+    """
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'default')
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    if test_config:
+        app.config.update(test_config)
     config[config_name].init_app(app)
     
-    # Função para processamento de documentos em background
-    def process_document_async(file_path, output_filename, template_path=None):
+    # Bibliotecas de PDF/PPTX importadas em segundo plano: a aplicação já
+    # responde enquanto isso
+    if app.config['PREWARM_IMPORTS']:
+        lazy_imports.prewarm()
+    
+    # Avisos de progresso e conclusão para os streams SSE, sem consultar o banco em intervalos
+    job_notifier = JobNotifier()
+    app.extensions['job_notifier'] = job_notifier
+    
+    # Processamento de documentos (CPU-bound): processos worker de longa
+    # duração (com os templates e fontes em cache), trocados quando um job
+    # excede o tempo limite ou é cancelado. Os workers nascem do forkserver
+    # com o pipeline e as bibliotecas já importados.
+    job_executor = JobExecutor(
+        max_workers=app.config['WORKER_PROCESSES'],
+        max_queue=app.config['JOB_QUEUE_SIZE'],
+        retry_after=app.config['QUEUE_RETRY_AFTER'],
+        timeout=app.config['PROCESSING_TIMEOUT'],
+        memory_limit=app.config['JOB_MEMORY_LIMIT'],
+        max_jobs_per_worker=app.config['WORKER_MAX_JOBS'],
+        preload=['src.document_processor', *lazy_imports.HEAVY_MODULES] if app.config['PREWARM_IMPORTS'] else (),
+        on_event=job_notifier.notify
+    )
+    app.extensions['job_executor'] = job_executor
+    
+    # Registro persistente de jobs e progresso
+    job_db_path = os.path.join(app.root_path, app.config['JOB_DB_PATH'])
+    job_store = JobStore(job_db_path)
+    app.extensions['job_store'] = job_store
+    
+    # Cache de resultados por conteúdo (documento + template + configurações)
+    result_cache = ResultCache(
+        os.path.join(app.root_path, app.config['RESULT_CACHE_DIR']),
+        app.config['RESULT_CACHE_MAX_BYTES']
+    )
+    app.extensions['result_cache'] = result_cache
+    
+    # Templates registrados por hash, com catálogo de layouts pré-calculado
+    template_registry = TemplateRegistry(os.path.join(app.root_path, app.config['TEMPLATE_STORE_DIR']))
+    template_registry.register_directory(os.path.join(app.root_path, app.config['TEMPLATE_LIBRARY_DIR']))
+    app.extensions['template_registry'] = template_registry
+    
+    # Sessões de upload em partes (arquivos maiores que MAX_CONTENT_LENGTH)
+    upload_store = ChunkedUploadStore(
+        os.path.join(app.root_path, app.config['UPLOAD_SESSION_DIR']),
+        app.config['MAX_UPLOAD_SIZE'],
+        app.config['UPLOAD_SESSION_TTL']
+    )
+    app.extensions['upload_store'] = upload_store
+    
+    # Métricas do processo (expostas em /metrics no formato do Prometheus)
+    metrics = PipelineMetrics(queue_depth=lambda: job_executor.pending)
+    app.extensions['metrics'] = metrics
+    
+    def pipeline_settings():
         """
-        Função que processa um documento e cria um PowerPoint
-        Extrai o texto do PDF e cria slides básicos
-        Parâmetros:
-          file_path: Caminho do arquivo de entrada (PDF, DOCX, etc)
-          output_filename: Nome do arquivo de saída (sem extensão)
-          template_path: Caminho para um arquivo PPTX de template (opcional)
+        Configurações enviadas ao worker junto com o job
+        Como alteram o PPTX gerado, também fazem parte da chave do cache de resultados
         """
-        logger.info(f"Iniciando processamento assíncrono para {file_path}")
-        
-        # Importar bibliotecas no escopo da função para não afetar o tempo de inicialização
+        return settings_from_config(app.config, app.root_path)
+    
+    def discard_partial_output(output_dir, output_filename):
+        """Remove o PPTX e as imagens de um job cujo processo foi encerrado"""
+        shutil.rmtree(os.path.join(output_dir, f"images_{output_filename}"), ignore_errors=True)
         try:
-            import PyPDF2
-            import pdfplumber
-            from pptx import Presentation
-            from pptx.util import Inches, Pt
-            from pptx.dml.color import RGBColor
-            import re
-        except ImportError as e:
-            logger.error(f"Erro ao importar bibliotecas: {e}")
-            return False
-            
-        # Criar um arquivo de saída
-        output_dir = os.path.join(app.root_path, 'static', 'outputs')
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"{output_filename}.pptx")
+            os.remove(os.path.join(output_dir, f"{output_filename}.pptx"))
+        except OSError:
+            pass
+    
+    def submit_job(job_id, file_path, output_dir, output_filename, template_path=None, cache_key=None):
+        """Submete um job registrado ao pool; QueueFullError é repassada ao chamador"""
+        # Cada progresso gravado pelo worker é repassado aos streams SSE do job
+        reporter = ProgressReporter(job_db_path, job_id, on_update=notify_parent,
+                                     instance_id=job_executor.instance_id)
+        future = job_executor.submit(
+            run_job,
+            file_path, output_dir, output_filename, template_path, reporter, pipeline_settings(),
+            job_id=job_id
+        )
         
-        try:
-            # Verificar a extensão do arquivo para saber como processá-lo
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            # Extrair texto do documento baseado no tipo
-            text_content = []
-            page_metrics = []  # Armazenar métricas de cada página para análise
-            
-            if file_ext == '.pdf':
-                # Extrair texto do PDF usando pdfplumber para melhor extração de estrutura
-                image_paths = []  # Lista para armazenar caminhos das imagens extraídas
-                
-            # Tentar extrair imagens do PDF
-                try:
-                    # Criar diretório temporário para imagens extraídas
-                    image_dir = os.path.join(output_dir, f"images_{output_filename}")
-                    os.makedirs(image_dir, exist_ok=True)
-                    
-                    # Chamar função para extrair imagens - usando a função definida neste escopo
-                    image_paths = extract_pdf_images(file_path, image_dir)
-                    if image_paths:
-                        logger.info(f"Extraídas {len(image_paths)} imagens do PDF")
-                except Exception as img_ex:
-                    logger.error(f"Erro ao extrair imagens: {img_ex}")
-                
-                try:
-                    with pdfplumber.open(file_path) as pdf:
-                        num_pages = len(pdf.pages)
-                        logger.info(f"PDF tem {num_pages} páginas")
-                        
-                        # Extrair texto de cada página com preservação de estrutura
-                        for page_num in range(min(num_pages, 20)):  # Limitar a 20 páginas
-                            page = pdf.pages[page_num]
-                            
-                            # Extrair métricas de texto para detectar cabeçalhos
-                            page_text = ""
-                            structured_lines = []
-                            
-                            # Extrair texto com informações de fonte
-                            text_objects = page.extract_words(x_tolerance=3, y_tolerance=3, keep_blank_chars=False, 
-                                                           use_text_flow=True, extra_attrs=['size', 'fontname'])
-                            
-                            # Agrupar palavras em linhas preservando informações de tamanho da fonte
-                            current_y = None
-                            current_line = []
-                            current_size = None
-                            current_font = None
-                            
-                            for word in text_objects:
-                                if current_y is None or abs(word['top'] - current_y) > 5:
-                                    # Nova linha detectada
-                                    if current_line:
-                                        line_text = " ".join([w['text'] for w in current_line])
-                                        structured_lines.append({
-                                            'text': line_text,
-                                            'size': current_size,
-                                            'font': current_font,
-                                            'y': current_y,
-                                            'page': page_num
-                                        })
-                                        page_text += line_text + "\n"
-                                    
-                                    current_line = [word]
-                                    current_y = word['top']
-                                    current_size = word['size']
-                                    current_font = word['fontname']
-                                else:
-                                    # Continuar mesma linha
-                                    current_line.append(word)
-                                    # Atualizar tamanho de fonte se for maior (provável destaque)
-                                    if word['size'] > current_size:
-                                        current_size = word['size']
-                            
-                            # Adicionar última linha
-                            if current_line:
-                                line_text = " ".join([w['text'] for w in current_line])
-                                structured_lines.append({
-                                    'text': line_text,
-                                    'size': current_size,
-                                    'font': current_font,
-                                    'y': current_y,
-                                    'page': page_num
-                                })
-                                page_text += line_text + "\n"
-                            
-                            text_content.append(page_text)
-                            page_metrics.append(structured_lines)
-                            
-                            # Log para debug
-                            if page_num == 0:
-                                preview = page_text[:200] + "..." if len(page_text) > 200 else page_text
-                                logger.info(f"Amostra de texto extraído com pdfplumber: {preview}")
-                                logger.info(f"Estrutura de fonte identificada: {len(structured_lines)} linhas")
-                    
-                    # Adicionar informação sobre imagens encontradas aos metadados
-                    if image_paths:
-                        # Mapear imagens para páginas com base nos nomes de arquivo
-                        images_by_page = {}
-                        for img_path in image_paths:
-                            img_name = os.path.basename(img_path)
-                            # Extrair número da página do nome da imagem (formato: image_p{page_num}_{img_index}.{ext})
-                            match = re.search(r'image_p(\d+)_', img_name)
-                            if match:
-                                page_num = int(match.group(1)) - 1  # Ajustar para base 0
-                                if page_num not in images_by_page:
-                                    images_by_page[page_num] = []
-                                images_by_page[page_num].append(img_path)
-                        
-                        # Adicionar metadados de imagens à estrutura
-                        for page_num, page_images in images_by_page.items():
-                            if page_num < len(text_content):
-                                text_content[page_num] += f"\n[{len(page_images)} imagens encontradas nesta página]\n"
-                                
-                                # Associar imagens com texto próximo
-                                if page_num < len(page_metrics):
-                                    page_metrics[page_num].append({
-                                        'text': f"[IMAGENS: {len(page_images)}]",
-                                        'size': 12,
-                                        'font': 'Image',
-                                        'y': 999999,  # Valor alto para ser processado por último
-                                        'page': page_num,
-                                        'images': page_images
-                                    })
-                except Exception as pdfex:
-                    logger.error(f"Erro ao processar PDF com pdfplumber: {pdfex}")
-                    logger.info("Tentando método alternativo com PyPDF2...")
-                    
-                    # Método alternativo com PyPDF2 caso pdfplumber falhe
-                    with open(file_path, 'rb') as pdf_file:
-                        reader = PyPDF2.PdfReader(pdf_file)
-                        num_pages = len(reader.pages)
-                        
-                        # Extrair texto de cada página
-                        for page_num in range(min(num_pages, 20)):  # Limitar a 20 páginas
-                            page = reader.pages[page_num]
-                            extracted_text = page.extract_text() or ""
-                            text_content.append(extracted_text)
-                            
-                            # Para compatibilidade com o pipeline
-                            lines = extracted_text.split('\n')
-                            structured_lines = [{'text': line, 'size': 12, 'font': 'Unknown', 'page': page_num} for line in lines]
-                            
-                            # Adicionar informações sobre imagens, se existirem
-                            if page_num in images_by_page:
-                                page_images = images_by_page[page_num]
-                                extracted_text += f"\n[{len(page_images)} imagens encontradas]\n"
-                                structured_lines.append({
-                                    'text': f"[IMAGENS: {len(page_images)}]",
-                                    'size': 12,
-                                    'font': 'Image',
-                                    'page': page_num,
-                                    'images': page_images
-                                })
-                            
-                            page_metrics.append(structured_lines)
-                            
-                            # Log para debug
-                            if page_num == 0:
-                                preview = extracted_text[:200] + "..." if len(extracted_text) > 200 else extracted_text
-                                logger.info(f"Amostra de texto extraído com PyPDF2: {preview}")
-            
-            elif file_ext in ['.docx', '.txt', '.md']:
-                # Para outros formatos, ler como texto simples (implementação básica)
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as text_file:
-                    text_content.append(text_file.read())
-            else:
-                logger.error(f"Formato de arquivo não suportado: {file_ext}")
-                return False
+        def on_done(f):
+            try:
+                record_outcome(f)
+            finally:
+                job_notifier.notify(job_id)
+                # A vaga liberada por este job vai primeiro para os retomados que não couberam na fila
+                if recovery_backlog:
+                    resubmit_recovered()
+        
+        def record_outcome(f):
+            # Processo encerrado antes do fim (cancelamento, tempo limite, falta de
+            # memória): descartar o que ele deixou pela metade
+            if f.cancelled() or f.exception() is not None:
+                discard_partial_output(output_dir, output_filename)
+            if f.cancelled() or isinstance(f.exception(), JobCancelledError):
+                return  # já registrado por api_cancel_job
             
-            # Processar o texto extraído para criar slides
-            # Aqui seria o lugar para chamar a API de IA para organizar o conteúdo
-            # Por enquanto, vamos fazer uma implementação simples dividindo o texto em partes
+            # Falhas que impedem o worker de registrar o erro (ex.: processo morto)
+            if f.exception() is not None:
+                job_store.fail(job_id, f.exception())
+                metrics.observe_failure(f.exception())
+                return
             
-            # Criar uma apresentação (baseada em template se fornecido)
-            if template_path and os.path.exists(template_path):
-                logger.info(f"Usando template: {template_path}")
-                try:
-                    prs = Presentation(template_path)
-                    # Usar template existente
-                    logger.info(f"Template carregado com {len(prs.slides)} slides existentes")
-                except Exception as te:
-                    logger.error(f"Erro ao carregar template: {str(te)}. Usando apresentação padrão.")
-                    prs = Presentation()
-            else:
-                prs = Presentation()
+            # Tempos por etapa e volumes medidos no worker
+            stats = f.result() if not f.cancelled() else None
+            if stats:
+                metrics.observe_job(stats)
             
-            # Slide de título (adicionar ou usar o primeiro slide existente)
-            if len(prs.slides) > 0 and template_path:
-                # Usar o primeiro slide do template como título
-                slide = prs.slides[0]
+            # Guardar no cache apenas resultados concluídos com sucesso
+            if cache_key:
+                job = job_store.get(job_id)
+                if job and job['status'] == COMPLETED:
+                    result_cache.put(cache_key, os.path.join(output_dir, f"{output_filename}.pptx"))
+        
+        future.add_done_callback(on_done)
+        return future
+    
+    def start_job(filename, file_path, template_path=None, document_digest=None):
+        """
+        Registra o job de um documento já salvo e o envia ao pool, ou conclui na
+        hora se o resultado já estiver no cache
+
+        Args:
+            document_digest: SHA-256 do documento, se já calculado (evita reler o arquivo)
+
+        Returns:
+            Tupla (job_id, acerto no cache de resultados)
+
+        Raises:
+            QueueFullError: se a fila estiver cheia (o job é marcado como falho)
+        """
+        output_filename = os.path.splitext(filename)[0]
+        output_dir = os.path.join(app.root_path, app.config['OUTPUT_FOLDER'])
+        job_id = job_store.create(filename, file_path, output_dir, output_filename, template_path)
+        
+        # Documento + template + configurações já processados: reutilizar o resultado
+        cache_key = ResultCache.make_key(file_path, template_path, pipeline_settings(), document_digest)
+        output_path = os.path.join(output_dir, f"{output_filename}.pptx")
+        if result_cache.get(cache_key, output_path):
+            job_store.set_stage(job_id, 'completed')
+            return job_id, True
+        
+        try:
+            submit_job(job_id, file_path, output_dir, output_filename, template_path, cache_key)
+        except QueueFullError as qf:
+            logger.warning(f"Fila cheia ({job_executor.pending} jobs), rejeitando {filename}")
+            job_store.fail(job_id, qf)
+            metrics.observe_failure(qf)
+            raise
+        return job_id, False
+    
+    # Jobs na fila antes de um reinício que ainda não couberam na fila do executor
+    recovery_backlog = collections.deque()
+    recovery_lock = threading.RLock()
+    
+    def recover_jobs():
+        """Retoma os jobs que ficaram na fila antes de um reinício"""
+        with recovery_lock:
+            recovery_backlog.extend(job_store.recover_interrupted(job_executor.instance_id))
+        resubmit_recovered()
+    
+    def resubmit_recovered():
+        """
+        Submete os jobs retomados, na ordem em que foram criados, até a fila
+        encher; os restantes são submetidos quando algum job terminar
+        """
+        with recovery_lock:
+            while recovery_backlog:
+                job = job_store.get(recovery_backlog[0]['id'])
+                if job is None or job['status'] != QUEUED:
+                    recovery_backlog.popleft()  # cancelado ou removido enquanto aguardava
+                    continue
+                # Mesma chave de start_job: o resultado retomado também entra no cache
                 try:
-                    for shape in slide.shapes:
-                        if shape.has_text_frame:
-                            if shape == slide.shapes.title:
-                                shape.text = f"{output_filename} - Apresentação"
-                            else:
-                                shape.text = "Gerado automaticamente por DocToPPT"
-                            break
-                except Exception as e:
-                    logger.warning(f"Não foi possível editar o slide de título do template: {str(e)}")
-            else:
-                # Criar slide de título
-                title_slide_layout = prs.slide_layouts[0]
-                slide = prs.slides.add_slide(title_slide_layout)
-                title = slide.shapes.title
-                subtitle = slide.placeholders[1]
-                
-                title.text = f"{output_filename} - Apresentação"
-                subtitle.text = "Gerado automaticamente por DocToPPT"
-            
-            # Adicionar slides com o conteúdo extraído
-            bullet_slide_layout = prs.slide_layouts[1]
-            
-            # Processar o texto extraído e separar em partes significativas usando
-            # informações de tamanho de fonte e estrutura detectada
-            sections = []
-            current_section = {"title": "Introdução", "content": []}
-            
-            # Analisar as métricas para identificar padrões de cabeçalhos
-            if page_metrics and len(page_metrics) > 0:
-                # Identificar tamanhos de fonte comuns para uso na detecção de cabeçalhos
-                all_sizes = []
-                for page in page_metrics:
-                    for line in page:
-                        if 'size' in line and line['size']:
-                            all_sizes.append(line['size'])
-                
-                if all_sizes:
-                    # Calcular estatísticas sobre tamanhos de fonte
-                    avg_size = sum(all_sizes) / len(all_sizes)
-                    larger_sizes = sorted([s for s in all_sizes if s > avg_size])
-                    
-                    # Definir limites para cabeçalhos baseados na análise estatística
-                    heading_size_threshold = avg_size * 1.1 if larger_sizes else avg_size
-                    logger.info(f"Tamanho médio de fonte: {avg_size:.2f}, limiar para cabeçalhos: {heading_size_threshold:.2f}")
-                    
-                    # Padrões regulares que indicam cabeçalhos
-                    heading_patterns = [
-                        r'^[0-9]+\.\s+',           # Números de seção: "1. Título"
-                        r'^[A-Z\s]{5,}$',          # Texto todo em maiúsculas
-                        r'^(CAPÍTULO|SEÇÃO|PARTE)', # Palavras específicas
-                        r'^[IVX]+\.\s+'            # Numerais romanos: "IV. Título"
-                    ]
-                    
-                    # Processar as páginas com métricas
-                    page_num = 0
-                    for page in page_metrics:
-                        # Adicionar marcador de página para melhor segmentação
-                        if page_num > 0 and current_section["content"]:
-                            current_section["content"].append("\n[Nova Página]\n")
-                        
-                        for line in page:
-                            text = line['text'].strip()
-                            if not text:
-                                continue
-                                
-                            is_heading = False
-                            
-                            # Verificar pelo tamanho da fonte
-                            if 'size' in line and line['size'] and line['size'] > heading_size_threshold:
-                                is_heading = True
-                                logger.debug(f"Cabeçalho detectado por tamanho de fonte: {text} ({line['size']})")
-                            
-                            # Verificar pelos padrões de texto
-                            if not is_heading and len(text) < 80:  # Cabeçalhos geralmente são curtos
-                                for pattern in heading_patterns:
-                                    if re.match(pattern, text):
-                                        is_heading = True
-                                        logger.debug(f"Cabeçalho detectado por padrão: {text}")
-                                        break
-                            
-                            # Verificar outros indicadores (numeração, etc)
-                            if not is_heading and len(text) < 60:
-                                if (text.isupper() or text.endswith(':') or
-                                    any(text.startswith(prefix) for prefix in ['CAPÍTULO', 'SEÇÃO', 'INTRODUÇÃO', 'CONCLUSÃO'])):
-                                    is_heading = True
-                            
-                            # Tratar como cabeçalho ou conteúdo
-                            if is_heading:
-                                # Começar nova seção se a atual já tem conteúdo
-                                if current_section["content"]:
-                                    sections.append(current_section)
-                                    current_section = {"title": text, "content": []}
-                                else:
-                                    # Atualizar o título da seção atual se ainda não tem conteúdo
-                                    current_section["title"] = text
-                            else:
-                                # Adicionar ao conteúdo da seção atual
-                                current_section["content"].append(text)
-                        
-                        page_num += 1
-                        
-                # Log da estrutura detectada
-                logger.info(f"Estrutura detectada: {len(sections) + 1} seções")
-            else:
-                # Fallback para o método anterior de detecção simples de seções
-                logger.warning("Usando método alternativo para detecção de seções")
-                for page_text in text_content:
-                    lines = page_text.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        # Detectar possíveis títulos (linhas curtas, todas em maiúsculas, etc.)
-                        if (len(line) < 60 and (line.isupper() or line.endswith(':') or 
-                                            line.startswith('CAPÍTULO') or line.startswith('SEÇÃO'))):
-                            # Começar nova seção se a atual já tem conteúdo
-                            if current_section["content"]:
-                                sections.append(current_section)
-                                current_section = {"title": line, "content": []}
-                        else:
-                            # Adicionar linha ao conteúdo da seção atual
-                            current_section["content"].append(line)
-            
-            # Adicionar a última seção
-            if current_section["content"]:
-                sections.append(current_section)
-            
-            # Se não conseguimos identificar seções, criar uma divisão artificial
-            if not sections:
-                sections = [{"title": "Conteúdo", "content": " ".join(text_content)}]
-                
-            # Dividir em chunks se o conteúdo for muito grande
-            processed_sections = []
-            for section in sections:
-                content = section["content"]
-                if isinstance(content, list):
-                    content = " ".join(content)
-                    
-                # Dividir em chunks para não sobrecarregar os slides
-                if len(content) > 800:
-                    chunks = [content[i:i+800] for i in range(0, len(content), 800)]
-                    for i, chunk in enumerate(chunks):
-                        title = section["title"]
-                        if i > 0:
-                            title += f" (cont. {i+1})"
-                        processed_sections.append({"title": title, "content": chunk})
-                else:
-                    processed_sections.append(section)
-            
-            # Determinar qual layout usar para os slides de conteúdo
-            # Preferir layouts do template, se disponível
-            content_layouts = []
-            if template_path and len(prs.slide_layouts) > 1:
-                # Usar layouts do template para os slides de conteúdo
-                # Coletar layouts que parecem adequados para conteúdo
-                for layout in prs.slide_layouts:
-                    # Verificar se o layout tem placeholder para título e conteúdo
-                    has_title = False
-                    has_content = False
-                    for placeholder in layout.placeholders:
-                        if placeholder.placeholder_format.type == 1:  # TITLE
-                            has_title = True
-                        if placeholder.placeholder_format.type in [2, 7]:  # BODY, CONTENT
-                            has_content = True
-                    
-                    if has_title and has_content:
-                        content_layouts.append(layout)
-            
-            # Se não encontrou layouts adequados no template, usar o padrão
-            if not content_layouts:
-                content_layouts = [prs.slide_layouts[1]]  # Layout de título e conteúdo padrão
-            
-            # Criar slides baseados nas seções processadas
-            for i, section in enumerate(processed_sections[:20]):  # Limitar a 20 slides
-                # Verificar se a seção contém imagens
-                has_images = False
-                section_images = []
-                
-                # Procurar por imagens no conteúdo
-                if isinstance(section["content"], list):
-                    for item in section["content"]:
-                        if isinstance(item, str) and "[IMAGENS:" in item:
-                            has_images = True
-                        if isinstance(item, dict) and "images" in item:
-                            has_images = True
-                            section_images.extend(item["images"])
-                            
-                # Escolher layout apropriado
-                layout_index = i % len(content_layouts)
-                
-                # Se tiver imagens, tentar encontrar um layout com placeholder para imagens
-                # Por enquanto, vamos usar layouts padrão pois não sabemos quais têm placeholder para imagem
-                layout = content_layouts[layout_index]
-                slide = prs.slides.add_slide(layout)
-                
-                # Encontrar placeholder para título
-                title = None
-                for shape in slide.placeholders:
-                    if shape.placeholder_format.type == 1:  # TITLE
-                        title = shape
-                        break
-                
-                # Encontrar placeholder para conteúdo
-                content = None
-                for shape in slide.placeholders:
-                    if shape.placeholder_format.type in [2, 7]:  # BODY, CONTENT
-                        content = shape
-                        break
-                
-                # Se não encontrou os placeholders esperados, pular este slide
-                if not title or not content:
-                    logger.warning(f"Layout {layout_index} não tem placeholders esperados, pulando.")
+                    cache_key = ResultCache.make_key(job['file_path'], job['template_path'], pipeline_settings())
+                except OSError as e:
+                    recovery_backlog.popleft()
+                    job_store.fail(job['id'], e)
+                    logger.warning(f"Job {job['id']} ({job['filename']}) não pôde ser retomado: {e}")
                     continue
-                
-                # Adicionar as imagens encontradas nesta seção
-                if section_images:
-                    # Adicionar até 2 imagens por slide
-                    images_to_add = section_images[:2]
-                    
-                    try:
-                        # Calcular posições para as imagens
-                        if len(images_to_add) == 1:
-                            # Uma imagem - posicionar à direita
-                            img_path = images_to_add[0]
-                            # Verificar se o arquivo existe
-                            if os.path.exists(img_path):
-                                # Adicionar imagem ao slide
-                                try:
-                                    left = Inches(5)  # Posição à direita
-                                    top = Inches(2)
-                                    width = Inches(4)  # Largura menor para não cobrir texto
-                                    slide.shapes.add_picture(img_path, left, top, width=width)
-                                    logger.info(f"Imagem adicionada ao slide {i+1}: {img_path}")
-                                except Exception as img_err:
-                                    logger.error(f"Erro ao adicionar imagem: {img_err}")
-                        else:
-                            # Múltiplas imagens - distribuir
-                            for idx, img_path in enumerate(images_to_add):
-                                if os.path.exists(img_path):
-                                    try:
-                                        # Posição ajustada para cada imagem
-                                        left = Inches(1 + (idx * 3))  # Espaçamento horizontal
-                                        top = Inches(4)  # Abaixo do conteúdo
-                                        width = Inches(3)  # Largura menor
-                                        slide.shapes.add_picture(img_path, left, top, width=width)
-                                        logger.info(f"Imagem {idx+1} adicionada ao slide {i+1}: {img_path}")
-                                    except Exception as img_err:
-                                        logger.error(f"Erro ao adicionar imagem {idx+1}: {img_err}")
-                    except Exception as ex:
-                        logger.error(f"Erro ao processar imagens para slide {i+1}: {ex}")
-                
-                title.text = section["title"]
-                
-                # Limitar o tamanho do texto para não sobrecarregar o slide
-                text_content = section["content"]
-                
-                # Converter para texto simples se for lista
-                if isinstance(text_content, list):
-                    # Processa o conteúdo para detectar listas e formatação
-                    formatted_content = []
-                    bullet_mode = False
-                    
-                    for line in text_content:
-                        # Detectar marcadores de lista
-                        if re.match(r'^[\s]*[•\-\*\+◦○●■]\s+', line) or re.match(r'^[\s]*[0-9]+[\.\)]\s+', line):
-                            if not bullet_mode:
-                                # Iniciar modo de lista
-                                bullet_mode = True
-                                if formatted_content and formatted_content[-1].strip():
-                                    formatted_content.append('')  # Linha em branco antes da lista
-                            # Remover o marcador e adicionar como item de lista com formato apropriado
-                            clean_line = re.sub(r'^[\s]*[•\-\*\+◦○●■]\s+', '', line)
-                            clean_line = re.sub(r'^[\s]*[0-9]+[\.\)]\s+', '', clean_line)
-                            formatted_content.append('• ' + clean_line.strip())
-                        else:
-                            # Terminar modo de lista se estiver ativo
-                            if bullet_mode and line.strip():
-                                bullet_mode = False
-                                formatted_content.append('')  # Linha em branco depois da lista
-                            formatted_content.append(line)
-                    
-                    # Juntar com quebras de linha
-                    text_content = "\n".join(formatted_content)
-                    
-                # Truncar se for muito longo
-                if len(text_content) > 1500:
-                    text_content = text_content[:1500] + "..."
-                
-                # Adicionar ao texto frame com formatação
-                tf = content.text_frame
-                tf.clear()
-                
-                # Verificar se o conteúdo contém marcadores de lista
-                if '• ' in text_content:
-                    # Dividir por linhas e adicionar parágrafos com nível apropriado
-                    lines = text_content.split('\n')
-                    first = True
-                    for line in lines:
-                        if first:
-                            p = tf.paragraphs[0]
-                            first = False
-                        else:
-                            p = tf.add_paragraph()
-                            
-                        # Detectar se é um item de lista
-                        if line.startswith('• '):
-                            p.text = line[2:]  # Remover o marcador
-                            p.level = 1  # Nível de recuo para item de lista
-                        else:
-                            p.text = line
-                            p.level = 0  # Nível normal para texto
-                else:
-                    # Texto simples sem formatação especial
-                    tf.text = text_content
-            
-            # Adicionar slide de conclusão
-            conclusion_layout = content_layouts[0]  # Usar primeiro layout de conteúdo
-            slide = prs.slides.add_slide(conclusion_layout)
-            
-            # Encontrar placeholders para título e conteúdo
-            title = None
-            content = None
-            for shape in slide.placeholders:
-                if shape.placeholder_format.type == 1:  # TITLE
-                    title = shape
-                elif shape.placeholder_format.type in [2, 7]:  # BODY, CONTENT
-                    content = shape
-            
-            if title and content:
-                title.text = "Conclusão"
-                content.text = "Obrigado!\n\nEste documento foi gerado automaticamente pelo DocToPPT."
-            
-            # Salvar a apresentação
-            prs.save(output_path)
-            
-            logger.info(f"Processamento concluído. Arquivo PowerPoint criado: {output_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Erro durante o processamento de documento: {str(e)}")
-            
-            # Criar arquivo de PowerPoint de erro para notificar o usuário
-            try:
-                prs = Presentation()
-                slide = prs.slides.add_slide(prs.slide_layouts[0])
-                title = slide.shapes.title
-                subtitle = slide.placeholders[1]
-                
-                title.text = "Erro no Processamento"
-                subtitle.text = f"Ocorreu um erro ao processar o documento: {str(e)}"
-                
-                prs.save(output_path)
-                logger.info(f"Arquivo de erro criado: {output_path}")
-                return True
-            except Exception as e2:
-                logger.error(f"Falha ao criar arquivo de erro: {str(e2)}")
-                return False
+                output_path = os.path.join(job['output_dir'], f"{job['output_filename']}.pptx")
+                if result_cache.get(cache_key, output_path):
+                    recovery_backlog.popleft()
+                    job_store.set_stage(job['id'], 'completed')
+                    job_notifier.notify(job['id'])
+                    continue
+                try:
+                    submit_job(job['id'], job['file_path'], job['output_dir'],
+                               job['output_filename'], job['template_path'], cache_key)
+                except QueueFullError:
+                    logger.warning(f"Fila cheia, {len(recovery_backlog)} jobs retomados aguardam uma vaga")
+                    return
+                recovery_backlog.popleft()
+                logger.info(f"Job {job['id']} ({job['filename']}) resubmetido após reinício")
+    
+    # Efeitos colaterais de inicialização (retomada de jobs, tarefas em segundo
+    # plano, processos worker) só na primeira requisição: com o reloader do
+    # Werkzeug, create_app também roda no processo pai, que nunca atende requisições
+    startup_tasks = [job_executor.start, recover_jobs]
+    startup_lock = threading.Lock()
+    
+    @app.before_request
+    def run_startup_tasks():
+        if not startup_tasks:
+            return
+        with startup_lock:
+            while startup_tasks:
+                startup_tasks.pop(0)()
     
     # Create upload directory if it doesn't exist
     upload_folder = app.config['UPLOAD_FOLDER'].replace('/', os.sep)
@@ -615,14 +265,42 @@ def create_app(config_name=None):
     logger.info(f"Upload directory configured: {upload_dir}")
     
     # Create output directory for generated presentations
-    output_dir = os.path.join(app.root_path, 'static', 'outputs')
+    output_dir = os.path.join(app.root_path, app.config['OUTPUT_FOLDER'])
     os.makedirs(output_dir, exist_ok=True)
     logger.info(f"Output directory configured: {output_dir}")
     
+    # Expiração e cota dos arquivos dos jobs, varridos em segundo plano
+    storage = StorageManager(
+        upload_dir, output_dir, job_store,
+        ttl=app.config['STORAGE_TTL'],
+        quota_bytes=app.config['STORAGE_QUOTA_BYTES'],
+        upload_store=upload_store,
+        metrics=metrics,
+        job_history_ttl=app.config['JOB_HISTORY_TTL']
+    )
+    # Varredura iniciada na primeira requisição, como a retomada dos jobs
+    startup_tasks.append(lambda: storage.start(app.config['STORAGE_SWEEP_INTERVAL']))
+    app.extensions['storage'] = storage
+    
+    # Latência das rotas, rotulada pelo padrão da rota (ex.: /api/status/<filename>)
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+    
+    @app.after_request
+    def record_request_latency(response):
+        start = g.pop('request_start', None)
+        if start is not None and request.url_rule is not None and request.endpoint != 'metrics_endpoint':
+            metrics.http_duration.observe(
+                time.perf_counter() - start,
+                route=request.url_rule.rule, method=request.method, status=response.status_code
+            )
+        return response
+    
     # Error handlers
     @app.errorhandler(RequestEntityTooLarge)
     def handle_file_too_large(e):
-        flash('Arquivo muito grande. Tamanho máximo: 16MB', 'error')
+        flash(f"Arquivo muito grande. Tamanho máximo: {format_size(app.config['MAX_CONTENT_LENGTH'])}", 'error')
         return redirect(url_for('index')), 413
     
     @app.errorhandler(404)
@@ -635,6 +313,15 @@ def create_app(config_name=None):
         return render_template('error.html', error="Erro interno do servidor"), 500
     
     # Utility functions
+    @app.template_filter('filesize')
+    def format_size(size):
+        """Tamanho em bytes para exibição (ex.: 16MB, 1.5GB)"""
+        for unit in ('B', 'KB', 'MB'):
+            if size < 1024:
+                return f"{size:g}{unit}"
+            size = round(size / 1024, 1)
+        return f"{size:g}GB"
+    
     def allowed_file(filename):
         """Check if file extension is allowed"""
         if '.' not in filename:
@@ -656,7 +343,7 @@ def create_app(config_name=None):
     def upload():
         """Upload page and file handling"""
         if request.method == 'GET':
-            return render_template('upload.html')
+            return render_template('upload.html', templates=template_registry.list())
         
         # Log received form data
         logger.info(f"Upload request received. Content-Type: {request.content_type}")
@@ -699,26 +386,39 @@ def create_app(config_name=None):
                         logger.info(f"Confirmado: arquivo existe no caminho {file_path}")
                         flash(f'Arquivo {filename} enviado com sucesso!', 'success')
                         
-                        # Verificar se o usuário enviou um template
+                        # Verificar se o usuário enviou um template ou escolheu um já registrado
                         template_path = None
+                        template_id = request.form.get('template_id')
                         if template_file and template_file.filename:
                             template_filename = secure_filename(template_file.filename)
-                            template_path = os.path.join(upload_dir, f"template_{template_filename}")
+                            upload_template_path = os.path.join(upload_dir, f"template_{template_filename}")
                             try:
-                                template_file.save(template_path)
-                                logger.info(f"Template salvo: {template_path}")
+                                template_file.save(upload_template_path)
+                                template_id = template_registry.register(upload_template_path, template_filename)
+                                logger.info(f"Template salvo: {template_id}")
                             except Exception as te:
                                 logger.error(f"Erro ao salvar template: {str(te)}")
-                                template_path = None
+                                template_id = None
+                            finally:
+                                if os.path.exists(upload_template_path):
+                                    os.remove(upload_template_path)
+                        if template_id and template_registry.get(template_id):
+                            template_path = template_registry.path_for(template_id)
                             
-                        # Iniciar processamento em segundo plano
-                        output_filename = os.path.splitext(filename)[0]
-                        threading.Thread(
-                            target=process_document_async, 
-                            args=(file_path, output_filename, template_path)
-                        ).start()
+                        # Enviar para o pool de processamento em segundo plano
+                        try:
+                            job_id, cached = start_job(filename, file_path, template_path)
+                        except QueueFullError as qf:
+                            response = app.make_response((
+                                render_template('error.html', error='Servidor ocupado. Tente novamente em instantes.'),
+                                503
+                            ))
+                            response.headers['Retry-After'] = str(qf.retry_after)
+                            return response
                         
-                        return redirect(url_for('processing', filename=filename))
+                        if cached:
+                            return redirect(url_for('result', filename=filename))
+                        return redirect(url_for('processing', filename=filename, job=job_id))
                     else:
                         logger.error(f"Arquivo não encontrado após save: {file_path}")
                         flash('Erro: Arquivo não foi salvo corretamente', 'error')
@@ -748,7 +448,7 @@ def create_app(config_name=None):
             return redirect(url_for('upload'))
             
         # Se o arquivo existe, mostrar a página de processamento
-        return render_template('processing.html', filename=filename)
+        return render_template('processing.html', filename=filename, job_id=request.args.get('job'))
     
     @app.route('/config')
     def config_page():
@@ -777,15 +477,16 @@ def create_app(config_name=None):
         
         # Verificar se o arquivo de saída existe
         output_filename = os.path.splitext(secure_name)[0]
-        output_path = os.path.join(app.root_path, 'static', 'outputs', f"{output_filename}.pptx")
+        output_path = os.path.join(app.root_path, app.config['OUTPUT_FOLDER'], f"{output_filename}.pptx")
         
         if not os.path.exists(output_path):
             logger.warning(f"Arquivo de saída não encontrado: {output_path}")
             flash('A apresentação ainda está sendo processada. Por favor aguarde.', 'warning')
             return redirect(url_for('processing', filename=filename))
         
-        # Se o arquivo existe, mostrar a página de resultado
-        output_url = url_for('static', filename=f'outputs/{output_filename}.pptx')
+        # Se o arquivo existe, mostrar a página de resultado (e adiar a expiração)
+        storage.touch(output_filename)
+        output_url = url_for('download', filename=filename)
         logger.info(f"Mostrando resultado para {filename}, download em: {output_url}")
         
         return render_template('result.html', 
@@ -793,23 +494,65 @@ def create_app(config_name=None):
                                output_url=output_url,
                                file_size=os.path.getsize(output_path))
     
+    # ETag (SHA-256 do conteúdo) por arquivo, recalculada só quando mtime/tamanho mudam
+    output_etags = {}
+    
+    def content_etag(path):
+        st = os.stat(path)
+        cached = output_etags.get(path)
+        if cached and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        etag = file_digest(path).hexdigest()
+        if len(output_etags) >= 1024:
+            output_etags.clear()
+        output_etags[path] = ((st.st_mtime_ns, st.st_size), etag)
+        return etag
+    
     @app.route('/download/<filename>')
     def download(filename):
-        """Download do arquivo PowerPoint gerado"""
+        """
+        Download do arquivo PowerPoint gerado
+
+        Suporta GET condicional (ETag do conteúdo / If-None-Match) e Range
+        (downloads retomáveis). Com DOWNLOAD_OFFLOAD a resposta leva apenas os
+        cabeçalhos e o servidor web na frente (X-Accel-Redirect no nginx,
+        X-Sendfile no Apache/lighttpd) envia os bytes, liberando o worker.
+        """
         output_filename = os.path.splitext(secure_filename(filename))[0]
-        output_path = os.path.join(app.root_path, 'static', 'outputs', f"{output_filename}.pptx")
+        output_path = os.path.join(app.root_path, app.config['OUTPUT_FOLDER'], f"{output_filename}.pptx")
         
         if not os.path.exists(output_path):
             flash('Arquivo não encontrado', 'error')
             return redirect(url_for('index'))
-            
-        # Enviar o arquivo para download
-        return send_file(
-            output_path, 
-            mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            as_attachment=True,
-            download_name=f"{output_filename}.pptx"
-        )
+        
+        storage.touch(output_filename)
+        etag = content_etag(output_path)
+        mimetype = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+        offload = app.config['DOWNLOAD_OFFLOAD']
+        if offload not in ('x-accel-redirect', 'x-sendfile'):
+            # Enviar o arquivo pelo próprio worker (304 e 206 tratados pelo send_file)
+            return send_file(
+                output_path,
+                mimetype=mimetype,
+                as_attachment=True,
+                download_name=f"{output_filename}.pptx",
+                etag=etag,
+                max_age=0
+            )
+        
+        response = app.response_class(mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+            return response
+        response.headers['Content-Disposition'] = f'attachment; filename="{output_filename}.pptx"'
+        if offload == 'x-accel-redirect':
+            # Location "internal" do nginx apontando para static/outputs (Range tratado pelo nginx)
+            response.headers['X-Accel-Redirect'] = f"{app.config['DOWNLOAD_ACCEL_PREFIX'].rstrip('/')}/{output_filename}.pptx"
+        else:
+            response.headers['X-Sendfile'] = output_path
+        return response
     
     @app.route('/health')
     def health():
@@ -817,73 +560,295 @@ def create_app(config_name=None):
         return jsonify({
             'status': 'healthy',
             'version': '0.1.0',
-            'deepseek_configured': bool(app.config.get('DEEPSEEK_API_KEY'))
+            'deepseek_configured': bool(app.config.get('DEEPSEEK_API_KEY')),
+            'jobs_pending': job_executor.pending,
+            'result_cache': result_cache.stats(),
+            'storage': storage.stats()
         })
     
-    @app.route('/api/status/<filename>')
-    def api_status(filename):
-        """API endpoint for processing status"""
-        # Para demonstração, vamos implementar uma simulação de processamento real
-        # Em produção, isso seria baseado em um sistema de filas ou base de dados
-        import time
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Métricas no formato texto do Prometheus"""
+        return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    def job_status_payload(job):
+        """Monta o status (API e eventos SSE) a partir de um registro do JobStore"""
+        payload = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'stage': job['stage'],
+            'progress': job['progress'],
+            'message': job['message'],
+            'done': job['done'],
+            'total': job['total']
+        }
+        if job['status'] == COMPLETED:
+            payload['redirectUrl'] = url_for('result', filename=job['filename'])
+        elif job['status'] in (FAILED, CANCELLED):
+            payload['error'] = job['error']
+        return payload
+    
+    def job_status_response(job):
+        return jsonify(job_status_payload(job))
+    
+    @app.route('/api/jobs/<job_id>')
+    def api_job(job_id):
+        """API endpoint for job status by job ID"""
+        job = job_store.get(job_id)
+        if job is None:
+            return jsonify({'status': 'error', 'progress': 0, 'message': 'Job não encontrado'}), 404
+        return job_status_response(job)
+    
+    @app.route('/api/jobs/<job_id>', methods=['DELETE'])
+    def api_cancel_job(job_id):
+        """
+        Cancela um job na fila ou em execução: o processo do job (e os que ele
+        criou) é encerrado e os arquivos parciais são removidos
+        """
+        job = job_store.get(job_id)
+        if job is None:
+            return jsonify({'status': 'error', 'progress': 0, 'message': 'Job não encontrado'}), 404
+        if job['status'] in (COMPLETED, FAILED, CANCELLED):
+            return jsonify(job_status_payload(job)), 409
+        # Jobs retomados que aguardam vaga (ver resubmit_recovered) só precisam ser marcados
+        waiting = any(queued['id'] == job_id for queued in list(recovery_backlog))
+        if not job_executor.has_job(job_id) and not waiting:
+            return jsonify({**job_status_payload(job),
+                            'message': 'Job não está em execução nesta instância'}), 409
+        # Registrar antes de encerrar o processo: o progresso que o worker ainda
+        # gravar é ignorado, e um job que terminou nesse meio tempo não é cancelado
+        if not job_store.cancel(job_id):
+            return jsonify(job_status_payload(job_store.get(job_id))), 409
+        job_notifier.notify(job_id)
+        job_executor.cancel(job_id)
+        metrics.observe_cancel()
+        logger.info(f"Job {job_id} ({job['filename']}) cancelado")
+        return job_status_response(job_store.get(job_id))
+    
+    # Streams SSE abertos ao mesmo tempo (cada um ocupa uma thread do servidor)
+    sse_streams = threading.BoundedSemaphore(app.config['SSE_MAX_STREAMS']) if app.config['SSE_MAX_STREAMS'] else None
+    
+    @app.route('/api/jobs/<job_id>/events')
+    def api_job_events(job_id):
+        """
+        Progresso do job por Server-Sent Events: um evento ``progress`` a cada
+        mudança de etapa/contagem e um ``done`` ao concluir, falhar ou ser
+        cancelado, quando o stream é encerrado. O registro do job é lido quando
+        o worker avisa que gravou progresso (JobNotifier) e, fora isso, só a
+        cada keepalive (ex.: job em execução em outra instância).
         
-        # Verificamos se o arquivo de entrada existe
-        upload_folder = app.config['UPLOAD_FOLDER'].replace('/', os.sep)
-        upload_dir = os.path.join(app.root_path, upload_folder)
+        O stream dura no máximo SSE_MAX_DURATION segundos (o EventSource
+        reconecta sozinho); além de SSE_MAX_STREAMS streams abertos a resposta
+        é 503 e a página consulta /api/status periodicamente.
+        """
+        if job_store.get(job_id) is None:
+            return jsonify({'status': 'error', 'progress': 0, 'message': 'Job não encontrado'}), 404
+        if sse_streams is not None and not sse_streams.acquire(blocking=False):
+            response = jsonify({'status': 'error', 'message': 'Limite de streams de progresso atingido'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(app.config['QUEUE_RETRY_AFTER'])
+            return response
         
-        # Caminho do arquivo de entrada
-        secure_name = secure_filename(filename)
-        file_path = os.path.join(upload_dir, secure_name)
+        keepalive = app.config['SSE_KEEPALIVE']
+        max_duration = app.config['SSE_MAX_DURATION']
         
-        if not os.path.exists(file_path):
+        def events():
+            # Intervalo de reconexão do EventSource, em milissegundos
+            yield "retry: 2000\n\n"
+            last_update = None
+            started = last_sent = time.monotonic()
+            with job_notifier.watch(job_id) as changed:
+                while True:
+                    changed.clear()
+                    job = job_store.get(job_id)
+                    if job is None:
+                        return
+                    if job['updated_at'] != last_update:
+                        last_update = job['updated_at']
+                        last_sent = time.monotonic()
+                        finished = job['status'] in (COMPLETED, FAILED, CANCELLED)
+                        data = json.dumps(job_status_payload(job), ensure_ascii=False)
+                        yield f"event: {'done' if finished else 'progress'}\ndata: {data}\n\n"
+                        if finished:
+                            return
+                    
+                    now = time.monotonic()
+                    timeout = keepalive - (now - last_sent)
+                    if max_duration:
+                        remaining = max_duration - (now - started)
+                        if remaining <= 0:
+                            return  # o cliente reconecta e recebe o estado atual
+                        timeout = min(timeout, remaining)
+                    if not changed.wait(max(timeout, 0)) and time.monotonic() - last_sent >= keepalive:
+                        # Comentário SSE: mantém a conexão aberta em proxies com timeout de inatividade
+                        last_sent = time.monotonic()
+                        yield ": keepalive\n\n"
+        
+        response = app.response_class(stream_with_context(events()), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # nginx: repassar cada evento sem bufferizar
+        if sse_streams is not None:
+            response.call_on_close(sse_streams.release)
+        return response
+    
+    @app.route('/api/status/<filename>')
+    def api_status(filename):
+        """API endpoint for processing status (último job do arquivo)"""
+        job = job_store.latest_for_filename(secure_filename(filename))
+        if job is None:
             return jsonify({
                 'status': 'error',
                 'progress': 0,
-                'message': 'Arquivo de entrada não encontrado'
-            })
+                'message': 'Nenhum processamento encontrado para este arquivo'
+            }), 404
+        return job_status_response(job)
+    
+    @app.route('/api/templates', methods=['GET', 'POST'])
+    def api_templates():
+        """Lista os templates registrados ou registra um novo (campo 'template')"""
+        if request.method == 'GET':
+            return jsonify({'templates': template_registry.list()})
         
-        # Verifica se o processamento foi concluído (arquivo de saída existe)
-        output_filename = os.path.splitext(secure_name)[0]
-        output_path = os.path.join(app.root_path, 'static', 'outputs', f"{output_filename}.pptx")
+        template_file = request.files.get('template')
+        if not template_file or not template_file.filename.lower().endswith('.pptx'):
+            return jsonify({'status': 'error', 'message': 'Envie um arquivo .pptx no campo template'}), 400
         
-        if os.path.exists(output_path):
-            logger.info(f"Arquivo de saída encontrado: {output_path}")
-            return jsonify({
-                'status': 'completed',
-                'progress': 100,
-                'message': 'Apresentação criada com sucesso!',
-                'redirectUrl': url_for('result', filename=secure_name)
-            })
-        
-        # Se o processamento ainda está em andamento, calcular progresso
-        file_ctime = os.path.getctime(file_path)
-        time_elapsed = time.time() - file_ctime
-        
-        # Simula progresso baseado no tempo desde a criação do arquivo (25 segundos para completar)
-        # Usamos 25 segundos porque o processamento real leva 20 segundos
-        max_process_time = 25  # segundos
-        progress = min(95, int((time_elapsed / max_process_time) * 100))
-        
-        # Determinar em qual etapa do processo estamos
-        status = 'processing'
-        if progress < 20:
-            message = 'Extraindo texto do documento...'
-        elif progress < 40:
-            message = 'Analisando estrutura do conteúdo...'
-        elif progress < 60:
-            message = 'Gerando conteúdo com IA...'
-        elif progress < 75:
-            message = 'Criando slides e formatação...'
-        else:
-            message = 'Finalizando apresentação...'
+        template_filename = secure_filename(template_file.filename)
+        upload_dir = os.path.join(app.root_path, app.config['UPLOAD_FOLDER'])
+        upload_template_path = os.path.join(upload_dir, f"template_{template_filename}")
+        try:
+            template_file.save(upload_template_path)
+            template_id = template_registry.register(upload_template_path, template_filename)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        finally:
+            if os.path.exists(upload_template_path):
+                os.remove(upload_template_path)
+        return jsonify(template_registry.get(template_id)), 201
+    
+    def upload_session_response(session, status=200):
+        """Resposta JSON de uma sessão de upload, com os cabeçalhos de offset"""
+        response = jsonify({
+            'upload_id': session['id'],
+            'filename': session['filename'],
+            'offset': session['offset'],
+            'size': session['size'],
+            'chunk_size': app.config['UPLOAD_CHUNK_SIZE']
+        })
+        response.status_code = status
+        response.headers['Upload-Offset'] = str(session['offset'])
+        response.headers['Upload-Length'] = str(session['size'])
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    @app.route('/api/uploads', methods=['POST'])
+    def api_create_upload():
+        """
+        Abre um upload em partes: JSON {"filename", "size", "template_id" (opcional)}
+        As partes são enviadas com PUT /api/uploads/<upload_id>
+        """
+        data = request.get_json(silent=True) or {}
+        filename = secure_filename(str(data.get('filename', '')))
+        if not filename or not allowed_file(filename):
+            return jsonify({'status': 'error', 'message': 'Tipo de arquivo não permitido'}), 400
+        
+        template_id = data.get('template_id') or None
+        if template_id and not template_registry.get(template_id):
+            return jsonify({'status': 'error', 'message': 'Template não encontrado'}), 400
+        
+        try:
+            size = int(data.get('size', 0))
+        except (TypeError, ValueError):
+            return jsonify({'status': 'error', 'message': 'Tamanho inválido'}), 400
+        if size > app.config['MAX_UPLOAD_SIZE']:
+            message = f"Arquivo muito grande. Tamanho máximo: {format_size(app.config['MAX_UPLOAD_SIZE'])}"
+            return jsonify({'status': 'error', 'message': message}), 413
+        try:
+            session = upload_store.create(filename, size, template_id)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        logger.info(f"Upload em partes iniciado: {filename} ({session['size']} bytes), sessão {session['id']}")
+        response = upload_session_response(session, 201)
+        response.headers['Location'] = url_for('api_upload', upload_id=session['id'])
+        return response
+    
+    @app.route('/api/uploads/<upload_id>', methods=['GET', 'HEAD', 'PUT'])
+    def api_upload(upload_id):
+        """
+        GET/HEAD: offset atual (para retomar após uma queda de conexão)
+        PUT: grava a próxima parte, lida do corpo da requisição direto para o disco.
+        O início vem de ``Content-Range: bytes início-fim/total`` ou ``Upload-Offset``.
+        Ao receber a última parte o job é iniciado com o hash calculado no upload.
+        """
+        session = upload_store.get(upload_id)
+        if session is None:
+            return jsonify({'status': 'error', 'message': 'Upload não encontrado'}), 404
+        if request.method != 'PUT':
+            return upload_session_response(session)
+        
+        if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+            return jsonify({'status': 'error', 'message': 'Parte maior que MAX_CONTENT_LENGTH'}), 413
+        
+        content_range = request.headers.get('Content-Range', '')
+        try:
+            if content_range:
+                unit, _, spec = content_range.partition(' ')
+                byte_range, _, total = spec.partition('/')
+                offset = int(byte_range.split('-', 1)[0])
+                if unit != 'bytes' or (total != '*' and int(total) != session['size']):
+                    raise ValueError(content_range)
+            else:
+                offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return jsonify({'status': 'error', 'message': 'Informe Content-Range ou Upload-Offset'}), 400
+        
+        try:
+            session = upload_store.write_chunk(upload_id, offset, request.stream)
+        except UploadOffsetError as oe:
+            # Parte fora de ordem (ex.: reenvio após queda): o cliente retoma do offset informado
+            response = jsonify({'status': 'error', 'message': str(oe), 'offset': oe.offset})
+            response.status_code = 409
+            response.headers['Upload-Offset'] = str(oe.offset)
+            return response
+        except KeyError:
+            return jsonify({'status': 'error', 'message': 'Upload não encontrado'}), 404
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        if session['offset'] < session['size']:
+            return upload_session_response(session)
+        
+        # Última parte: mover para a pasta de uploads e iniciar o job sem reler o arquivo
+        filename = session['filename']
+        file_path = os.path.join(upload_dir, filename)
+        digest = upload_store.complete(upload_id, file_path)
+        logger.info(f"Upload em partes concluído: {filename} ({session['size']} bytes)")
+        
+        template_path = None
+        if session.get('template_id') and template_registry.get(session['template_id']):
+            template_path = template_registry.path_for(session['template_id'])
         
-        logger.info(f"Status check for {filename}: {status} - {progress}% - {message}")
+        try:
+            job_id, cached = start_job(filename, file_path, template_path, digest)
+        except QueueFullError as qf:
+            response = jsonify({'status': 'error', 'message': 'Servidor ocupado. Tente novamente em instantes.'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(qf.retry_after)
+            return response
         
+        if cached:
+            redirect_url = url_for('result', filename=filename)
+        else:
+            redirect_url = url_for('processing', filename=filename, job=job_id)
         return jsonify({
-            'status': status,
-            'progress': progress,
-            'message': message
-        })
+            'upload_id': upload_id,
+            'offset': session['size'],
+            'size': session['size'],
+            'job_id': job_id,
+            'status_url': url_for('api_job', job_id=job_id),
+            'redirectUrl': redirect_url
+        }), 201
     
     # Função para simular a geração de um arquivo PowerPoint
     def simulate_file_generation(filename, delay=10):
@@ -916,7 +881,7 @@ def create_app(config_name=None):
         
     # Log directories
     upload_dir = os.path.join(app.root_path, app.config['UPLOAD_FOLDER'])
-    output_dir = os.path.join(app.root_path, 'static', 'outputs')
+    output_dir = os.path.join(app.root_path, app.config['OUTPUT_FOLDER'])
     os.makedirs(upload_dir, exist_ok=True)
     os.makedirs(output_dir, exist_ok=True)
     logger.info(f"Upload directory configured: {upload_dir}")
@@ -935,23 +900,10 @@ if __name__ == '__main__':
     logger.info(f"Configuration: {app.config.get('FLASK_ENV', 'default')}")
     logger.info(f"Debug mode: {app.config.get('DEBUG', False)}")
     
-    # Verificar e instalar pacotes necessários
-    check_and_install_missing_packages()
-
-    try:
-        # Importar PyMuPDF para garantir que está disponível
-        import fitz
-        logger.info("PyMuPDF (fitz) está instalado e disponível")
-    except ImportError:
-        logger.warning("PyMuPDF (fitz) não está instalado. Tentando instalar...")
-        try:
-            import subprocess
-            import sys
-            subprocess.run([sys.executable, "-m", "pip", "install", "PyMuPDF>=1.22.0"], 
-                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-            logger.info("PyMuPDF instalado com sucesso!")
-        except Exception as e:
-            logger.error(f"Erro ao instalar PyMuPDF: {e}")
+    # Apenas avisar: dependências são instaladas no build (requirements.txt), nunca em tempo de execução
+    absent = lazy_imports.missing()
+    if absent:
+        logger.warning(f"Pacotes ausentes: {', '.join(absent)} (pip install -r requirements.txt)")
     
     app.run(
         host=host,
@@ -0,0 +1,121 @@
+"""
+DocToPPT - Benchmark do cliente de IA
+Sobe um servidor local que imita a API do DeepSeek (/chat/completions, com
+latência e taxa de erros 429/500 configuráveis) e compara o envio sequencial
+das seções com o envio concorrente do AIGenerator. Não usa a rede.
+
+Uso:
+    python benchmarks/bench_ai_client.py --sections 40 --latency 0.2 --concurrency 8 --error-rate 0.1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_generator import AIGenerator, iter_ai_sections  # noqa: E402
+
+
+class MockDeepSeekHandler(BaseHTTPRequestHandler):
+    """Responde como /chat/completions; erros são sorteados por requisição"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, para medir o reaproveitamento de conexões
+    disable_nagle_algorithm = True  # cabeçalho e corpo são enviados em writes separados
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+        time.sleep(server.latency)
+
+        roll = random.random()
+        if roll < server.error_rate / 2:
+            self._send(429, {'error': {'message': 'rate limited'}}, {'Retry-After': '0.05'})
+            return
+        if roll < server.error_rate:
+            self._send(500, {'error': {'message': 'server error'}})
+            return
+
+        title = request['messages'][-1]['content'].splitlines()[0].replace('Título: ', '')
+        content = json.dumps({'title': title, 'bullets': [f'Tópico {i} de {title}' for i in range(3)]})
+        self._send(200, {
+            'id': 'mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': request['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 100, 'completion_tokens': 30, 'total_tokens': 130}
+        })
+
+
+def start_mock_server(latency, error_rate):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockDeepSeekHandler)
+    server.latency = latency
+    server.error_rate = error_rate
+    server.requests = 0
+    server.connections = set()
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(server, sections, concurrency, token_budget):
+    server.requests = 0
+    server.connections = set()
+    generator = AIGenerator(
+        api_key='mock', base_url=f'http://127.0.0.1:{server.server_address[1]}', model='deepseek-chat',
+        concurrency=concurrency, token_budget=token_budget, backoff_base=0.05, backoff_max=0.5
+    )
+    start = time.perf_counter()
+    results = list(iter_ai_sections(iter(sections), generator))
+    elapsed = time.perf_counter() - start
+
+    # A ordem das seções é preservada (o mock repete o título recebido)
+    assert [r['title'] for r in results] == [s['title'] for s in sections]
+    generated = sum(1 for r, s in zip(results, sections) if r is not s)
+    print(f"concorrência {concurrency:>3}: {elapsed:7.3f}s  {len(sections) / elapsed:7.1f} seções/s  "
+          f"geradas {generated}/{len(sections)}  repetições {generator.retries}  "
+          f"requisições {server.requests}  conexões {len(server.connections)}  tokens {generator.budget.used}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sections', type=int, default=40, help='Número de seções enviadas')
+    parser.add_argument('--latency', type=float, default=0.2, help='Latência simulada por requisição (s)')
+    parser.add_argument('--error-rate', type=float, default=0.1, help='Fração de respostas 429/500')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requisições simultâneas')
+    parser.add_argument('--token-budget', type=int, default=0, help='Orçamento de tokens (0 = sem limite)')
+    args = parser.parse_args()
+
+    server = start_mock_server(args.latency, args.error_rate)
+    sections = [{'title': f'Seção {i}', 'content': ['texto ' * 50], 'images': []} for i in range(args.sections)]
+    try:
+        sequential = run(server, sections, 1, args.token_budget)
+        concurrent = run(server, sections, args.concurrency, args.token_budget)
+        print(f"Speedup: {sequential / concurrent:.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+DocToPPT - Benchmark do pipeline por etapa
+Gera um corpus sintético (PDF, DOCX, TXT e MD em vários tamanhos, com e sem
+imagens, com e sem template), mede o tempo de cada etapa de process_document
+e grava o resultado em JSON. Com --baseline, compara com uma execução anterior
+e termina com código 1 se alguma etapa ficar mais lenta que o limite.
+
+Uso:
+    python benchmarks/bench_pipeline.py --sizes 10,100 --output atual.json
+    python benchmarks/bench_pipeline.py --baseline base.json --threshold 0.2
+    python benchmarks/bench_pipeline.py --sizes 100,1000 --formats pdf --max-slides 5
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.document_processor import process_document, PIPELINE_VERSION  # noqa: E402
+from src.stage_timer import StageTimer, PIPELINE_STAGES  # noqa: E402
+
+FORMATS = ('pdf', 'docx', 'txt', 'md')
+IMAGE_FORMATS = ('pdf', 'docx')  # formatos em que a variante com imagens faz sentido
+LINES_PER_PAGE = 40
+
+
+def _noise_jpeg(seed, size=(400, 300)):
+    """Imagem JPEG distinta por página (imagens repetidas seriam tratadas como decorativas)"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 20 + seed % 80).convert('RGB').save(buffer, 'JPEG', quality=70)
+    return buffer.getvalue()
+
+
+def _line(page, i):
+    return f"Linha {i} da página {page + 1}: texto corrido para medir o pipeline de conversão."
+
+
+def build_pdf(path, pages, images):
+    import fitz
+
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        y = 60
+        page.insert_text((50, y), f"{p + 1}. Capítulo {p + 1}", fontsize=20)
+        y += 30
+        for i in range(LINES_PER_PAGE):
+            text = f"- item {i}" if i % 10 == 9 else _line(p, i)
+            page.insert_text((50, y), text, fontsize=11)
+            y += 17
+        if images:
+            page.insert_image(fitz.Rect(380, 20, 560, 155), stream=_noise_jpeg(p))
+    doc.save(path)
+
+
+def build_docx(path, pages, images):
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+    from docx.shared import Inches
+
+    doc = Document()
+    for p in range(pages):
+        doc.add_heading(f"{p + 1}. Capítulo {p + 1}", level=1)
+        for i in range(LINES_PER_PAGE):
+            if i % 10 == 9:
+                doc.add_paragraph(f"item {i}", style='List Bullet')
+            else:
+                doc.add_paragraph(_line(p, i))
+        if images:
+            doc.add_picture(io.BytesIO(_noise_jpeg(p)), width=Inches(3))
+        doc.paragraphs[-1].add_run().add_break(WD_BREAK.PAGE)
+    doc.save(path)
+
+
+def build_txt(path, pages, images=False):
+    with open(path, 'w', encoding='utf-8') as f:
+        for p in range(pages):
+            f.write(f"CAPÍTULO {p + 1}\n")
+            for i in range(LINES_PER_PAGE):
+                f.write((f"- item {i}" if i % 10 == 9 else _line(p, i)) + "\n")
+            f.write("\n")
+
+
+def build_md(path, pages, images=False):
+    with open(path, 'w', encoding='utf-8') as f:
+        for p in range(pages):
+            f.write(f"# Capítulo {p + 1}\n\n")
+            for i in range(LINES_PER_PAGE):
+                f.write((f"- item {i}" if i % 10 == 9 else _line(p, i)) + "\n")
+            f.write("\n")
+
+
+BUILDERS = {'pdf': build_pdf, 'docx': build_docx, 'txt': build_txt, 'md': build_md}
+
+
+def build_template(path):
+    """Template simples: a apresentação padrão do python-pptx gravada em disco"""
+    from pptx import Presentation
+
+    Presentation().save(path)
+
+
+def corpus_document(corpus_dir, fmt, pages, images):
+    """Caminho do documento sintético, gerado apenas se ainda não existir no corpus"""
+    variant = 'images' if images else 'text'
+    path = os.path.join(corpus_dir, f"{fmt}-{pages}p-{variant}.{fmt}")
+    if not os.path.exists(path):
+        BUILDERS[fmt](path, pages, images)
+    return path
+
+
+def run_case(doc_path, template_path, out_dir, repeat, settings):
+    """Executa process_document ``repeat`` vezes (após um aquecimento) e retorna a mediana de cada etapa"""
+    stage_runs = {stage: [] for stage in PIPELINE_STAGES}
+    totals = []
+    output_path = os.path.join(out_dir, 'bench.pptx')
+    # Aquecimento: importações e cache de templates não entram na medição
+    process_document(doc_path, out_dir, 'bench', template_path, settings=settings)
+    for _ in range(repeat):
+        timer = StageTimer()
+        start = time.perf_counter()
+        process_document(doc_path, out_dir, 'bench', template_path, settings=settings, timer=timer)
+        totals.append(time.perf_counter() - start)
+        timings = timer.as_dict()
+        for stage in PIPELINE_STAGES:
+            stage_runs[stage].append(timings.get(stage, 0.0))
+    return {
+        'stages': {stage: statistics.median(values) for stage, values in stage_runs.items()},
+        'total': statistics.median(totals),
+        'output_bytes': os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    }
+
+
+def find_regressions(current, baseline, threshold, min_delta):
+    """
+    Compara etapa a etapa com a execução de referência
+
+    Returns:
+        Lista de (caso, etapa, referência, atual) para etapas que ficaram mais
+        lentas que ``threshold`` (fração) e por mais de ``min_delta`` segundos
+    """
+    regressions = []
+    for case, result in current['cases'].items():
+        reference = baseline.get('cases', {}).get(case)
+        if not reference:
+            continue
+        pairs = [(stage, reference['stages'].get(stage), value) for stage, value in result['stages'].items()]
+        pairs.append(('total', reference.get('total'), result['total']))
+        for stage, before, after in pairs:
+            if before is None:
+                continue
+            if after - before > min_delta and after > before * (1 + threshold):
+                regressions.append((case, stage, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,100,1000', help='Tamanhos do corpus, em páginas')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='Formatos do corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por caso (vale a mediana)')
+    parser.add_argument('--workers', type=int, default=1, help='Processos de extração de PDF (EXTRACTION_PROCESSES)')
+    parser.add_argument('--max-slides', type=int, default=20, help='Slides de conteúdo por deck (MAX_SLIDES, 0 = sem limite)')
+    parser.add_argument('--corpus-dir', help='Diretório para guardar e reutilizar o corpus sintético')
+    parser.add_argument('--output', default='bench_pipeline.json', help='Arquivo JSON com os resultados')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para detectar regressões')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Piora relativa tolerada (0.2 = 20%%)')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Piora absoluta mínima, em segundos')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    formats = [fmt for fmt in args.formats.split(',') if fmt in BUILDERS]
+    settings = {'extraction_processes': args.workers, 'max_slides': args.max_slides}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir or os.path.join(tmp, 'corpus')
+        os.makedirs(corpus_dir, exist_ok=True)
+        template_path = os.path.join(corpus_dir, 'template.pptx')
+        if not os.path.exists(template_path):
+            build_template(template_path)
+
+        cases = {}
+        print(f"{'caso':<34}" + ''.join(f"{stage[:12]:>13}" for stage in PIPELINE_STAGES) + f"{'total':>10}")
+        for fmt in formats:
+            for pages in sizes:
+                for images in ((False, True) if fmt in IMAGE_FORMATS else (False,)):
+                    doc_path = corpus_document(corpus_dir, fmt, pages, images)
+                    for template in (None, template_path):
+                        name = f"{fmt}-{pages}p-{'images' if images else 'text'}-{'template' if template else 'default'}"
+                        result = run_case(doc_path, template, os.path.join(tmp, 'out'), args.repeat, settings)
+                        cases[name] = result
+                        print(f"{name:<34}" + ''.join(f"{result['stages'][stage]:13.4f}" for stage in PIPELINE_STAGES)
+                              + f"{result['total']:10.4f}")
+
+    current = {
+        'meta': {
+            'pipeline_version': PIPELINE_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'workers': args.workers,
+            'max_slides': args.max_slides,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'cases': cases
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(current, baseline, args.threshold, args.min_delta)
+        for case, stage, before, after in regressions:
+            print(f"REGRESSÃO {case} {stage}: {before:.4f}s -> {after:.4f}s (+{(after / before - 1) * 100 if before else 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"Nenhuma regressão acima de {args.threshold * 100:.0f}% em relação a {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
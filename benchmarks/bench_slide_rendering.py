@@ -0,0 +1,105 @@
+"""
+DocToPPT - Benchmark de renderização de slides
+Mede o custo por slide de um deck com muitas seções em dois caminhos: o da
+API de objetos do python-pptx (add_slide, busca dos placeholders em cada
+slide, um parágrafo por vez) e o do SlideRenderer (modelo de placeholders por
+layout e parágrafos montados em XML de uma vez). Com --min-speedup, termina
+com código 1 se o ganho ficar abaixo do limite.
+
+Uso:
+    python benchmarks/bench_slide_rendering.py --slides 200 --repeat 5
+    python benchmarks/bench_slide_rendering.py --template modelo.pptx --min-speedup 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pptx_generator import SlideRenderer, body_paragraphs, fill_text  # noqa: E402
+from src.template_processor import load_template  # noqa: E402
+
+
+def build_sections(count, lines=14):
+    """Seções sintéticas com texto corrido e itens de lista, como as do pipeline"""
+    sections = []
+    for s in range(count):
+        content = []
+        for i in range(lines):
+            if i % 4 == 3:
+                content.append(f"- item {i} da seção {s + 1}")
+            else:
+                content.append(f"Linha {i} da seção {s + 1}: texto corrido para medir a renderização.")
+        sections.append({"title": f"{s + 1}. Seção {s + 1}", "content": content, "images": []})
+    return sections
+
+
+def render_reference(prs, layouts, sections):
+    """Caminho pela API de objetos do python-pptx (referência)"""
+    for i, section in enumerate(sections):
+        slide = prs.slides.add_slide(prs.slide_layouts[layouts[i % len(layouts)]])
+        title = next(shape for shape in slide.placeholders if shape.placeholder_format.type == 1)
+        content = next(shape for shape in slide.placeholders if shape.placeholder_format.type in (2, 7))
+        title.text = section["title"]
+        tf = content.text_frame
+        tf.clear()
+        for n, (level, text) in enumerate(body_paragraphs(section["content"])):
+            p = tf.paragraphs[0] if n == 0 else tf.add_paragraph()
+            p.text = text
+            p.level = level
+
+
+def render_fast(prs, catalog, layouts, sections):
+    """Caminho do SlideRenderer usado por render_presentation"""
+    renderer = SlideRenderer(prs, catalog)
+    for i, section in enumerate(sections):
+        _, title, content = renderer.add_slide(layouts[i % len(layouts)])
+        fill_text(title, [(0, section["title"])])
+        fill_text(content, body_paragraphs(section["content"]))
+
+
+def measure(template_path, sections, repeat, fast):
+    """Mediana, em segundos, da renderização de todas as seções em um deck novo"""
+    samples = []
+    for _ in range(repeat + 1):  # a primeira execução é aquecimento
+        prs, catalog = load_template(template_path)
+        layouts = catalog['content_layouts'] if template_path else [1]
+        start = time.perf_counter()
+        if fast:
+            render_fast(prs, catalog, layouts, sections)
+        else:
+            render_reference(prs, layouts, sections)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slides', type=int, default=200, help='Slides por deck')
+    parser.add_argument('--repeat', type=int, default=5, help='Decks medidos por caminho (vale a mediana)')
+    parser.add_argument('--template', help='PPTX de template (padrão: apresentação padrão do python-pptx)')
+    parser.add_argument('--min-speedup', type=float, help='Ganho mínimo exigido do SlideRenderer')
+    args = parser.parse_args()
+
+    sections = build_sections(args.slides)
+    reference = measure(args.template, sections, args.repeat, fast=False)
+    fast = measure(args.template, sections, args.repeat, fast=True)
+    speedup = reference / fast if fast else float('inf')
+
+    print(f"Renderização de {args.slides} slides (mediana de {args.repeat}):")
+    print(f"  {'caminho':<16}{'total':>10}{'por slide':>14}")
+    print(f"  {'python-pptx':<16}{reference:>9.3f}s{reference / args.slides * 1000:>11.3f} ms")
+    print(f"  {'SlideRenderer':<16}{fast:>9.3f}s{fast / args.slides * 1000:>11.3f} ms")
+    print(f"  ganho: {speedup:.1f}x")
+
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        print(f"\nFALHOU: ganho de {speedup:.1f}x (mínimo {args.min_speedup:.1f}x)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
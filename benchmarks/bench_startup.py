@@ -0,0 +1,106 @@
+"""
+DocToPPT - Benchmark de inicialização
+Mede, em processos Python novos, o tempo até a aplicação responder em /health
+(importação + create_app) e até o pré-aquecimento das bibliotecas terminar,
+além do custo de importar cada biblioteca pesada a frio. Com --max-ready,
+termina com código 1 se a mediana até /health passar do limite.
+
+Uso:
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --max-ready 1.0
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.lazy_imports import HEAVY_MODULES  # noqa: E402
+
+# Executado em um processo novo; os tempos são relativos ao início do script
+_APP_PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+status = app.test_client().get('/health').status_code
+ready = time.perf_counter() - start
+from src import lazy_imports
+lazy_imports.wait_prewarm()
+print(json.dumps({'status': status, 'ready': ready, 'warm': time.perf_counter() - start}))
+"""
+
+_IMPORT_PROBE = """
+import importlib, json, time
+start = time.perf_counter()
+importlib.import_module({name!r})
+print(json.dumps({{'seconds': time.perf_counter() - start}}))
+"""
+
+
+def _run(code, env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    return json.loads(result.stdout.strip().splitlines()[-1]), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Inicializações medidas (vale a mediana)')
+    parser.add_argument('--max-ready', type=float, help='Limite, em segundos, para a mediana até /health')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Bancos e caches em um diretório temporário, sem tocar nos dados da aplicação
+        env = dict(os.environ,
+                   JOB_DB_PATH=os.path.join(data_dir, 'jobs.db'),
+                   RESULT_CACHE_DIR=os.path.join(data_dir, 'results'),
+                   TEMPLATE_STORE_DIR=os.path.join(data_dir, 'templates'),
+                   UPLOAD_SESSION_DIR=os.path.join(data_dir, 'uploads'))
+
+        print(f"Importação a frio ({args.repeat} processos por biblioteca):")
+        for name in HEAVY_MODULES:
+            try:
+                samples = [_run(_IMPORT_PROBE.format(name=name), env)[0]['seconds'] for _ in range(args.repeat)]
+            except subprocess.CalledProcessError:
+                print(f"  {name:<12} não instalado")
+                continue
+            print(f"  {name:<12} {statistics.median(samples) * 1000:8.1f} ms")
+
+        results = {}
+        for prewarm in ('False', 'True'):
+            env['PREWARM_IMPORTS'] = prewarm
+            runs = [_run(_APP_PROBE, env) for _ in range(args.repeat)]
+            if any(probe['status'] != 200 for probe, _ in runs):
+                print("/health não respondeu 200")
+                return 1
+            results[prewarm] = {
+                'ready': statistics.median(probe['ready'] for probe, _ in runs),
+                'warm': statistics.median(probe['warm'] for probe, _ in runs),
+                'wall': statistics.median(wall for _, wall in runs),
+            }
+
+    print(f"\nInicialização da aplicação (mediana de {args.repeat}):")
+    print(f"  {'pré-aquecimento':<16}{'até /health':>14}{'bibliotecas':>14}{'processo':>12}")
+    for prewarm, r in results.items():
+        label = 'ligado' if prewarm == 'True' else 'desligado'
+        print(f"  {label:<16}{r['ready']:>13.3f}s{r['warm']:>13.3f}s{r['wall']:>11.3f}s")
+
+    ready = results['True']['ready']
+    if args.max_ready is not None and ready > args.max_ready:
+        print(f"\nFALHOU: {ready:.3f}s até /health (limite {args.max_ready:.3f}s)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
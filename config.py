@@ -14,8 +14,15 @@ class Config:
       # Upload settings
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))  # 16MB
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'static/uploads')
+    OUTPUT_FOLDER = os.getenv('OUTPUT_FOLDER', 'static/outputs')  # apresentações geradas
     ALLOWED_EXTENSIONS = set(os.getenv('ALLOWED_EXTENSIONS', 'pdf,docx,txt,md,pptx').split(','))
     
+    # Upload em partes (/api/uploads): cada parte respeita MAX_CONTENT_LENGTH
+    UPLOAD_SESSION_DIR = os.getenv('UPLOAD_SESSION_DIR', 'data/uploads')
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 8388608))  # 8MB
+    MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', 524288000))  # 500MB
+    UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', 86400))  # uploads abandonados
+    
     # DeepSeek API settings
     DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
     DEEPSEEK_BASE_URL = os.getenv('DEEPSEEK_BASE_URL', 'https://api.deepseek.com')
@@ -25,11 +32,61 @@ class Config:
     AI_TEMPERATURE = float(os.getenv('AI_TEMPERATURE', 0.7))
     AI_MAX_TOKENS = int(os.getenv('AI_MAX_TOKENS', 2000))
     AI_TIMEOUT = int(os.getenv('AI_TIMEOUT', 30))
+    AI_ENABLED = os.getenv('AI_ENABLED', 'False').lower() == 'true'  # requer DEEPSEEK_API_KEY
+    AI_CONCURRENCY = int(os.getenv('AI_CONCURRENCY', 4))  # requisições simultâneas por job
+    AI_TOKEN_BUDGET = int(os.getenv('AI_TOKEN_BUDGET', 0))  # tokens por job (0 = sem limite)
+    AI_MAX_RETRIES = int(os.getenv('AI_MAX_RETRIES', 3))
+    AI_CACHE_PATH = os.getenv('AI_CACHE_PATH', 'data/cache/llm.db')  # vazio = sem cache
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 2592000))  # 30 dias
+    AI_CACHE_MAX_BYTES = int(os.getenv('AI_CACHE_MAX_BYTES', 104857600))  # 100MB
     
     # Application settings
-    MAX_SLIDES = int(os.getenv('MAX_SLIDES', 20))
+    MAX_SLIDES = int(os.getenv('MAX_SLIDES', 20))  # slides de conteúdo; o deck tem mais 2 (título e conclusão)
     DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'pt-BR')
-    PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', 300))
+    PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', 300))  # segundos por job; o processo é encerrado (0 = sem limite)
+    PDF_ENGINE = os.getenv('PDF_ENGINE', 'pymupdf')  # pymupdf ou pdfplumber
+    MAX_PAGES = int(os.getenv('MAX_PAGES', 0))  # 0 = sem limite
+    EXTRACTION_SHARD_PAGES = int(os.getenv('EXTRACTION_SHARD_PAGES', 25))
+    HEADING_SAMPLE_PAGES = int(os.getenv('HEADING_SAMPLE_PAGES', 10))  # páginas usadas no limiar de cabeçalhos
+    
+    # Image settings
+    IMAGE_DPI = int(os.getenv('IMAGE_DPI', 150))  # resolução das imagens no slide
+    IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', 85))
+    IMAGE_REPEAT_PAGES = int(os.getenv('IMAGE_REPEAT_PAGES', 3))  # imagens em N+ páginas são decorativas (0 = desativa)
+    
+    # Worker pool settings
+    WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', os.cpu_count() or 1))
+    # Processos de extração de PDF de cada job: os jobs simultâneos já ocupam os
+    # núcleos, então cada um fica com a sua parte (como no CLI)
+    EXTRACTION_PROCESSES = int(os.getenv('EXTRACTION_PROCESSES',
+                                         max(1, (os.cpu_count() or 1) // max(1, WORKER_PROCESSES))))
+    JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', 10))
+    QUEUE_RETRY_AFTER = int(os.getenv('QUEUE_RETRY_AFTER', 30))  # segundos
+    JOB_MEMORY_LIMIT = int(os.getenv('JOB_MEMORY_LIMIT', 2147483648))  # memória virtual por job, 2GB (0 = sem limite)
+    WORKER_MAX_JOBS = int(os.getenv('WORKER_MAX_JOBS', 100))  # jobs por processo worker antes de trocá-lo (0 = sem troca)
+    JOB_DB_PATH = os.getenv('JOB_DB_PATH', 'data/jobs.db')
+    JOB_HISTORY_TTL = int(os.getenv('JOB_HISTORY_TTL', 604800))  # registros de jobs terminados, 7 dias (0 = mantidos)
+    PREWARM_IMPORTS = os.getenv('PREWARM_IMPORTS', 'True').lower() == 'true'  # importar PyMuPDF/pptx em segundo plano
+    SSE_KEEPALIVE = int(os.getenv('SSE_KEEPALIVE', 15))  # segundos sem eventos até enviar um keepalive
+    SSE_MAX_DURATION = int(os.getenv('SSE_MAX_DURATION', 300))  # duração máxima de um stream SSE; o cliente reconecta (0 = sem limite)
+    SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', 100))  # streams SSE abertos ao mesmo tempo; além disso 503 (0 = sem limite)
+    
+    # Result cache settings
+    RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', 'data/cache/results')
+    RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 524288000))  # 500MB
+    
+    # Storage lifecycle (uploads e apresentações geradas)
+    STORAGE_TTL = int(os.getenv('STORAGE_TTL', 604800))  # 7 dias sem uso (0 = sem expiração)
+    STORAGE_QUOTA_BYTES = int(os.getenv('STORAGE_QUOTA_BYTES', 2147483648))  # 2GB (0 = sem cota)
+    STORAGE_SWEEP_INTERVAL = int(os.getenv('STORAGE_SWEEP_INTERVAL', 600))  # segundos (0 = desligado)
+    
+    # Downloads: '' (pelo worker), 'x-accel-redirect' (nginx) ou 'x-sendfile' (Apache/lighttpd)
+    DOWNLOAD_OFFLOAD = os.getenv('DOWNLOAD_OFFLOAD', '').lower()
+    DOWNLOAD_ACCEL_PREFIX = os.getenv('DOWNLOAD_ACCEL_PREFIX', '/protected/outputs/')  # location internal do nginx
+    
+    # Template settings
+    TEMPLATE_STORE_DIR = os.getenv('TEMPLATE_STORE_DIR', 'data/templates')  # templates registrados (por hash)
+    TEMPLATE_LIBRARY_DIR = os.getenv('TEMPLATE_LIBRARY_DIR', 'examples/templates')  # registrados na inicialização
     
     @staticmethod
     def init_app(app):
@@ -0,0 +1,14 @@
+"""
+DocToPPT - Linha de comando
+Ponto de entrada da conversão em lote (ver src/cli.py)
+
+Uso:
+    python doctoppt.py convert <diretório-ou-glob> --jobs N --template t.pptx
+"""
+
+import sys
+
+from src.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,7 @@ Módulos principais:
 - template_processor: Processamento de templates PPTX
 - content_analyzer: Análise e estruturação de conteúdo
 - pptx_generator: Geração final do PPTX
+- cli: Conversão em lote pela linha de comando (doctoppt convert)
 - utils: Utilitários gerais
 """
 
@@ -0,0 +1,234 @@
+"""
+DocToPPT - AI Generator
+Cliente assíncrono do DeepSeek (API compatível com OpenAI) que resume as
+seções do documento em slides, com chamadas concorrentes limitadas
+"""
+
+import asyncio
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# Versão do prompt; incrementar quando SYSTEM_PROMPT ou o formato da resposta mudar
+PROMPT_VERSION = '1'
+
+SYSTEM_PROMPT = (
+    "Você transforma trechos de documentos em slides de apresentação. "
+    "Responda apenas com um objeto JSON no formato "
+    '{"title": "título curto", "bullets": ["tópico 1", "tópico 2"]}, '
+    "com no máximo 6 tópicos objetivos, no idioma {language}."
+)
+
+# Caracteres por token usados para estimar o consumo antes da chamada
+CHARS_PER_TOKEN = 4
+
+
+class TokenBudget:
+    """
+    Limite de tokens de um job. Cada chamada reserva uma estimativa
+    (prompt + max_tokens) antes de ser enviada e acerta o valor real ao receber
+    a resposta; quando o limite é atingido as seções seguintes ficam sem IA.
+    """
+
+    def __init__(self, limit=0):
+        self.limit = limit  # 0 = sem limite
+        self.used = 0
+        self.reserved = 0
+
+    def reserve(self, estimate):
+        if self.limit and self.used + self.reserved + estimate > self.limit:
+            return False
+        self.reserved += estimate
+        return True
+
+    def settle(self, estimate, actual):
+        self.reserved -= estimate
+        self.used += actual
+
+
+class AIGenerator:
+    """
+    Gera o conteúdo dos slides a partir das seções, enviando as requisições
+    em paralelo (até ``concurrency`` ao mesmo tempo) por um único cliente HTTP,
+    o que reaproveita as conexões entre chamadas.
+
+    Com ``cache`` (LLMCache), seções já resumidas com o mesmo modelo, temperatura,
+    versão do prompt e texto normalizado não chamam o modelo nem consomem tokens.
+
+    Erros temporários (limite de taxa, timeout, conexão, 5xx) são repetidos até
+    ``max_retries`` vezes com backoff exponencial e jitter; respeita o
+    Retry-After enviado pelo servidor. Se ainda assim falhar, ou se o orçamento
+    de tokens acabar, a seção segue com o conteúdo original.
+    """
+
+    def __init__(self, api_key, base_url, model, temperature=0.7, max_tokens=2000, timeout=30,
+                 concurrency=4, token_budget=0, max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 language='pt-BR', cache=None):
+        import httpx
+        from openai import AsyncOpenAI
+
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.language = language
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = TokenBudget(token_budget)
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self._semaphore = None
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+        # As repetições são feitas aqui (com jitter e orçamento), não pelo SDK
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                   timeout=timeout, http_client=self._http)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def build_messages(self, section):
+        content = section.get('content', '')
+        if isinstance(content, list):
+            content = '\n'.join(content)
+        return [
+            {'role': 'system', 'content': SYSTEM_PROMPT.replace('{language}', self.language)},
+            {'role': 'user', 'content': f"Título: {section.get('title', '')}\n\n{content}"}
+        ]
+
+    def _backoff(self, attempt, error):
+        """Espera antes da próxima tentativa: Retry-After do servidor ou backoff com jitter"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _complete(self, messages):
+        """Chamada ao modelo com repetição dos erros temporários"""
+        from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.calls += 1
+                return await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    response_format={'type': 'json_object'}
+                )
+            except (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError) as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt, e)
+                logger.warning(f"IA: {type(e).__name__}, nova tentativa em {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def parse_response(text):
+        """Converte a resposta JSON do modelo em (título, lista de tópicos)"""
+        data = json.loads(text)
+        bullets = [str(b).strip() for b in data.get('bullets', []) if str(b).strip()]
+        if not bullets:
+            raise ValueError('Resposta sem tópicos')
+        return str(data.get('title', '')).strip(), bullets
+
+    async def summarize_section(self, section):
+        """
+        Gera o slide de uma seção
+
+        Returns:
+            Nova seção {"title", "content", "images"} com os tópicos gerados, ou
+            a própria seção se a IA não estiver disponível para ela
+        """
+        messages = self.build_messages(section)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model, self.temperature, PROMPT_VERSION, messages[-1]['content'],
+                                            language=self.language, max_tokens=self.max_tokens)
+            # SQLite bloqueante: fora do loop de eventos, que segue atendendo as outras seções
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached:
+                return self._slide_section(section, cached['title'], cached['bullets'])
+        
+        estimate = sum(len(m['content']) for m in messages) // CHARS_PER_TOKEN + self.max_tokens
+        if not self.budget.reserve(estimate):
+            logger.info("IA: orçamento de tokens esgotado, mantendo o conteúdo original")
+            return section
+
+        actual = 0
+        try:
+            async with self._semaphore:
+                response = await self._complete(messages)
+            if response.usage:
+                actual = response.usage.total_tokens
+            title, bullets = self.parse_response(response.choices[0].message.content)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"IA indisponível para a seção '{section.get('title')}': {e}")
+            return section
+        finally:
+            self.budget.settle(estimate, actual or estimate)
+
+        if cache_key:
+            await asyncio.to_thread(self.cache.put, cache_key, {'title': title, 'bullets': bullets})
+        return self._slide_section(section, title, bullets)
+
+    @staticmethod
+    def _slide_section(section, title, bullets):
+        return {
+            'title': title or section.get('title', ''),
+            'content': ['• ' + bullet for bullet in bullets],
+            'images': section.get('images', [])
+        }
+
+    async def summarize_sections(self, sections):
+        """Gera os slides de várias seções em paralelo, preservando a ordem"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self.summarize_section(section) for section in sections))
+
+    async def aclose(self):
+        await self._client.close()
+
+
+def iter_ai_sections(sections, generator, batch_size=None, limit=None):
+    """
+    Passa as seções pelo gerador de IA em lotes de ``batch_size`` (padrão:
+    2x a concorrência), mantendo o pipeline em fluxo. Um único event loop
+    atende todos os lotes, de modo que as conexões HTTP são reaproveitadas.
+    Com ``limit``, no máximo essa quantidade de seções é lida e resumida: os
+    lotes não buscam seções que o renderizador não chegaria a usar.
+    """
+    batch_size = batch_size or generator.concurrency * 2
+    remaining = limit or float('inf')
+    loop = asyncio.new_event_loop()
+    try:
+        batch = []
+        for section in sections:
+            batch.append(section)
+            remaining -= 1
+            if len(batch) >= batch_size or not remaining:
+                yield from loop.run_until_complete(generator.summarize_sections(batch))
+                batch = []
+            if not remaining:
+                break
+        if batch:
+            yield from loop.run_until_complete(generator.summarize_sections(batch))
+    finally:
+        close = getattr(sections, 'close', None)
+        if close:
+            close()
+        loop.run_until_complete(generator.aclose())
+        loop.close()
+        logger.info(f"IA: {generator.calls} chamadas, {generator.retries} repetições, "
+                    f"{generator.failures} falhas, {generator.budget.used} tokens")
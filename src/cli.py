@@ -0,0 +1,267 @@
+"""
+DocToPPT - CLI
+Conversão em lote de documentos pela linha de comando, sem a camada web
+
+Uso:
+    python doctoppt.py convert docs/ --jobs 4 --template modelo.pptx
+    python doctoppt.py convert "arquivo/**/*.pdf" --output saida/
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+
+from src.document_processor import run_job, settings_from_config
+from src.job_executor import JobExecutor, JobTimeoutError
+from src.result_cache import ResultCache, file_digest
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt', '.md')
+
+# Registro, em cada diretório de saída, da versão de entrada de cada PPTX gerado
+MANIFEST_NAME = '.doctoppt-manifest.json'
+
+logger = logging.getLogger(__name__)
+
+
+def find_inputs(pattern):
+    """
+    Documentos suportados em um diretório (recursivamente), glob ou arquivo
+
+    Returns:
+        Lista ordenada de tuplas (caminho, diretório base para caminhos relativos)
+    """
+    if os.path.isdir(pattern):
+        found = []
+        for root, _, files in os.walk(pattern):
+            for name in files:
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    found.append((os.path.join(root, name), pattern))
+        return sorted(found)
+
+    paths = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+    return sorted((path, os.path.dirname(path)) for path in paths
+                  if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS))
+
+
+def plan_outputs(inputs, output_root=None):
+    """
+    Define (diretório, nome sem extensão) do PPTX de cada entrada
+
+    Sem ``output_root`` o PPTX fica ao lado do documento; com ele, a estrutura
+    de subdiretórios da entrada é reproduzida. Documentos com o mesmo nome no
+    mesmo diretório (ex.: relatorio.pdf e relatorio.docx) recebem a extensão no nome.
+    """
+    planned = []
+    taken = set()
+    for path, base in inputs:
+        if output_root:
+            out_dir = os.path.join(output_root, os.path.relpath(os.path.dirname(path), base or '.'))
+        else:
+            out_dir = os.path.dirname(path) or '.'
+        stem, ext = os.path.splitext(os.path.basename(path))
+        name = stem
+        if (os.path.normpath(out_dir), name) in taken:
+            name = f"{stem}_{ext.lstrip('.').lower()}"
+        taken.add((os.path.normpath(out_dir), name))
+        planned.append((path, os.path.normpath(out_dir), name))
+    return planned
+
+
+class BuildManifest:
+    """
+    Chave (ResultCache.make_key: conteúdo do documento + template + configurações)
+    de cada PPTX convertido com sucesso, em um arquivo por diretório de saída
+
+    Um PPTX só é considerado atualizado se a chave registrada para ele é a da
+    entrada atual; falhas não são registradas e, por isso, são refeitas.
+    """
+
+    def __init__(self):
+        self._entries = {}  # diretório -> {nome: chave}
+
+    def _load(self, out_dir):
+        if out_dir not in self._entries:
+            try:
+                with open(os.path.join(out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+                    self._entries[out_dir] = json.load(f)
+            except (OSError, ValueError):
+                self._entries[out_dir] = {}
+        return self._entries[out_dir]
+
+    def _save(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, MANIFEST_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self._entries[out_dir], f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    def get(self, out_dir, name):
+        return self._load(out_dir).get(name)
+
+    def record(self, out_dir, name, key):
+        self._load(out_dir)[name] = key
+        self._save(out_dir)
+
+    def forget(self, out_dir, name):
+        if self._load(out_dir).pop(name, None) is not None:
+            self._save(out_dir)
+
+
+def is_up_to_date(output_path, key, recorded_key):
+    """O PPTX existe e foi gerado a partir da mesma entrada (documento, template e configurações)"""
+    return recorded_key == key and os.path.exists(output_path)
+
+
+def discard_failed_output(output_path):
+    """Remove o PPTX de erro gravado por process_document, para que a conversão seja refeita"""
+    try:
+        os.remove(output_path)
+    except OSError:
+        pass
+
+
+def convert_document(path, out_dir, name, template_path, settings, key_settings, template_digest=None,
+                     recorded_key=None):
+    """
+    Job de um documento no processo worker: a chave de atualização é calculada
+    aqui (a leitura do documento para o hash acontece em paralelo com os demais
+    jobs) e o documento só é convertido se o PPTX não estiver atualizado
+
+    Args:
+        key_settings: Configurações que entram na chave (ver ResultCache.make_key)
+        template_digest: SHA-256 do template, calculado uma vez para todo o lote
+        recorded_key: Chave registrada no manifesto (None = converter sempre)
+
+    Returns:
+        Tupla (chave, resumo de run_job ou None se o PPTX já estava atualizado)
+    """
+    key = ResultCache.make_key(path, template_path, key_settings, template_digest=template_digest)
+    if is_up_to_date(os.path.join(out_dir, f"{name}.pptx"), key, recorded_key):
+        return key, None
+    return key, run_job(path, out_dir, name, template_path, None, settings)
+
+
+def convert(args):
+    from config import Config
+    from src import lazy_imports
+
+    inputs = []
+    for pattern in args.inputs:
+        inputs.extend(find_inputs(pattern))
+    if not inputs:
+        print("Nenhum documento encontrado (formatos: " + ", ".join(SUPPORTED_EXTENSIONS) + ")")
+        return 1
+    if args.template and not os.path.isfile(args.template):
+        print(f"Template não encontrado: {args.template}")
+        return 1
+
+    cfg = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+    # Caminhos relativos da configuração (ex.: cache de IA) são os mesmos da aplicação web
+    settings = settings_from_config(cfg, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Os jobs já ocupam os núcleos: cada um extrai o PDF com os processos que sobram
+    settings['extraction_processes'] = max(1, (os.cpu_count() or 1) // args.jobs)
+
+    # A divisão dos núcleos não altera o PPTX: fica fora da chave de atualização
+    key_settings = {k: v for k, v in settings.items() if k != 'extraction_processes'}
+    template_digest = file_digest(args.template).digest() if args.template else None
+    timeout = Config.PROCESSING_TIMEOUT if args.timeout is None else args.timeout
+    planned = plan_outputs(inputs, args.output)
+    manifest = BuildManifest()
+
+    print(f"{len(planned)} documentos ({args.jobs} processos"
+          + (f", até {timeout}s por documento)" if timeout else ")"))
+
+    converted = failed = skipped = pages = 0
+    bytes_in = bytes_out = 0
+    start = time.perf_counter()
+    # Os mesmos workers da aplicação web: tempo limite e limite de memória por documento
+    executor = JobExecutor(
+        max_workers=args.jobs,
+        max_queue=len(planned),
+        timeout=timeout,
+        memory_limit=Config.JOB_MEMORY_LIMIT,
+        max_jobs_per_worker=Config.WORKER_MAX_JOBS,
+        preload=['src.cli', *lazy_imports.HEAVY_MODULES]
+    )
+    try:
+        futures = {
+            executor.submit(convert_document, path, out_dir, name, args.template, settings, key_settings,
+                            template_digest, None if args.force else manifest.get(out_dir, name)):
+                (path, out_dir, name)
+            for path, out_dir, name in planned
+        }
+        done = 0
+        for future in as_completed(futures):
+            path, out_dir, name = futures[future]
+            try:
+                key, stats = future.result()
+            except JobTimeoutError:
+                key, stats = None, {'ok': False, 'error_type': f'tempo limite de {timeout}s excedido'}
+            except Exception as e:
+                key, stats = None, {'ok': False, 'error_type': type(e).__name__}
+            if stats is None:
+                skipped += 1
+                continue
+            done += 1
+            if stats.get('ok'):
+                manifest.record(out_dir, name, key)
+                converted += 1
+                pages += stats['pages']
+                bytes_in += stats['bytes_in']
+                bytes_out += stats['bytes_out']
+                print(f"[{done + skipped}/{len(planned)}] {path} -> {os.path.join(out_dir, name)}.pptx "
+                      f"({stats['duration']:.2f}s, {stats['pages']} páginas)")
+            else:
+                manifest.forget(out_dir, name)
+                discard_failed_output(os.path.join(out_dir, f"{name}.pptx"))
+                failed += 1
+                error = stats.get('error_type') or 'erro'
+                print(f"[{done + skipped}/{len(planned)}] FALHOU {path} ({error})")
+    finally:
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print(f"\nConvertidos: {converted}  Falhas: {failed}  Ignorados: {skipped} (já atualizados)  "
+          f"Tempo: {elapsed:.2f}s")
+    if converted and elapsed > 0:
+        print(f"Vazão: {converted / elapsed:.2f} documentos/s, {pages / elapsed:.1f} páginas/s, "
+              f"{bytes_in / elapsed / 1048576:.2f} MB/s de entrada ({bytes_out / 1048576:.1f} MB gerados)")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='doctoppt', description='DocToPPT - conversão de documentos em PPTX')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Exibir o log do pipeline')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = commands.add_parser('convert', help='Converter documentos em lote')
+    convert_parser.add_argument('inputs', nargs='+', help='Diretório, glob (ex.: "docs/**/*.pdf") ou arquivo')
+    convert_parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                                help='Documentos convertidos em paralelo (padrão: núcleos da máquina)')
+    convert_parser.add_argument('-t', '--template', help='Template PPTX aplicado a todas as apresentações')
+    convert_parser.add_argument('-o', '--output', help='Diretório de saída (padrão: ao lado de cada documento)')
+    convert_parser.add_argument('-f', '--force', action='store_true', help='Converter mesmo os já atualizados')
+    convert_parser.add_argument('--timeout', type=int,
+                                help='Tempo limite por documento em segundos (padrão: PROCESSING_TIMEOUT; 0 = sem limite)')
+    convert_parser.set_defaults(handler=convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    if getattr(args, 'jobs', 1) < 1:
+        args.jobs = 1
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+DocToPPT - Document Processor
+Pipeline de conversão de documentos (PDF, DOCX, TXT, MD) em apresentações PPTX
+"""
+
+import os
+import re
+import textwrap
+import time
+import logging
+from itertools import chain, islice
+from src.pdf_extractor import iter_pdf_pages
+from src.docx_extractor import has_heading_styles, iter_docx_pages
+from src.text_extractor import iter_text_sections
+from src.image_processor import PdfImageStore, DocxImageStore
+from src.template_processor import load_template
+from src.stage_timer import StageTimer
+from src.heading_classifier import HeadingClassifier
+from src import lazy_imports
+from src.ai_generator import AIGenerator, iter_ai_sections
+from src.llm_cache import LLMCache
+from src.pptx_generator import MAX_CONTENT_SLIDES, render_presentation, write_error_presentation
+
+logger = logging.getLogger(__name__)
+
+# Versão do pipeline; incrementar quando a saída gerada mudar (invalida o cache de resultados)
+PIPELINE_VERSION = '11'
+
+# Tamanho máximo (em caracteres) de cada parte de uma seção enviada à IA
+SECTION_CHUNK_SIZE = 800
+
+# Fim de frase seguido de espaço: ponto de divisão das linhas longas
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?…])\s+')
+
+
+def iter_classified_lines(pages, sample_pages=10, styled=None):
+    """
+    Classifica cada linha como cabeçalho (nível 1, 2...) ou conteúdo (nível 0)
+    
+    O classificador (agrupamento dos tamanhos de fonte) é montado sobre as
+    primeiras ``sample_pages`` páginas (mantidas em buffer); as demais são
+    classificadas, uma página por vez, à medida que chegam. ``styled`` indica
+    se os títulos vêm dos estilos do documento (None: decidido pela amostra).
+    
+    Yields:
+        Tuplas (linha estruturada, texto sem espaços nas bordas, nível)
+    """
+    pages = iter(pages)
+    sample = list(islice(pages, sample_pages))
+    classifier = HeadingClassifier((line for page in sample for line in page), styled)
+    
+    for page in chain(sample, pages):
+        yield from classifier.classify(page)
+
+
+def iter_sections(classified_lines):
+    """
+    Agrupa as linhas classificadas em seções {"title", "content", "images",
+    "level", "parent"}, emitindo cada seção assim que o próximo cabeçalho a fecha
+    
+    ``parent`` é o título do cabeçalho de nível acima mais recente (ex.: o
+    capítulo de uma subseção), ou None.
+    """
+    current_section = {"title": "Introdução", "content": [], "images": [], "level": 1, "parent": None}
+    current_page = None
+    ancestors = []  # (nível, título) dos cabeçalhos abertos, do mais externo ao mais interno
+    emitted = 0
+    
+    for line, text, level in classified_lines:
+        # Adicionar marcador de página para melhor segmentação
+        page = line.get('page', 0)
+        if page != current_page:
+            if current_page is not None and current_section["content"]:
+                current_section["content"].append("\n[Nova Página]\n")
+            current_page = page
+        
+        # Associar as imagens da página à seção em que aparecem
+        if 'images' in line:
+            current_section["images"].extend(line['images'])
+            continue
+        
+        # Tratar como cabeçalho ou conteúdo
+        if level:
+            while ancestors and ancestors[-1][0] >= level:
+                ancestors.pop()
+            parent = ancestors[-1][1] if ancestors else None
+            ancestors.append((level, text))
+            # Começar nova seção se a atual já tem conteúdo
+            if current_section["content"]:
+                yield current_section
+                emitted += 1
+                current_section = {"title": text, "content": [], "images": [], "level": level, "parent": parent}
+            else:
+                # Cabeçalho seguido de outro: fica o mais recente, e o anterior
+                # (se de nível acima) passa a ser o pai
+                current_section.update(title=text, level=level, parent=parent)
+        else:
+            # Adicionar ao conteúdo da seção atual
+            current_section["content"].append(text)
+    
+    # Adicionar a última seção
+    if current_section["content"]:
+        yield current_section
+        emitted += 1
+    
+    logger.info(f"Estrutura detectada: {emitted} seções")
+    
+    # Se não conseguimos identificar seções, criar uma divisão artificial
+    if not emitted:
+        yield {"title": "Conteúdo", "content": "", "images": current_section["images"]}
+
+
+def _split_content(lines, chunk_size):
+    """
+    Divide as linhas de uma seção em partes de até ``chunk_size`` caracteres,
+    sem cortar linhas, frases ou palavras (exceto quando uma só não cabe)
+    """
+    part, size = [], 0
+    for line in lines:
+        pieces = [line]
+        if len(line) > chunk_size:
+            pieces = [piece for sentence in _SENTENCE_BREAK.split(line)
+                      for piece in (textwrap.wrap(sentence, chunk_size) if len(sentence) > chunk_size else [sentence])]
+        for piece in pieces:
+            if part and size + len(piece) > chunk_size:
+                yield part
+                part, size = [], 0
+            part.append(piece)
+            size += len(piece) + 1
+    if part:
+        yield part
+
+
+def iter_slide_sections(sections, chunk_size=None, progress=None):
+    """
+    Prepara as seções para os slides
+
+    Subseções recebem o título da seção pai como prefixo ("Capítulo › Subseção").
+    Com ``chunk_size`` (entrada da IA), seções grandes são divididas em partes
+    de até ``chunk_size`` caracteres; sem ele, a distribuição do texto pelos
+    slides fica com o renderizador (ver text_fit.TextPacker). Cada seção
+    fechada é informada a ``progress`` (etapa section_detection).
+    """
+    for count, section in enumerate(sections, 1):
+        if progress:
+            progress.stage('section_detection', count)
+        if section.get("parent"):
+            section = dict(section, title=f"{section['parent']} › {section['title']}")
+        content = section["content"]
+        lines = content if isinstance(content, list) else content.split("\n")
+        if not chunk_size or sum(len(line) + 1 for line in lines) <= chunk_size:
+            yield section
+            continue
+        
+        # Dividir em partes para não sobrecarregar cada chamada à IA
+        for i, part in enumerate(_split_content(lines, chunk_size)):
+            title = section["title"]
+            images = section.get("images", [])
+            if i > 0:
+                title += f" (cont. {i + 1})"
+                images = []  # Imagens apenas na primeira parte da seção
+            yield {"title": title, "content": part, "images": images, "level": section.get("level", 1)}
+
+
+def process_document(file_path, output_dir, output_filename, template_path=None, progress=None, settings=None,
+                     timer=None):
+    """
+    Função que processa um documento e cria um PowerPoint
+    Extrai o texto do PDF e cria slides básicos
+    Executada em um processo do executor de jobs (ver src/job_executor.py),
+    por isso recebe e retorna apenas valores serializáveis.
+    Parâmetros:
+      file_path: Caminho do arquivo de entrada (PDF, DOCX, etc)
+      output_dir: Diretório onde o PPTX gerado será salvo
+      output_filename: Nome do arquivo de saída (sem extensão)
+      template_path: Caminho para um arquivo PPTX de template (opcional)
+      progress: ProgressReporter do job (opcional), atualizado a cada etapa
+      settings: Dict com as configurações do pipeline (ex.: pdf_engine)
+      timer: StageTimer que recebe o tempo de cada etapa (opcional)
+    
+    Retorna True se o PPTX (ou o PPTX de erro) foi gravado, False em caso de
+    falha e None se o job já estava em execução em outro worker.
+    
+    O documento é processado em fluxo (ver iter_classified_lines, iter_sections
+    e iter_slide_sections): a memória depende do tamanho das seções e não do
+    tamanho do documento.
+    """
+    logger.info(f"Iniciando processamento para {file_path} (pid {os.getpid()})")
+    
+    settings = settings or {}
+    timer = timer or StageTimer()
+    if progress is None:
+        progress = _NullProgress()
+    elif not progress.start():
+        logger.warning(f"Job {progress.job_id} já está em execução em outro worker, ignorando")
+        return None
+    
+    # Bibliotecas carregadas sob demanda (ou já pré-carregadas) para não afetar a inicialização
+    try:
+        lazy_imports.load('pptx')
+    except ImportError as e:
+        logger.error(f"Erro ao importar bibliotecas: {e}")
+        return False
+        
+    # Criar um arquivo de saída
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{output_filename}.pptx")
+    
+    image_store = None
+    sections = None  # preenchido direto pelos formatos que já trazem a estrutura (MD/TXT)
+    styled = None  # títulos pelos estilos do documento (DOCX); None: decidido pela amostra
+    try:
+        # Verificar a extensão do arquivo para saber como processá-lo
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        # Fonte de páginas (listas de linhas estruturadas) conforme o tipo do documento
+        if file_ext == '.pdf':
+            # Texto estruturado e referências de imagens em uma única passada pelo PDF
+            pages = iter_pdf_pages(
+                file_path,
+                engine=settings.get('pdf_engine', 'pymupdf'),
+                max_pages=settings.get('max_pages'),
+                progress=progress,
+                shard_pages=settings.get('extraction_shard_pages', 25),
+                workers=settings.get('extraction_processes', 1),
+                repeat_pages=settings.get('image_repeat_pages', 3)
+            )
+            # Imagens só são extraídas e redimensionadas quando um slide as usa
+            image_store = PdfImageStore(
+                file_path,
+                os.path.join(output_dir, f"images_{output_filename}"),
+                dpi=settings.get('image_dpi', 150),
+                jpeg_quality=settings.get('image_jpeg_quality', 85)
+            )
+        elif file_ext == '.docx':
+            # Parágrafos lidos em fluxo do XML, com estilos de título, listas e imagens
+            progress.stage('text_extraction')
+            pages = iter_docx_pages(file_path)
+            # Títulos pelos estilos quando o documento os define, não pelas primeiras páginas
+            styled = has_heading_styles(file_path)
+            image_store = DocxImageStore(
+                file_path,
+                os.path.join(output_dir, f"images_{output_filename}"),
+                dpi=settings.get('image_dpi', 150),
+                jpeg_quality=settings.get('image_jpeg_quality', 85)
+            )
+        elif file_ext in ['.txt', '.md']:
+            # Seções direto da sintaxe, sem detecção de cabeçalhos por fonte
+            progress.stage('text_extraction')
+            sections = timer.iterate('text_extraction', iter_text_sections(file_path, markdown=file_ext == '.md'))
+        else:
+            logger.error(f"Formato de arquivo não suportado: {file_ext}")
+            progress.fail(f"Formato de arquivo não suportado: {file_ext}")
+            return False
+        
+        # Pipeline em geradores: páginas -> linhas classificadas -> seções -> slides.
+        # Nada é extraído antes de o renderizador pedir a próxima seção.
+        if sections is None:
+            pages = timer.iterate('text_extraction', pages)
+            lines = timer.iterate('heading_detection',
+                                  iter_classified_lines(pages, settings.get('heading_sample_pages', 10), styled))
+            sections = iter_sections(lines)
+        slide_sections = timer.iterate('section_detection', iter_slide_sections(
+            sections, SECTION_CHUNK_SIZE if settings.get('ai_enabled') else None, progress))
+        # Cada seção ocupa ao menos um slide: além de max_slides nenhuma seção é usada
+        max_slides = settings.get('max_slides', MAX_CONTENT_SLIDES)
+        
+        # IA (opcional): resume as seções em tópicos, com chamadas concorrentes;
+        # respostas já obtidas para o mesmo texto vêm do cache em disco
+        ai_cache = None
+        if settings.get('ai_enabled'):
+            if settings.get('ai_cache_path'):
+                ai_cache = LLMCache(settings['ai_cache_path'], settings.get('ai_cache_ttl', 2592000),
+                                    settings.get('ai_cache_max_bytes', 104857600))
+            slide_sections = timer.iterate('ai_generation', iter_ai_sections(slide_sections, AIGenerator(
+                api_key=os.getenv('DEEPSEEK_API_KEY'),
+                base_url=settings.get('ai_base_url'),
+                model=settings.get('ai_model'),
+                temperature=settings.get('ai_temperature', 0.7),
+                max_tokens=settings.get('ai_max_tokens', 2000),
+                timeout=settings.get('ai_timeout', 30),
+                concurrency=settings.get('ai_concurrency', 4),
+                token_budget=settings.get('ai_token_budget', 0),
+                max_retries=settings.get('ai_max_retries', 3),
+                language=settings.get('language', 'pt-BR'),
+                cache=ai_cache
+            ), limit=max_slides))
+        
+        # Criar uma apresentação (baseada em template se fornecido); o template
+        # já interpretado fica em cache no processo e cada job recebe uma cópia
+        with timer.stage('template_loading'):
+            if template_path and os.path.exists(template_path):
+                logger.info(f"Usando template: {template_path}")
+                try:
+                    prs, layout_catalog = load_template(template_path)
+                    # Usar template existente
+                    logger.info(f"Template carregado com {len(prs.slides)} slides existentes")
+                except Exception as te:
+                    logger.error(f"Erro ao carregar template: {str(te)}. Usando apresentação padrão.")
+                    template_path = None
+                    prs, layout_catalog = load_template()
+            else:
+                prs, layout_catalog = load_template()
+        
+        # Renderização (src/pptx_generator.py): o tempo das etapas puxadas pelos
+        # geradores é descontado de slide_rendering
+        with timer.stage('slide_rendering'):
+            render_presentation(prs, layout_catalog, slide_sections, output_filename,
+                                use_template=bool(template_path), image_store=image_store, timer=timer,
+                                max_slides=max_slides, progress=progress)
+        
+        # Fechar o pipeline (encerra a extração caso o limite de slides tenha sido atingido)
+        slide_sections.close()
+        if ai_cache:
+            timer.add('ai_cache_hits', ai_cache.hits)
+            timer.add('ai_cache_misses', ai_cache.misses)
+        if image_store:
+            image_store.close()
+        
+        # Salvar a apresentação
+        progress.stage('saving')
+        with timer.stage('save'):
+            prs.save(output_path)
+        
+        logger.info(f"Processamento concluído. Arquivo PowerPoint criado: {output_path}")
+        logger.info("Tempo por etapa: " + ", ".join(f"{k}={v:.3f}s" for k, v in timer.as_dict().items()))
+        progress.complete()
+        return True
+    except Exception as e:
+        logger.error(f"Erro durante o processamento de documento: {str(e)}")
+        timer.failure = type(e).__name__
+        progress.fail(e)
+        
+        # Criar arquivo de PowerPoint de erro para notificar o usuário
+        try:
+            write_error_presentation(output_path, e)
+            logger.info(f"Arquivo de erro criado: {output_path}")
+            return True
+        except Exception as e2:
+            logger.error(f"Falha ao criar arquivo de erro: {str(e2)}")
+            return False
+    finally:
+        # As imagens já estão embutidas no PPTX salvo (ou o job falhou): o diretório é descartável
+        if image_store is not None:
+            image_store.cleanup()
+
+
+def settings_from_config(cfg, root_path=''):
+    """
+    Configurações do pipeline a partir da configuração da aplicação (app.config
+    ou um dict com as chaves de config.Config), no formato esperado por
+    process_document. Como alteram o PPTX gerado, também fazem parte da chave
+    do cache de resultados. Caminhos relativos são resolvidos a partir de ``root_path``.
+    """
+    return {
+        'pipeline_version': PIPELINE_VERSION,
+        'pdf_engine': cfg['PDF_ENGINE'],
+        'max_pages': cfg['MAX_PAGES'],
+        'extraction_shard_pages': cfg['EXTRACTION_SHARD_PAGES'],
+        'extraction_processes': cfg['EXTRACTION_PROCESSES'],
+        'heading_sample_pages': cfg['HEADING_SAMPLE_PAGES'],
+        'image_dpi': cfg['IMAGE_DPI'],
+        'image_jpeg_quality': cfg['IMAGE_JPEG_QUALITY'],
+        'image_repeat_pages': cfg['IMAGE_REPEAT_PAGES'],
+        'max_slides': cfg['MAX_SLIDES'],
+        'language': cfg['DEFAULT_LANGUAGE'],
+        'ai_enabled': cfg['AI_ENABLED'] and bool(cfg['DEEPSEEK_API_KEY']),
+        'ai_base_url': cfg['DEEPSEEK_BASE_URL'],
+        'ai_model': cfg['DEEPSEEK_MODEL'],
+        'ai_temperature': cfg['AI_TEMPERATURE'],
+        'ai_max_tokens': cfg['AI_MAX_TOKENS'],
+        'ai_timeout': cfg['AI_TIMEOUT'],
+        'ai_concurrency': cfg['AI_CONCURRENCY'],
+        'ai_token_budget': cfg['AI_TOKEN_BUDGET'],
+        'ai_max_retries': cfg['AI_MAX_RETRIES'],
+        'ai_cache_path': os.path.join(root_path, cfg['AI_CACHE_PATH']) if cfg['AI_CACHE_PATH'] else None,
+        'ai_cache_ttl': cfg['AI_CACHE_TTL'],
+        'ai_cache_max_bytes': cfg['AI_CACHE_MAX_BYTES']
+    }
+
+
+def run_job(file_path, output_dir, output_filename, template_path=None, progress=None, settings=None):
+    """
+    Ponto de entrada dos jobs no pool de workers: executa process_document e
+    devolve ao processo principal (pelo resultado do future) um resumo
+    serializável para as métricas, ou None se o job foi ignorado
+    """
+    timer = StageTimer()
+    start = time.perf_counter()
+    result = process_document(file_path, output_dir, output_filename, template_path, progress, settings, timer)
+    if result is None:
+        return None
+    
+    output_path = os.path.join(output_dir, f"{output_filename}.pptx")
+    return {
+        'ok': bool(result) and timer.failure is None,
+        'duration': time.perf_counter() - start,
+        'stages': timer.as_dict(),
+        'pages': timer.counts.get('text_extraction', 0),
+        'images': timer.counts.get('images', 0),
+        'bytes_in': os.path.getsize(file_path) if os.path.exists(file_path) else 0,
+        'bytes_out': os.path.getsize(output_path) if os.path.exists(output_path) else 0,
+        'ai_cache_hits': timer.counts.get('ai_cache_hits', 0),
+        'ai_cache_misses': timer.counts.get('ai_cache_misses', 0),
+        'error_type': timer.failure
+    }
+
+
+class _NullProgress:
+    """Substituto do ProgressReporter quando o job não é rastreado"""
+
+    def stage(self, stage, done=None, total=None):
+        pass
+
+    def complete(self):
+        pass
+
+    def fail(self, error):
+        pass
@@ -0,0 +1,315 @@
+"""
+DocToPPT - DOCX Extractor
+Extração em fluxo de documentos Word: ``word/document.xml`` é lido com
+iterparse, parágrafo a parágrafo, e cada parágrafo já processado é
+descartado, de modo que a memória não cresce com o tamanho do documento.
+
+Estilos de título (Título, Título 1..n ou nível de estrutura de tópicos),
+numeração de listas e imagens incorporadas viram as mesmas linhas
+estruturadas produzidas pelo extrator de PDF.
+"""
+
+import logging
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_V = '{urn:schemas-microsoft-com:vml}'
+_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Controles de conteúdo (w:sdt): o texto fica em w:sdtContent, no lugar do próprio w:sdt
+_SDT = f'{_W}sdt'
+_SDT_CONTENT = f'{_W}sdtContent'
+
+_HEADING_STYLE_NAME = re.compile(r'^(?:heading|título|titulo|überschrift|titre)\s*(\d+)$', re.IGNORECASE)
+_TITLE_STYLE_NAMES = {'title', 'título', 'titulo'}
+
+# Formatos de numeração que viram marcadores (os demais são numerados)
+_BULLET_FORMATS = {'bullet', 'none', None}
+
+
+def _val(element, tag):
+    """Atributo w:val do filho ``tag`` (ou None)"""
+    child = element.find(tag) if element is not None else None
+    return child.get(f'{_W}val') if child is not None else None
+
+
+def _read_xml(archive, name):
+    try:
+        with archive.open(name) as part:
+            return ET.parse(part).getroot()
+    except KeyError:
+        return None
+
+
+def _load_styles(archive):
+    """
+    Nível de título e numeração (numId, ilvl) de cada estilo de parágrafo,
+    resolvendo a herança (basedOn)
+
+    Returns:
+        Dict styleId -> {'level': int|None, 'num': (numId, ilvl)|None}
+    """
+    root = _read_xml(archive, 'word/styles.xml')
+    raw = {}
+    if root is not None:
+        for style in root.iter(f'{_W}style'):
+            if style.get(f'{_W}type') != 'paragraph':
+                continue
+            name = (_val(style, f'{_W}name') or '').strip().lower()
+            ppr = style.find(f'{_W}pPr')
+            level = None
+            match = _HEADING_STYLE_NAME.match(name)
+            if match:
+                level = int(match.group(1))
+            elif name in _TITLE_STYLE_NAMES:
+                level = 1
+            elif _val(ppr, f'{_W}outlineLvl') is not None:
+                outline = int(_val(ppr, f'{_W}outlineLvl'))
+                level = outline + 1 if outline < 9 else None  # 9 = texto do corpo
+            num_pr = ppr.find(f'{_W}numPr') if ppr is not None else None
+            num = None
+            if num_pr is not None and _val(num_pr, f'{_W}numId'):
+                num = (_val(num_pr, f'{_W}numId'), int(_val(num_pr, f'{_W}ilvl') or 0))
+            raw[style.get(f'{_W}styleId')] = (level, num, _val(style, f'{_W}basedOn'))
+
+    resolved = {}
+
+    def resolve(style_id, depth=0):
+        if style_id in resolved:
+            return resolved[style_id]
+        level, num, based_on = raw.get(style_id, (None, None, None))
+        if based_on and depth < 20 and (level is None or num is None):
+            parent = resolve(based_on, depth + 1)
+            level = level if level is not None else parent['level']
+            num = num or parent['num']
+        resolved[style_id] = {'level': level, 'num': num}
+        return resolved[style_id]
+
+    for style_id in raw:
+        resolve(style_id)
+    return resolved
+
+
+def has_heading_styles(file_path):
+    """
+    Se a parte de estilos do DOCX define estilos de título (Título, Título 1..n
+    ou nível de estrutura de tópicos). Nesse caso os títulos do documento vêm
+    dos estilos, e não do texto das linhas (ver HeadingClassifier).
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        return any(style['level'] for style in _load_styles(archive).values())
+
+
+def _content_children(element, tags):
+    """
+    Filhos diretos de ``element`` com uma das ``tags``, incluindo os que estão
+    dentro de controles de conteúdo (w:sdt/w:sdtContent). Elementos aninhados
+    mais fundo (ex.: parágrafos de uma tabela dentro da célula) não entram.
+    """
+    for child in element:
+        if child.tag in tags:
+            yield child
+        elif child.tag == _SDT:
+            content = child.find(_SDT_CONTENT)
+            if content is not None:
+                yield from _content_children(content, tags)
+
+
+def _load_numbering(archive):
+    """
+    Formato de cada nível das listas numeradas
+
+    Returns:
+        Dict numId -> {ilvl: numFmt}
+    """
+    root = _read_xml(archive, 'word/numbering.xml')
+    if root is None:
+        return {}
+    abstract = {}
+    for definition in root.iter(f'{_W}abstractNum'):
+        levels = {}
+        for lvl in definition.iter(f'{_W}lvl'):
+            levels[int(lvl.get(f'{_W}ilvl', 0))] = _val(lvl, f'{_W}numFmt')
+        abstract[definition.get(f'{_W}abstractNumId')] = levels
+    formats = {}
+    for num in root.iter(f'{_W}num'):
+        formats[num.get(f'{_W}numId')] = abstract.get(_val(num, f'{_W}abstractNumId'), {})
+    return formats
+
+
+def _load_media(archive):
+    """Relações do documento: rId -> caminho da imagem dentro do pacote"""
+    root = _read_xml(archive, 'word/_rels/document.xml.rels')
+    media = {}
+    if root is None:
+        return media
+    for rel in root.iter(f'{_REL}Relationship'):
+        if rel.get('Type', '').endswith('/image') and rel.get('TargetMode') != 'External':
+            media[rel.get('Id')] = posixpath.normpath(posixpath.join('word', rel.get('Target')))
+    return media
+
+
+class _ParagraphReader:
+    """Converte elementos w:p em texto, nível de título, marcador de lista e imagens"""
+
+    def __init__(self, styles, numbering, media):
+        self.styles = styles
+        self.numbering = numbering
+        self.media = media
+        self._counters = {}  # (numId, ilvl) -> próximo número
+        self.page_breaks = 0
+
+    def read(self, paragraph):
+        parts = []
+        images = []
+        for node in paragraph.iter():
+            tag = node.tag
+            if tag == f'{_W}t':
+                parts.append(node.text or '')
+            elif tag == f'{_W}tab':
+                parts.append('\t')
+            elif tag in (f'{_W}br', f'{_W}cr'):
+                if node.get(f'{_W}type') == 'page':
+                    self.page_breaks += 1
+                else:
+                    parts.append(' ')
+            elif tag == f'{_W}lastRenderedPageBreak':
+                self.page_breaks += 1
+            elif tag == f'{_A}blip':
+                target = self.media.get(node.get(f'{_R}embed'))
+                if target and target not in images:
+                    images.append(target)
+            elif tag == f'{_V}imagedata':
+                target = self.media.get(node.get(f'{_R}id'))
+                if target and target not in images:
+                    images.append(target)
+        text = ''.join(parts).strip()
+
+        ppr = paragraph.find(f'{_W}pPr')
+        style = self.styles.get(_val(ppr, f'{_W}pStyle'), {'level': None, 'num': None})
+        level = style['level']
+        outline = _val(ppr, f'{_W}outlineLvl')
+        if outline is not None and int(outline) < 9:
+            level = int(outline) + 1
+
+        num = style['num']
+        num_pr = ppr.find(f'{_W}numPr') if ppr is not None else None
+        if num_pr is not None:
+            num_id = _val(num_pr, f'{_W}numId') or (num[0] if num else None)
+            num = (num_id, int(_val(num_pr, f'{_W}ilvl') or (num[1] if num else 0)))
+        if text and num and num[0] not in (None, '0') and not level:
+            text = self._list_marker(num) + text
+        return text, level, images
+
+    def _list_marker(self, num):
+        num_id, ilvl = num
+        indent = '  ' * ilvl
+        if self.numbering.get(num_id, {}).get(ilvl) in _BULLET_FORMATS:
+            return indent + '• '
+        # Reiniciar os subníveis quando um nível acima avança
+        for key in [k for k in self._counters if k[0] == num_id and k[1] > ilvl]:
+            del self._counters[key]
+        count = self._counters.get(num, 0) + 1
+        self._counters[num] = count
+        return f"{indent}{count}. "
+
+
+def iter_docx_pages(file_path, lines_per_page=200):
+    """
+    Lê um DOCX em fluxo, produzindo blocos de linhas estruturadas
+
+    Um bloco termina em cada quebra de página do documento (explícita ou
+    registrada pelo Word ao salvar) ou a cada ``lines_per_page`` linhas.
+    Títulos levam ``heading`` (nível 1..n); as imagens do parágrafo seguem em
+    uma linha com ``images`` (caminhos dentro do pacote, ver DocxImageStore).
+    Tabelas viram uma linha por linha da tabela, com as células separadas por
+    " | " (o texto de tabelas aninhadas entra na célula que as contém). O
+    conteúdo de controles de conteúdo (w:sdt) é lido como o do corpo.
+
+    Yields:
+        Listas de dicts {"text", "size", "font", "y", "page"[, "heading"][, "images"]}
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        reader = _ParagraphReader(_load_styles(archive), _load_numbering(archive), _load_media(archive))
+        page = []
+        page_num = 0
+        index = 0
+
+        def record(text, level, images):
+            nonlocal index
+            index += 1
+            lines = []
+            if text:
+                line = {'text': text, 'size': None, 'font': None, 'y': index, 'page': page_num}
+                if level:
+                    line['heading'] = level
+                lines.append(line)
+            if images:
+                lines.append({'text': f"[IMAGENS: {len(images)}]", 'size': None, 'font': 'Image',
+                              'y': index, 'page': page_num, 'images': images})
+            return lines
+
+        def read_cell(cell, texts, images):
+            # Parágrafos e tabelas aninhadas da célula, cada um lido uma única vez
+            for block in _content_children(cell, (f'{_W}p', f'{_W}tbl')):
+                if block.tag == f'{_W}p':
+                    text, _, paragraph_images = reader.read(block)
+                    if text:
+                        texts.append(text)
+                    images.extend(paragraph_images)
+                else:
+                    for row in _content_children(block, (f'{_W}tr',)):
+                        for nested in _content_children(row, (f'{_W}tc',)):
+                            read_cell(nested, texts, images)
+
+        with archive.open('word/document.xml') as part:
+            # Elementos abertos, da raiz (w:document, w:body) ao elemento atual
+            open_elements = []
+            for event, element in ET.iterparse(part, events=('start', 'end')):
+                if event == 'start':
+                    open_elements.append(element)
+                    continue
+
+                open_elements.pop()
+                if len(open_elements) < 2 or open_elements[1].tag != f'{_W}body':
+                    continue
+                body = open_elements[1]
+                # Blocos do corpo: parágrafos e tabelas inteiros, diretamente no
+                # corpo ou dentro de controles de conteúdo do corpo
+                is_block = (element.tag in (f'{_W}p', f'{_W}tbl')
+                            and all(e.tag in (_SDT, _SDT_CONTENT) for e in open_elements[2:]))
+                if not is_block:
+                    if len(open_elements) == 2:
+                        body.clear()  # ex.: w:sectPr, controle de conteúdo já lido
+                    continue
+
+                breaks_before = reader.page_breaks
+                if element.tag == f'{_W}p':
+                    page.extend(record(*reader.read(element)))
+                else:
+                    for row in _content_children(element, (f'{_W}tr',)):
+                        cells = []
+                        row_images = []
+                        for cell in _content_children(row, (f'{_W}tc',)):
+                            texts = []
+                            read_cell(cell, texts, row_images)
+                            cells.append(' '.join(texts))
+                        if any(cells) or row_images:
+                            page.extend(record(' | '.join(cells), None, row_images))
+                # Descartar o que já foi lido: a árvore não cresce com o documento
+                open_elements[-1].clear()
+
+                if reader.page_breaks != breaks_before or len(page) >= lines_per_page:
+                    if page:
+                        yield page
+                        page = []
+                    page_num += reader.page_breaks - breaks_before
+        if page:
+            yield page
@@ -0,0 +1,154 @@
+"""
+DocToPPT - Heading Classifier
+Classificação das linhas em títulos de nível 1, nível 2 ou corpo: tamanhos de
+fonte agrupados com NumPy e padrões de texto compilados em uma única expressão
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Padrões que indicam títulos; o grupo nomeado define o nível (padrão: 1)
+HEADING_PATTERNS = [
+    r'(?P<sub>^[0-9]+(?:\.[0-9]+)+\.?\s+)',  # Subseções: "1.2 Título", "2.3.1. Título"
+    r'^[0-9]+\.\s+',                          # Números de seção: "1. Título"
+    r'^[A-Z\s]{5,}$',                         # Texto todo em maiúsculas
+    r'^(?:CAPÍTULO|SEÇÃO|PARTE)',             # Palavras específicas
+    r'^[IVX]+\.\s+',                          # Numerais romanos: "IV. Título"
+]
+HEADING_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in HEADING_PATTERNS))
+HEADING_PREFIXES = ('CAPÍTULO', 'SEÇÃO', 'INTRODUÇÃO', 'CONCLUSÃO')
+
+# Linhas mais longas que isso não são consideradas títulos pelo texto
+MAX_PATTERN_LENGTH = 80
+MAX_HINT_LENGTH = 60
+
+BODY = 0
+
+# Níveis de título separados pelo tamanho de fonte
+MAX_LEVELS = 2
+
+
+def heading_level_by_text(text):
+    """Nível (1 ou 2) indicado pelo texto da linha, ou 0 se não parece título"""
+    if len(text) < MAX_PATTERN_LENGTH:
+        match = HEADING_REGEX.match(text)
+        if match:
+            return 2 if match.group('sub') else 1
+    if len(text) < MAX_HINT_LENGTH and (text.isupper() or text.endswith(':') or text.startswith(HEADING_PREFIXES)):
+        return 1
+    return BODY
+
+
+def heading_floor(body_size):
+    """Tamanho acima do qual uma linha é maior que o corpo (e pode ser título)"""
+    return body_size + max(0.5, body_size * 0.05)
+
+
+def cluster_font_sizes(sizes, weights, max_levels=MAX_LEVELS):
+    """
+    Agrupa os tamanhos de fonte em corpo e até ``max_levels`` níveis de título
+
+    O corpo é o tamanho com mais texto (peso = caracteres). Os tamanhos maiores
+    são separados em grupos por k-means em 1-D (valores distintos ponderados
+    pela quantidade de texto); o menor tamanho de cada grupo é o limiar do nível.
+
+    Returns:
+        Tupla (tamanho do corpo, limiares em ordem decrescente: H1, H2...)
+    """
+    import numpy as np
+
+    sizes = np.round(np.asarray(sizes, dtype=float), 1)
+    weights = np.asarray(weights, dtype=float)
+    if not sizes.size:
+        return None, ()
+
+    values, inverse = np.unique(sizes, return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    body = float(values[np.argmax(totals)])
+
+    larger = values > heading_floor(body)
+    candidates, candidate_weights = values[larger], totals[larger]
+    if candidates.size <= max_levels:
+        return body, tuple(float(v) for v in candidates[::-1])
+
+    # k-means 1-D com centros iniciais espalhados entre o menor e o maior tamanho
+    centers = np.linspace(candidates.min(), candidates.max(), max_levels)
+    for _ in range(50):
+        labels = np.argmin(np.abs(candidates[:, None] - centers[None, :]), axis=1)
+        updated = centers.copy()
+        for k in range(max_levels):
+            members = labels == k
+            if members.any():
+                updated[k] = np.average(candidates[members], weights=candidate_weights[members])
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+
+    thresholds = [float(candidates[labels == k].min()) for k in np.argsort(centers)[::-1] if (labels == k).any()]
+    return body, tuple(thresholds)
+
+
+class HeadingClassifier:
+    """
+    Classificador montado uma vez por job a partir de uma amostra das linhas
+
+    Para cada página, os níveis por tamanho de fonte são calculados de uma vez
+    (vetorizado); os padrões de texto só são testados nas linhas curtas que
+    ficaram como corpo. Documentos com estilos de título (``styled``: DOCX
+    cuja parte de estilos os define, campo ``heading``) usam os níveis do
+    próprio documento.
+
+    Tamanhos maiores que o corpo que não apareceram na amostra (ex.: o primeiro
+    título maior só surge depois das páginas amostradas) ficam com o nível
+    mais baixo de título, em vez de corpo.
+    """
+
+    def __init__(self, sample_lines, styled=None):
+        lines = [line for line in sample_lines if 'images' not in line]
+        # Sem indicação do documento (ex.: estilos do DOCX), decidido pela amostra
+        self.styled = any(line.get('heading') for line in lines) if styled is None else styled
+        sized = [(line['size'], len(line['text'])) for line in lines if line.get('size')]
+        self.body_size, self.thresholds = (None, ())
+        if sized and not self.styled:
+            self.body_size, self.thresholds = cluster_font_sizes(*zip(*sized))
+        self.fallback_level = min(len(self.thresholds) + 1, MAX_LEVELS)
+        if self.thresholds:
+            logger.info(f"Tamanho de fonte do corpo: {self.body_size:.1f}, "
+                        f"limiares dos títulos: {', '.join(f'{t:.1f}' for t in self.thresholds)}")
+        elif not self.styled:
+            logger.warning("Sem diferença de tamanho de fonte na amostra, detectando seções pelo texto "
+                           "e por tamanhos maiores que o corpo")
+
+    def classify(self, page):
+        """
+        Níveis das linhas de uma página (0 = corpo, 1 = H1, 2 = H2...)
+
+        Returns:
+            Lista de tuplas (linha, texto sem espaços nas bordas, nível), sem as linhas vazias
+        """
+        import numpy as np
+
+        texts = [line['text'].strip() for line in page]
+        if self.styled:
+            return [(line, text, line.get('heading') or BODY)
+                    for line, text in zip(page, texts) if text or 'images' in line]
+
+        count = len(page)
+        levels = np.zeros(count, dtype=np.int8)
+        if self.body_size is not None and count:
+            sizes = np.fromiter((line.get('size') or 0.0 for line in page), dtype=float, count=count)
+            # Do menor para o maior limiar: o nível mais alto atingido prevalece
+            for level in range(len(self.thresholds), 0, -1):
+                levels[sizes >= self.thresholds[level - 1]] = level
+            levels[(levels == BODY) & (np.round(sizes, 1) > heading_floor(self.body_size))] = self.fallback_level
+            levels[[i for i, line in enumerate(page) if 'images' in line]] = BODY
+
+        classified = []
+        for line, text, level in zip(page, texts, levels.tolist()):
+            if 'images' in line:
+                classified.append((line, line['text'], BODY))
+            elif text:
+                classified.append((line, text, level or heading_level_by_text(text)))
+        return classified
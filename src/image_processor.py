@@ -0,0 +1,156 @@
+"""
+DocToPPT - Image Processor
+Extração sob demanda, deduplicação e redimensionamento das imagens de PDFs
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+
+class PdfImageStore:
+    """
+    Materializa em disco as imagens de um PDF apenas quando um slide as usa.
+
+    O extrator de páginas entrega somente os xrefs das imagens; aqui cada
+    xref é lido uma única vez, deduplicado pelo hash do conteúdo, reduzido
+    para a largura em que será colocado no slide (``dpi`` pixels por
+    polegada) e recodificado com Pillow (JPEG, ou PNG quando há transparência).
+    """
+
+    def __init__(self, pdf_path, image_dir, dpi=150, jpeg_quality=85):
+        self.pdf_path = pdf_path
+        self.image_dir = image_dir
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self._doc = None
+        self._by_xref = {}   # (xref, largura em px) -> caminho
+        self._by_hash = {}   # (hash do conteúdo, largura em px) -> caminho
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _open(self):
+        if self._doc is None:
+            import fitz  # PyMuPDF
+
+            self._doc = fitz.open(self.pdf_path)
+            os.makedirs(self.image_dir, exist_ok=True)
+        return self._doc
+
+    def _raw_image(self, xref):
+        """Lê os bytes da imagem, aplicando a máscara de transparência (smask) se houver"""
+        import fitz  # PyMuPDF
+
+        doc = self._open()
+        base_image = doc.extract_image(xref)
+        if base_image.get('smask'):
+            pix = fitz.Pixmap(doc, xref)
+            if pix.alpha or pix.n - pix.alpha > 3:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            pix = fitz.Pixmap(pix, fitz.Pixmap(doc, base_image['smask']))
+            return pix.tobytes('png')
+        return base_image['image']
+
+    def image_for_slide(self, xref, width_inches):
+        """
+        Retorna o caminho de uma versão da imagem dimensionada para ``width_inches``
+
+        Args:
+            xref: Número de referência da imagem no PDF
+            width_inches: Largura com que a imagem será colocada no slide
+
+        Returns:
+            Caminho do arquivo gerado, ou None se a imagem não puder ser lida
+        """
+        target_px = max(1, int(width_inches * self.dpi))
+        key = (xref, target_px)
+        if key in self._by_xref:
+            return self._by_xref[key]
+
+        try:
+            data = self._raw_image(xref)
+        except Exception as e:
+            logger.warning(f"Não foi possível extrair imagem xref={xref}: {e}")
+            self._by_xref[key] = None
+            return None
+
+        digest = hashlib.sha1(data).hexdigest()
+        if (digest, target_px) in self._by_hash:
+            path = self._by_hash[(digest, target_px)]
+            self._by_xref[key] = path
+            return path
+
+        try:
+            path = self._write_scaled(data, digest, target_px)
+        except Exception as e:
+            logger.warning(f"Não foi possível converter imagem xref={xref}: {e}")
+            path = None
+
+        self._by_xref[key] = path
+        self._by_hash[(digest, target_px)] = path
+        return path
+
+    def _write_scaled(self, data, digest, target_px):
+        """Reduz (nunca amplia) e recodifica a imagem, gravando-a no diretório de imagens"""
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            if img.width > target_px:
+                height = max(1, round(img.height * target_px / img.width))
+                img = img.resize((target_px, height), Image.LANCZOS)
+
+            has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+            buffer = io.BytesIO()
+            if has_alpha:
+                ext = 'png'
+                img.save(buffer, 'PNG', optimize=True)
+            else:
+                ext = 'jpg'
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                img.save(buffer, 'JPEG', quality=self.jpeg_quality, optimize=True)
+
+        path = os.path.join(self.image_dir, f"img_{digest[:16]}_{target_px}.{ext}")
+        with open(path, 'wb') as img_file:
+            img_file.write(buffer.getvalue())
+
+        self.bytes_in += len(data)
+        self.bytes_out += buffer.tell()
+        return path
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        if self.bytes_in:
+            logger.info(f"Imagens: {len(self._by_hash)} únicas, {self.bytes_in} -> {self.bytes_out} bytes")
+
+    def cleanup(self):
+        """Fecha o PDF e remove o diretório de imagens intermediárias (já embutidas no PPTX)"""
+        self.close()
+        shutil.rmtree(self.image_dir, ignore_errors=True)
+        self._by_xref.clear()
+        self._by_hash.clear()
+
+
+class DocxImageStore(PdfImageStore):
+    """
+    Mesmo fluxo do PdfImageStore para as imagens incorporadas em um DOCX:
+    a referência é o caminho da imagem dentro do pacote (ex.: ``word/media/image1.png``)
+    """
+
+    def _open(self):
+        if self._doc is None:
+            import zipfile
+
+            self._doc = zipfile.ZipFile(self.pdf_path)
+            os.makedirs(self.image_dir, exist_ok=True)
+        return self._doc
+
+    def _raw_image(self, name):
+        return self._open().read(name)
@@ -0,0 +1,459 @@
+"""
+DocToPPT - Job Executor
+Fila limitada de jobs executados em processos worker isolados, com tempo
+limite, limite de memória e cancelamento
+"""
+
+import atexit
+import collections
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Levantada quando a fila de jobs está cheia e o job não pode ser aceito"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Fila de processamento cheia, tente novamente em {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobTimeoutError(Exception):
+    """O processo do job foi encerrado por exceder o tempo limite"""
+
+    def __init__(self, timeout):
+        super().__init__(f"Processamento excedeu o tempo limite de {timeout}s")
+        self.timeout = timeout
+
+
+class JobCancelledError(Exception):
+    """O processo do job foi encerrado por um pedido de cancelamento"""
+
+    def __init__(self):
+        super().__init__("Processamento cancelado")
+
+
+class JobProcessError(Exception):
+    """O processo do job terminou sem devolver resultado (ex.: morto pelo sistema)"""
+
+
+class _Job:
+    __slots__ = ('job_id', 'fn', 'args', 'kwargs', 'future', 'process', 'cancelled')
+
+    def __init__(self, job_id, fn, args, kwargs):
+        self.job_id = job_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.process = None  # processo worker que está executando o job
+        self.cancelled = False
+
+
+class _Worker:
+    """Processo worker de longa duração e a ponta do pipe usada pelo executor"""
+    __slots__ = ('process', 'conn', 'jobs')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0  # jobs executados
+
+
+def _limit_memory(memory_limit):
+    """Limita o espaço de endereçamento do processo atual (RLIMIT_AS)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        logger.warning("Limite de memória por job indisponível nesta plataforma")
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Não foi possível limitar a memória do job: {e}")
+
+
+# No processo worker: pipe com o executor e trava dos envios (o job pode avisar de outras threads)
+_parent_conn = None
+_parent_lock = threading.Lock()
+
+
+def notify_parent():
+    """
+    Chamada de dentro de um job: avisa o executor, no processo da aplicação,
+    de que o job avançou (ver ``on_event`` de JobExecutor). Fora de um
+    processo worker não faz nada.
+    """
+    if _parent_conn is None:
+        return
+    try:
+        with _parent_lock:
+            _parent_conn.send(('event', None))
+    except OSError:
+        pass
+
+
+def _worker_main(conn, memory_limit):
+    """
+    Ponto de entrada do processo worker: aplica o limite de memória e executa
+    os jobs recebidos pelo pipe, um por vez, devolvendo ('ok', resultado) ou
+    ('error', exceção). Termina ao receber None ou quando o pipe é fechado.
+    """
+    # Grupo de processos próprio: ao encerrar o worker, os processos que o job
+    # criar (ex.: extração de PDF em paralelo) são encerrados junto
+    global _parent_conn
+
+    if hasattr(os, 'setpgid'):
+        os.setpgid(0, 0)
+    if memory_limit:
+        _limit_memory(memory_limit)
+    _parent_conn = conn
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        fn, args, kwargs = task
+        try:
+            message = ('ok', fn(*args, **kwargs))
+        except BaseException as e:
+            message = ('error', e)
+        del task, fn, args, kwargs
+        with _parent_lock:
+            try:
+                conn.send(message)
+            except Exception as e:
+                # Resultado ou exceção que não pode ser serializado com pickle
+                conn.send(('error', JobProcessError(f"{type(message[1]).__name__}: {message[1]} ({e})")))
+        del message
+    _parent_conn = None
+    conn.close()
+
+
+def _kill(process):
+    """Encerra o processo worker e os processos do seu grupo (SIGKILL)"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # Sem grupo próprio (ainda não criado, ou plataforma sem killpg)
+        process.kill()
+
+
+def _process_context(preload):
+    """
+    Contexto de multiprocessing dos workers: forkserver onde existe (os workers
+    não são criados por fork do processo da aplicação, que tem várias threads),
+    com os módulos de ``preload`` importados uma vez no servidor; spawn nas demais
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    if preload:
+        context.set_forkserver_preload(list(preload))
+    return context
+
+
+class JobExecutor:
+    """
+    Executa jobs CPU-bound (extração e renderização) em ``max_workers``
+    processos worker de longa duração, um job por vez em cada.
+
+    O número de jobs aceitos é limitado a ``max_workers + max_queue``: além
+    disso ``submit`` levanta ``QueueFullError`` em vez de enfileirar
+    indefinidamente.
+
+    Os workers são mantidos entre os jobs, junto com o que cada processo guarda
+    em cache (templates interpretados, fontes e tabelas de larguras). Um job
+    pode ser encerrado a qualquer momento, inclusive preso em código nativo:
+    ao exceder ``timeout`` segundos (``JobTimeoutError``) ou por ``cancel``
+    (``JobCancelledError``) o seu worker é morto e outro é criado para o
+    próximo job. O espaço de endereçamento de cada worker é limitado a
+    ``memory_limit`` bytes, de modo que um documento patológico falha com
+    MemoryError em vez de tomar a memória dos outros jobs; depois de um
+    MemoryError, ou de ``max_jobs_per_worker`` jobs, o worker também é trocado
+    e a memória que ele usou volta ao sistema.
+
+    Cada ``notify_parent`` chamado pelo job chega a ``on_event(job_id)``,
+    em uma thread do executor.
+
+    ``instance_id`` identifica o executor (e o processo do servidor que o
+    criou): um job registrado com outro identificador foi deixado por uma
+    execução anterior do servidor.
+    """
+
+    def __init__(self, max_workers=None, max_queue=10, retry_after=30, timeout=0, memory_limit=0,
+                 max_jobs_per_worker=0, preload=(), on_event=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.timeout = timeout  # segundos (0 = sem limite)
+        self.memory_limit = memory_limit  # bytes (0 = sem limite)
+        self.max_jobs_per_worker = max_jobs_per_worker  # 0 = sem troca periódica
+        self.on_event = on_event
+        self.instance_id = uuid.uuid4().hex
+        self._context = _process_context(preload)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._queue = collections.deque()
+        self._jobs = {}  # job_id -> _Job, enquanto aceito e não terminado
+        self._pending = 0
+        self._shutdown = False
+        self._threads = []  # criadas em start: criar o executor não inicia threads nem processos
+
+    @property
+    def pending(self):
+        """Número de jobs aceitos que ainda não terminaram (executando + na fila)"""
+        with self._lock:
+            return self._pending
+
+    def start(self):
+        """
+        Inicia as threads de controle e os processos worker, se ainda não
+        iniciados (``submit`` chama, mas iniciar antes poupa o primeiro job de
+        esperar os workers subirem)
+        """
+        with self._lock:
+            self._start_threads()
+
+    def _start_threads(self):
+        if self._threads or self._shutdown:
+            return
+        self._threads = [threading.Thread(target=self._worker, name=f'job-worker-{n}', daemon=True)
+                         for n in range(self.max_workers)]
+        for thread in self._threads:
+            thread.start()
+        # Os workers não são daemon (criam processos de extração): sem
+        # encerrá-los, o interpretador esperaria por eles ao sair
+        atexit.register(self.shutdown, wait=False)
+
+    def submit(self, fn, *args, job_id=None, **kwargs):
+        """
+        Submete um job
+
+        Args:
+            fn: Função de nível de módulo (a função, os argumentos, o resultado e as exceções precisam ser serializáveis com pickle)
+            *args, **kwargs: Argumentos da função
+            job_id: Identificador usado por ``cancel`` (opcional)
+
+        Returns:
+            Future do job
+
+        Raises:
+            QueueFullError: se não houver vaga nos workers nem na fila
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(self.retry_after)
+
+        job = _Job(job_id, fn, args, kwargs)
+        with self._lock:
+            if self._shutdown:
+                self._slots.release()
+                raise RuntimeError('JobExecutor encerrado')
+            self._start_threads()
+            self._pending += 1
+            if job_id is not None:
+                self._jobs[job_id] = job
+            self._queue.append(job)
+            self._ready.notify()
+        job.future.add_done_callback(self._job_done)
+        return job.future
+
+    def has_job(self, job_id):
+        """Se o job está na fila ou em execução neste executor"""
+        with self._lock:
+            return job_id in self._jobs
+
+    def cancel(self, job_id):
+        """
+        Cancela um job: se ainda está na fila, não chega a ser executado; se já
+        está em execução, o worker (e os processos que o job criou) é encerrado
+
+        Returns:
+            False se o job não é conhecido por este executor ou já terminou
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.cancelled:
+                return False
+            job.cancelled = True
+            queued = job in self._queue
+            if queued:
+                self._queue.remove(job)
+                del self._jobs[job_id]
+            process = job.process
+        if queued:
+            job.future.cancel()
+        elif process is not None:
+            logger.info(f"Cancelando job {job_id} (pid {process.pid})")
+            _kill(process)
+        # Sem processo e fora da fila: o worker está prestes a iniciá-lo e vê o cancelamento
+        return True
+
+    def _job_done(self, future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None and not isinstance(exc, JobCancelledError):
+            logger.error(f"Job terminou com erro: {exc!r}")
+
+    def _spawn(self):
+        """Cria um processo worker"""
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn, self.memory_limit),
+                                        name='job-worker', daemon=False)
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    @staticmethod
+    def _retire(worker):
+        """Encerra um worker: pede que termine e, se não terminar, mata o grupo"""
+        if worker.process.is_alive():
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                _kill(worker.process)
+                worker.process.join()
+        worker.conn.close()
+
+    def _worker(self):
+        """Thread que controla um processo worker e lhe entrega os jobs da fila"""
+        worker = None
+        spawn_failed = False
+        try:
+            while True:
+                with self._lock:
+                    # Sem processo, ele é criado antes de esperar pelo primeiro job
+                    while not self._queue and not self._shutdown and (worker is not None or spawn_failed):
+                        self._ready.wait()
+                    if self._shutdown and not self._queue:
+                        return
+                    job = self._queue.popleft() if self._queue else None
+                if job is None:
+                    try:
+                        worker = self._spawn()
+                    except Exception as e:
+                        logger.error(f"Não foi possível criar o processo worker: {e!r}")
+                        spawn_failed = True
+                    continue
+                if not job.future.set_running_or_notify_cancel():
+                    with self._lock:
+                        self._jobs.pop(job.job_id, None)
+                    continue
+
+                reusable = False
+                try:
+                    if worker is None or not worker.process.is_alive():
+                        if worker is not None:
+                            self._retire(worker)
+                        worker = None
+                        worker = self._spawn()
+                    outcome, reusable = self._run(job, worker)
+                except Exception as e:
+                    outcome = ('error', e)
+                finally:
+                    with self._lock:
+                        self._jobs.pop(job.job_id, None)
+                        # Um cancelamento que chegou depois do resultado também mata o worker
+                        reusable = reusable and not job.cancelled
+                if worker is not None:
+                    worker.jobs += 1
+                    if not reusable or (self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker):
+                        self._retire(worker)
+                        worker = None
+
+                status, value = outcome
+                if status == 'ok':
+                    job.future.set_result(value)
+                else:
+                    job.future.set_exception(value)
+        finally:
+            if worker is not None:
+                self._retire(worker)
+
+    def _run(self, job, worker):
+        """
+        Envia o job ao worker e aguarda o resultado, o fim do processo ou o
+        tempo limite
+
+        Returns:
+            Tupla (('ok', resultado) ou ('error', exceção), se o worker pode receber outro job)
+        """
+        process = worker.process
+        with self._lock:
+            if job.cancelled:
+                return ('error', JobCancelledError()), True
+            job.process = process
+        worker.conn.send((job.fn, job.args, job.kwargs))
+
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        message = None
+        while message is None:
+            remaining = deadline - time.monotonic() if deadline else None
+            if remaining is not None and remaining <= 0:
+                logger.warning(f"Job {job.job_id} excedeu {self.timeout}s, encerrando o processo {process.pid}")
+                _kill(process)
+                return ('error', JobTimeoutError(self.timeout)), False
+            ready = wait([worker.conn, process.sentinel], timeout=remaining)
+            if worker.conn in ready:
+                try:
+                    message = worker.conn.recv()
+                except (EOFError, OSError):
+                    break  # processo terminou sem enviar resultado
+                if message[0] == 'event':
+                    message = None
+                    if self.on_event is not None and job.job_id is not None:
+                        try:
+                            self.on_event(job.job_id)
+                        except Exception as e:
+                            logger.warning(f"Erro ao repassar o evento do job {job.job_id}: {e!r}")
+            elif process.sentinel in ready:
+                # O resultado pode ter sido enviado logo antes do fim do processo
+                if worker.conn.poll():
+                    continue
+                break
+
+        if job.cancelled:
+            return ('error', JobCancelledError()), False
+        if message is None:
+            process.join(timeout=5)
+            return ('error', JobProcessError(f"Processo do job terminou sem resultado (código {process.exitcode})")), False
+        # Depois de um MemoryError o processo pode ter ficado com a memória fragmentada
+        return message, not isinstance(message[1], MemoryError)
+
+    def shutdown(self, wait=True):
+        """Encerra o executor; jobs na fila são cancelados e, sem ``wait``, os em execução são encerrados"""
+        with self._lock:
+            self._shutdown = True
+            queued = list(self._queue)
+            self._queue.clear()
+            running = [job for job in self._jobs.values() if job.process is not None]
+            self._ready.notify_all()
+        for job in queued:
+            job.future.cancel()
+        if not wait:
+            for job in running:
+                job.cancelled = True
+                _kill(job.process)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=None if wait else 5)
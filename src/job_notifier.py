@@ -0,0 +1,44 @@
+"""
+DocToPPT - Job Notifier
+Avisos em memória de que um job mudou (progresso, conclusão, cancelamento),
+para que os streams de progresso (SSE) não precisem consultar o banco em intervalos
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class JobNotifier:
+    """
+    Cada stream observa um job com ``watch`` e espera no evento recebido;
+    ``notify`` acorda apenas os streams daquele job. O evento fica marcado até
+    o stream limpá-lo, então um aviso que chega enquanto o stream está
+    lendo o banco ou enviando dados não se perde.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watchers = {}  # job_id -> eventos dos streams que observam o job
+
+    @contextmanager
+    def watch(self, job_id):
+        """Registra um observador do job enquanto o bloco ``with`` durar; produz o threading.Event avisado"""
+        event = threading.Event()
+        with self._lock:
+            self._watchers.setdefault(job_id, set()).add(event)
+        try:
+            yield event
+        finally:
+            with self._lock:
+                watchers = self._watchers.get(job_id)
+                if watchers is not None:
+                    watchers.discard(event)
+                    if not watchers:
+                        del self._watchers[job_id]
+
+    def notify(self, job_id):
+        """Avisa os observadores de que o registro do job mudou"""
+        with self._lock:
+            events = list(self._watchers.get(job_id, ()))
+        for event in events:
+            event.set()
@@ -0,0 +1,334 @@
+"""
+DocToPPT - Job Store
+Registro persistente (SQLite) dos jobs de processamento e do seu progresso
+"""
+
+import logging
+import os
+import sqlite3
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Etapas do pipeline com a faixa de progresso (%) que cada uma ocupa. No
+# pipeline em fluxo as etapas se intercalam (páginas, seções e slides são
+# produzidos sob demanda); o progresso registrado nunca retrocede.
+STAGES = {
+    'queued': (0, 0, 'Aguardando na fila de processamento...'),
+    'text_extraction': (0, 50, 'Extraindo texto do documento...'),
+    'section_detection': (50, 60, 'Analisando estrutura do conteúdo...'),
+    'slide_rendering': (60, 90, 'Criando slides e formatação...'),
+    'image_extraction': (60, 90, 'Extraindo imagens do documento...'),
+    'saving': (90, 99, 'Finalizando apresentação...'),
+    'completed': (100, 100, 'Apresentação criada com sucesso!'),
+}
+
+CANCELLED_MESSAGE = 'Processamento cancelado'
+
+# Status possíveis de um job
+QUEUED = 'queued'
+PROCESSING = 'processing'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    output_filename TEXT NOT NULL,
+    template_path TEXT,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    done INTEGER,
+    total INTEGER,
+    message TEXT,
+    error TEXT,
+    worker_pid INTEGER,
+    instance_id TEXT,
+    last_used_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_filename ON jobs (filename, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_output ON jobs (output_filename);
+"""
+
+# Colunas criadas depois da primeira versão do esquema: adicionadas aos bancos existentes
+_ADDED_COLUMNS = (
+    ('instance_id', 'TEXT'),
+    ('last_used_at', 'REAL'),
+)
+
+
+def _stage_progress(stage, done=None, total=None):
+    """Converte etapa + contagem (ex.: páginas feitas/total) em porcentagem global"""
+    start, end, _ = STAGES[stage]
+    if done is not None and total:
+        return start + int((end - start) * min(done, total) / total)
+    return start
+
+
+class JobStore:
+    """Acesso ao banco SQLite de jobs. Cada instância abre conexões sob demanda."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for name, kind in _ADDED_COLUMNS:
+                if name not in columns:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {kind}')
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, filename, file_path, output_dir, output_filename, template_path=None):
+        """Registra um novo job na fila e retorna o seu ID"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, filename, file_path, output_dir, output_filename, template_path, '
+                'status, stage, progress, message, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)',
+                (job_id, filename, file_path, output_dir, output_filename, template_path,
+                 QUEUED, 'queued', STAGES['queued'][2], now, now)
+            )
+        return job_id
+
+    def get(self, job_id):
+        """Retorna o job como dict, ou None se não existir"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest_for_filename(self, filename):
+        """Retorna o job mais recente criado para um nome de arquivo"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE filename = ? ORDER BY created_at DESC LIMIT 1',
+                (filename,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def claim(self, job_id, instance_id=None):
+        """
+        Marca o job como em processamento pelo processo atual
+
+        Args:
+            instance_id: identificador da instância do servidor que executa o job
+                (ver JobExecutor.instance_id), usado por ``recover_interrupted``
+
+        Returns:
+            False se o job já foi iniciado por outro worker (evita execução dupla)
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, worker_pid = ?, instance_id = ?, updated_at = ? '
+                'WHERE id = ? AND status = ?',
+                (PROCESSING, os.getpid(), instance_id, time.time(), job_id, QUEUED)
+            )
+        return cursor.rowcount == 1
+
+    def set_stage(self, job_id, stage, done=None, total=None):
+        """
+        Registra a etapa atual do job e a contagem de itens processados
+        (ignorado se o job já foi cancelado). A porcentagem só avança.
+        """
+        message = STAGES[stage][2]
+        if done is not None and total:
+            message = f"{message} ({done}/{total})"
+        status = COMPLETED if stage == 'completed' else PROCESSING
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, stage = ?, progress = MAX(progress, ?), done = ?, total = ?, '
+                'message = ?, updated_at = ? WHERE id = ? AND status != ?',
+                (status, stage, _stage_progress(stage, done, total), done, total,
+                 message, time.time(), job_id, CANCELLED)
+            )
+
+    def fail(self, job_id, error):
+        """Marca o job como falho (ignorado se o job já foi cancelado)"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, message = ?, error = ?, updated_at = ? WHERE id = ? AND status != ?',
+                (FAILED, 'Erro no processamento do documento', str(error), time.time(), job_id, CANCELLED)
+            )
+
+    def cancel(self, job_id):
+        """
+        Marca como cancelado um job na fila ou em processamento
+
+        Returns:
+            False se o job não existe ou já terminou
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, message = ?, error = ?, updated_at = ? '
+                'WHERE id = ? AND status IN (?, ?)',
+                (CANCELLED, CANCELLED_MESSAGE, CANCELLED_MESSAGE, time.time(), job_id, QUEUED, PROCESSING)
+            )
+        return cursor.rowcount == 1
+
+    def list_by_status(self, *statuses):
+        """Lista jobs com algum dos status informados, do mais antigo ao mais novo"""
+        placeholders = ', '.join('?' for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at',
+                statuses
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def is_active(self, output_filename):
+        """Se há um job na fila ou em processamento com esse nome de saída"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT 1 FROM jobs WHERE output_filename = ? AND status IN (?, ?) LIMIT 1',
+                (output_filename, QUEUED, PROCESSING)
+            ).fetchone()
+        return row is not None
+
+    def mark_used(self, output_filename):
+        """Registra que o resultado de um nome de saída foi usado agora (exibido ou baixado)"""
+        with self._connect() as conn:
+            conn.execute('UPDATE jobs SET last_used_at = ? WHERE output_filename = ?',
+                         (time.time(), output_filename))
+
+    def last_used_by_output(self):
+        """
+        Último uso de cada nome de saída: o mais recente entre a última
+        atualização dos jobs e o último ``mark_used``
+
+        Returns:
+            Dict output_filename -> timestamp
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT output_filename, MAX(MAX(updated_at, COALESCE(last_used_at, 0))) '
+                'FROM jobs GROUP BY output_filename'
+            ).fetchall()
+        return dict(rows)
+
+    def prune_finished(self, max_age):
+        """
+        Remove os registros de jobs terminados (concluídos, falhos ou
+        cancelados) sem atualização nem uso há mais de ``max_age`` segundos
+
+        Returns:
+            Número de registros removidos
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?, ?) AND MAX(updated_at, COALESCE(last_used_at, 0)) < ?',
+                (COMPLETED, FAILED, CANCELLED, time.time() - max_age)
+            )
+        return cursor.rowcount
+
+    def delete_for_output(self, output_filename):
+        """
+        Remove os registros terminados de um nome de saída, quando os arquivos
+        do job são apagados (ver StorageManager)
+
+        Returns:
+            Número de registros removidos
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'DELETE FROM jobs WHERE output_filename = ? AND status IN (?, ?, ?)',
+                (output_filename, COMPLETED, FAILED, CANCELLED)
+            )
+        return cursor.rowcount
+
+    def recover_interrupted(self, instance_id):
+        """
+        Marca como falhos os jobs em processamento por outra instância do
+        servidor (ex.: o servidor foi reiniciado durante o processamento).
+        A instância, e não o pid do worker, identifica o dono do job: depois de
+        um reinício os pids são reutilizados e o de um worker antigo pode
+        pertencer a um processo qualquer.
+
+        Args:
+            instance_id: identificador da instância atual (ver JobExecutor.instance_id)
+
+        Returns:
+            Lista de jobs ainda na fila, para que sejam submetidos novamente
+        """
+        for job in self.list_by_status(PROCESSING):
+            if job['instance_id'] != instance_id:
+                logger.warning(f"Job {job['id']} interrompido, marcando como falho")
+                self.fail(job['id'], 'Processamento interrompido (reinício do servidor)')
+        return self.list_by_status(QUEUED)
+
+
+class ProgressReporter:
+    """
+    Repassa o progresso de um job ao JobStore a partir do processo worker.
+
+    É serializável (pickle) para ser enviado junto com o job ao pool de
+    processos; depois da primeira atualização de cada etapa, as seguintes são
+    limitadas a uma a cada ``min_interval`` segundos para não sobrecarregar o banco.
+    Cada atualização gravada chama ``on_update`` (função de nível de módulo,
+    ex.: job_executor.notify_parent), se informada.
+    """
+
+    def __init__(self, db_path, job_id, min_interval=0.5, on_update=None, instance_id=None):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.instance_id = instance_id
+        self.min_interval = min_interval
+        self.on_update = on_update
+        self._store = None
+        self._seen_stages = set()
+        self._last_update = 0.0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_store'] = None
+        return state
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = JobStore(self.db_path)
+        return self._store
+
+    def start(self):
+        """Reivindica o job; retorna False se ele já estiver em execução em outro worker"""
+        return self.store.claim(self.job_id, self.instance_id)
+
+    def stage(self, stage, done=None, total=None):
+        """Informa a etapa atual e, opcionalmente, quantos itens dela já foram feitos"""
+        now = time.monotonic()
+        is_last_item = done is not None and done == total
+        # As etapas se alternam a cada página/seção/slide: só a primeira
+        # entrada em cada etapa e o último item são gravados fora do intervalo
+        if (stage in self._seen_stages and not is_last_item
+                and now - self._last_update < self.min_interval):
+            return
+        self._seen_stages.add(stage)
+        self._last_update = now
+        try:
+            self.store.set_stage(self.job_id, stage, done, total)
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível registrar progresso do job {self.job_id}: {e}")
+            return
+        if self.on_update is not None:
+            self.on_update()
+
+    def complete(self):
+        self.stage('completed')
+
+    def fail(self, error):
+        self.store.fail(self.job_id, error)
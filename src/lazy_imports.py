@@ -0,0 +1,103 @@
+"""
+DocToPPT - Lazy Imports
+Bibliotecas pesadas do pipeline (PyMuPDF, pdfplumber, PyPDF2, python-pptx,
+Pillow) carregadas sob demanda, com pré-aquecimento opcional em segundo plano
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Módulo -> distribuição no PyPI (para a mensagem de erro)
+HEAVY_MODULES = {
+    'fitz': 'PyMuPDF',
+    'pptx': 'python-pptx',
+    'PIL.Image': 'Pillow',
+    'pdfplumber': 'pdfplumber',
+    'PyPDF2': 'PyPDF2',
+    'numpy': 'numpy',
+}
+
+_prewarm_thread = None
+_prewarm_lock = threading.Lock()
+
+
+def load(name):
+    """
+    Importa um dos módulos pesados (ou devolve o já importado)
+
+    Raises:
+        ImportError: com a distribuição a instalar; nada é instalado em tempo de execução
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        package = HEAVY_MODULES.get(name, name)
+        raise ImportError(f"{name} não está disponível: instale {package} (pip install -r requirements.txt)") from e
+
+
+def missing(names=None):
+    """
+    Distribuições ausentes, verificadas sem importar os módulos
+
+    Returns:
+        Lista com os nomes no PyPI das que não foram encontradas
+    """
+    absent = []
+    for name in names or HEAVY_MODULES:
+        try:
+            found = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            absent.append(HEAVY_MODULES.get(name, name))
+    return absent
+
+
+def _prewarm(names):
+    start = time.perf_counter()
+    for name in names:
+        try:
+            load(name)
+        except ImportError as e:
+            logger.warning(str(e))
+    logger.info(f"Bibliotecas pré-carregadas em {time.perf_counter() - start:.2f}s")
+
+
+def prewarm(names=None, background=True):
+    """
+    Importa os módulos pesados antes do primeiro job
+
+    Com ``background`` a aplicação continua subindo (e respondendo) enquanto
+    uma thread faz as importações; chamadas repetidas reaproveitam a mesma thread.
+
+    Returns:
+        A thread de pré-aquecimento, ou None se foi feito na thread atual
+    """
+    global _prewarm_thread
+
+    names = list(names or HEAVY_MODULES)
+    if not background:
+        _prewarm(names)
+        return None
+    with _prewarm_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=_prewarm, args=(names,), name='prewarm-imports', daemon=True)
+            _prewarm_thread.start()
+        return _prewarm_thread
+
+
+def wait_prewarm(timeout=None):
+    """
+    Aguarda o pré-aquecimento em andamento, se houver
+
+    Usado antes de medir ou de criar processos por fork deste processo
+    (evita copiar um módulo importado pela metade).
+    """
+    thread = _prewarm_thread
+    if thread is not None and thread.is_alive():
+        thread.join(timeout)
@@ -0,0 +1,144 @@
+"""
+DocToPPT - LLM Cache
+Cache persistente (SQLite) das respostas da IA, endereçado pelo prompt normalizado
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at);
+"""
+
+
+def normalize_text(text):
+    """Normaliza Unicode (NFC) e espaços, para que variações de formatação gerem a mesma chave"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class LLMCache:
+    """
+    Respostas da IA por hash de modelo + temperatura + versão do prompt +
+    parâmetros + texto normalizado da seção.
+
+    Entradas mais antigas que ``ttl`` segundos são ignoradas e removidas; quando
+    o total passa de ``max_bytes`` as menos usadas recentemente são descartadas.
+    Pode ser compartilhado por vários processos (WAL) e usado por várias
+    threads (cada chamada abre a sua conexão; ex.: asyncio.to_thread).
+    """
+
+    def __init__(self, db_path, ttl=2592000, max_bytes=104857600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()  # contadores
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(model, temperature, prompt_version, text, **params):
+        """
+        Gera a chave do cache
+
+        Args:
+            model: Modelo usado
+            temperature: Temperatura da geração
+            prompt_version: Versão do prompt (ai_generator.PROMPT_VERSION)
+            text: Texto enviado (título + conteúdo da seção)
+            params: Demais parâmetros que alteram a resposta (ex.: idioma, max_tokens)
+
+        Returns:
+            Hash SHA-256 (hex)
+        """
+        payload = json.dumps(
+            [model, float(temperature), str(prompt_version), sorted(params.items()), normalize_text(text)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Retorna o valor (desserializado) guardado para a chave, ou None"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            if row and (not self.ttl or now - row[1] <= self.ttl):
+                conn.execute('UPDATE llm_cache SET accessed_at = ? WHERE key = ?', (now, key))
+                with self._lock:
+                    self.hits += 1
+                return json.loads(row[0])
+            if row:
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Guarda um valor serializável em JSON e aplica TTL e limite de tamanho"""
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, data, len(data.encode('utf-8')), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        if self.ttl:
+            expired = conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl,)).rowcount
+            with self._lock:
+                self.evictions += expired
+        if not self.max_bytes:
+            return
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute('SELECT key, size FROM llm_cache ORDER BY accessed_at LIMIT 100').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                with self._lock:
+                    self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self):
+        """Contadores do processo atual e ocupação do banco"""
+        with self._connect() as conn:
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache').fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes': size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
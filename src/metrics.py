@@ -0,0 +1,216 @@
+"""
+DocToPPT - Metrics
+Contadores, gauges e histogramas exportados no formato texto do Prometheus
+(sem dependências externas)
+"""
+
+import bisect
+import threading
+
+# Limites dos buckets, em segundos
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+JOB_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+    initial = None  # valor exportado antes da primeira observação (métricas sem rótulos)
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        # Séries sem rótulos aparecem desde a primeira coleta, para que rate()
+        # enxergue o primeiro incremento
+        if not self.label_names and self.initial is not None:
+            self._values[()] = self.initial
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Valor que só cresce (ex.: total de páginas processadas)"""
+
+    kind = 'counter'
+    initial = 0
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Valor instantâneo; com ``callback`` o valor é lido no momento da coleta
+    (ex.: profundidade da fila)
+    """
+
+    kind = 'gauge'
+    initial = 0
+
+    def __init__(self, name, documentation, labels=(), callback=None):
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self):
+        if self.callback is not None:
+            self.set(self.callback())
+        return super().render()
+
+
+class Histogram(_Metric):
+    """Distribuição de observações em buckets cumulativos, com soma e contagem"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=STAGE_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.label_names, key, [('le', _format_value(float(bound)))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas de um processo, exportado por ``render``"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._add(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=(), callback=None):
+        return self._add(Gauge(name, documentation, labels, callback))
+
+    def histogram(self, name, documentation, labels=(), buckets=STAGE_BUCKETS):
+        return self._add(Histogram(name, documentation, labels, buckets))
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class PipelineMetrics:
+    """Métricas do DocToPPT: jobs, etapas do pipeline, fila e rotas HTTP"""
+
+    def __init__(self, queue_depth=None):
+        self.registry = MetricsRegistry()
+        r = self.registry
+        self.stage_duration = r.histogram(
+            'doctoppt_stage_duration_seconds', 'Tempo gasto em cada etapa do pipeline', ('stage',))
+        self.job_duration = r.histogram(
+            'doctoppt_job_duration_seconds', 'Duração total dos jobs no worker', ('status',), JOB_BUCKETS)
+        self.jobs = r.counter('doctoppt_jobs_total', 'Jobs finalizados por situação', ('status',))
+        self.failures = r.counter(
+            'doctoppt_job_failures_total', 'Jobs que falharam, por tipo de exceção', ('exception',))
+        self.pages = r.counter('doctoppt_pages_processed_total', 'Páginas (ou blocos de texto) extraídas')
+        self.images = r.counter('doctoppt_images_processed_total', 'Imagens inseridas nos slides')
+        self.bytes_in = r.counter('doctoppt_bytes_in_total', 'Bytes de documentos processados')
+        self.bytes_out = r.counter('doctoppt_bytes_out_total', 'Bytes de apresentações geradas')
+        self.ai_cache = r.counter(
+            'doctoppt_ai_cache_lookups_total', 'Consultas ao cache de respostas da IA', ('result',))
+        self.storage_reclaimed = r.counter(
+            'doctoppt_storage_reclaimed_bytes_total', 'Bytes liberados pela varredura de armazenamento',
+            ('reason',))
+        self.storage_bytes = r.gauge(
+            'doctoppt_storage_bytes', 'Bytes ocupados por uploads e apresentações (última varredura)')
+        self.queue_depth = r.gauge(
+            'doctoppt_queue_depth', 'Jobs em execução ou aguardando no pool', callback=queue_depth)
+        self.http_duration = r.histogram(
+            'doctoppt_http_request_duration_seconds', 'Latência das rotas HTTP',
+            ('route', 'method', 'status'), HTTP_BUCKETS)
+
+    def observe_job(self, stats):
+        """Registra o resumo devolvido pelo worker (ver document_processor.run_job)"""
+        status = 'completed' if stats.get('ok') else 'failed'
+        self.jobs.inc(status=status)
+        self.job_duration.observe(stats.get('duration', 0.0), status=status)
+        for stage, seconds in stats.get('stages', {}).items():
+            self.stage_duration.observe(seconds, stage=stage)
+        self.pages.inc(stats.get('pages', 0))
+        self.images.inc(stats.get('images', 0))
+        self.bytes_in.inc(stats.get('bytes_in', 0))
+        self.bytes_out.inc(stats.get('bytes_out', 0))
+        if stats.get('ai_cache_hits'):
+            self.ai_cache.inc(stats['ai_cache_hits'], result='hit')
+        if stats.get('ai_cache_misses'):
+            self.ai_cache.inc(stats['ai_cache_misses'], result='miss')
+        if stats.get('error_type'):
+            self.failures.inc(exception=stats['error_type'])
+
+    def observe_failure(self, exc):
+        """Falha ocorrida fora do pipeline (fila cheia, worker morto, etc.)"""
+        self.jobs.inc(status='failed')
+        self.failures.inc(exception=type(exc).__name__)
+
+    def observe_cancel(self):
+        """Job cancelado pelo usuário (DELETE /api/jobs/<id>)"""
+        self.jobs.inc(status='cancelled')
+
+    def render(self):
+        return self.registry.render()
@@ -0,0 +1,378 @@
+"""
+DocToPPT - PDF Extractor
+Extração de texto estruturado e imagens de PDFs
+
+O motor padrão usa PyMuPDF e lê texto (com tamanho/fonte de cada linha) e
+as referências das imagens em uma única abertura do arquivo. O pdfplumber continua disponível
+como motor opcional (PDF_ENGINE=pdfplumber) e o PyPDF2 como último recurso.
+
+Documentos grandes são divididos em faixas de páginas (shards) extraídas em
+paralelo por processos separados, cada um abrindo o arquivo por conta própria;
+os resultados são unidos na ordem das páginas.
+
+As páginas são produzidas por geradores: cada página (lista de linhas
+estruturadas) é entregue ao pipeline assim que extraída, sem manter o
+documento inteiro na memória.
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('pymupdf', 'pdfplumber')
+
+
+def _image_record(page_num, page_images):
+    """Linha estruturada que associa as imagens (xrefs) de uma página ao seu texto"""
+    return {
+        'text': f"[IMAGENS: {len(page_images)}]",
+        'size': 12,
+        'font': 'Image',
+        'y': 999999,  # Valor alto para ser processado por último
+        'page': page_num,
+        'images': page_images
+    }
+
+
+def _page_image_xrefs(page, skip_xrefs):
+    """
+    Lista os xrefs das imagens de uma página, sem extrair os bytes
+
+    A extração, deduplicação e redimensionamento só acontecem quando um
+    slide usa a imagem (ver src/image_processor.py).
+    """
+    xrefs = []
+    for img in page.get_images(full=True):
+        xref = img[0]  # número de referência
+        if xref not in skip_xrefs and xref not in xrefs:
+            xrefs.append(xref)
+    return xrefs
+
+
+class DecorativeImageScanner:
+    """
+    Identifica imagens repetidas em muitas páginas (logotipos, cabeçalhos, marcas d'água)
+
+    As páginas são examinadas sob demanda, em janelas que dobram de tamanho à
+    medida que a extração avança (ver ``covering``): o custo acompanha as
+    páginas realmente lidas e não o tamanho do documento. O conjunto
+    ``xrefs`` é atualizado no lugar e pode ser repassado aos extratores.
+    """
+
+    def __init__(self, doc, end, repeat_pages=3, window=8):
+        self.doc = doc
+        self.end = end
+        self.repeat_pages = repeat_pages
+        self.window = window
+        self.scanned = 0
+        self.xrefs = set()
+        self._page_counts = {}
+
+    def covering(self, page_end):
+        """
+        Garante que as páginas até ``page_end`` (exclusivo) foram examinadas
+
+        Returns:
+            Conjunto dos xrefs presentes em ``repeat_pages`` páginas ou mais
+            entre as páginas examinadas
+        """
+        if not self.repeat_pages or page_end <= self.scanned or self.scanned >= self.end:
+            return self.xrefs
+        target = min(self.end, max(page_end, self.scanned + self.window))
+        self.window *= 2
+        for page_num in range(self.scanned, target):
+            for xref in {img[0] for img in self.doc[page_num].get_images(full=True)}:
+                count = self._page_counts.get(xref, 0) + 1
+                self._page_counts[xref] = count
+                if count == self.repeat_pages:
+                    self.xrefs.add(xref)
+        self.scanned = target
+        return self.xrefs
+
+
+def _pymupdf_page_lines(page, page_num):
+    """Converte o dict de texto do PyMuPDF em linhas estruturadas (texto, tamanho, fonte, y, página)"""
+    import fitz
+
+    structured_lines = []
+    text_dict = page.get_text('dict', flags=fitz.TEXTFLAGS_TEXT, sort=True)
+    for block in text_dict['blocks']:
+        for line in block.get('lines', ()):
+            spans = [span for span in line['spans'] if span['text'].strip()]
+            if not spans:
+                continue
+            structured_lines.append({
+                'text': " ".join(span['text'].strip() for span in spans),
+                # Usar o maior tamanho da linha (provável destaque), como no agrupamento por palavras
+                'size': round(max(span['size'] for span in spans), 2),
+                'font': spans[0]['font'],
+                'y': line['bbox'][1],
+                'page': page_num
+            })
+    return structured_lines
+
+
+def iter_pages_pymupdf(file_path, start=0, end=None, with_images=True, skip_xrefs=frozenset()):
+    """
+    Extrai texto estruturado e referências de imagens de um PDF com uma única abertura (PyMuPDF)
+
+    Args:
+        file_path: Caminho do arquivo PDF
+        start, end: Faixa de páginas lidas (base 0, ``end`` exclusivo; None lê até o fim)
+        with_images: Incluir os xrefs das imagens de cada página
+        skip_xrefs: Xrefs ignorados (imagens decorativas repetidas)
+
+    Yields:
+        Lista de linhas estruturadas (text, size, font, y, page) de cada página
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(file_path) as doc:
+        end = len(doc) if end is None else min(end, len(doc))
+
+        for page_num in range(start, end):
+            page = doc[page_num]
+            structured_lines = _pymupdf_page_lines(page, page_num)
+
+            if with_images:
+                page_images = _page_image_xrefs(page, skip_xrefs)
+                if page_images:
+                    structured_lines.append(_image_record(page_num, page_images))
+
+            # Log para debug
+            if page_num == 0:
+                preview = " | ".join(line['text'] for line in structured_lines[:5])
+                logger.info(f"Amostra de texto extraído com PyMuPDF: {preview[:200]}")
+                logger.info(f"Estrutura de fonte identificada: {len(structured_lines)} linhas")
+
+            yield structured_lines
+
+
+def _pdfplumber_page_lines(page, page_num):
+    """Agrupa as palavras do pdfplumber em linhas preservando tamanho e fonte"""
+    structured_lines = []
+
+    # Extrair texto com informações de fonte
+    text_objects = page.extract_words(x_tolerance=3, y_tolerance=3, keep_blank_chars=False,
+                                      use_text_flow=True, extra_attrs=['size', 'fontname'])
+
+    # Agrupar palavras em linhas preservando informações de tamanho da fonte
+    current_y = None
+    current_line = []
+    current_size = None
+    current_font = None
+
+    for word in text_objects:
+        if current_y is None or abs(word['top'] - current_y) > 5:
+            # Nova linha detectada
+            if current_line:
+                structured_lines.append({
+                    'text': " ".join([w['text'] for w in current_line]),
+                    'size': current_size,
+                    'font': current_font,
+                    'y': current_y,
+                    'page': page_num
+                })
+
+            current_line = [word]
+            current_y = word['top']
+            current_size = word['size']
+            current_font = word['fontname']
+        else:
+            # Continuar mesma linha
+            current_line.append(word)
+            # Atualizar tamanho de fonte se for maior (provável destaque)
+            if word['size'] > current_size:
+                current_size = word['size']
+
+    # Adicionar última linha
+    if current_line:
+        structured_lines.append({
+            'text': " ".join([w['text'] for w in current_line]),
+            'size': current_size,
+            'font': current_font,
+            'y': current_y,
+            'page': page_num
+        })
+    return structured_lines
+
+
+def iter_pages_pdfplumber(file_path, start=0, end=None, with_images=True, skip_xrefs=frozenset()):
+    """
+    Extrai texto estruturado com pdfplumber (motor opcional, mais lento)
+    As imagens continuam sendo listadas com PyMuPDF.
+
+    Args/Yields: ver iter_pages_pymupdf
+    """
+    import fitz  # PyMuPDF
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf, fitz.open(file_path) as doc:
+        end = len(pdf.pages) if end is None else min(end, len(pdf.pages))
+
+        for page_num in range(start, end):
+            structured_lines = _pdfplumber_page_lines(pdf.pages[page_num], page_num)
+
+            if with_images:
+                page_images = _page_image_xrefs(doc[page_num], skip_xrefs)
+                if page_images:
+                    structured_lines.append(_image_record(page_num, page_images))
+
+            # Log para debug
+            if page_num == 0:
+                preview = " | ".join(line['text'] for line in structured_lines[:5])
+                logger.info(f"Amostra de texto extraído com pdfplumber: {preview[:200]}")
+                logger.info(f"Estrutura de fonte identificada: {len(structured_lines)} linhas")
+
+            yield structured_lines
+
+
+def iter_pages_pypdf2(file_path, start=0, end=None):
+    """
+    Extração simples de texto com PyPDF2, sem informações de fonte nem imagens
+    Usada como último recurso quando os outros motores falham.
+
+    Args/Yields: ver iter_pages_pymupdf
+    """
+    import PyPDF2
+
+    with open(file_path, 'rb') as pdf_file:
+        reader = PyPDF2.PdfReader(pdf_file)
+        end = len(reader.pages) if end is None else min(end, len(reader.pages))
+
+        for page_num in range(start, end):
+            extracted_text = reader.pages[page_num].extract_text() or ""
+
+            # Log para debug
+            if page_num == 0:
+                preview = extracted_text[:200] + "..." if len(extracted_text) > 200 else extracted_text
+                logger.info(f"Amostra de texto extraído com PyPDF2: {preview}")
+
+            # Para compatibilidade com o pipeline
+            yield [{'text': line, 'size': 12, 'font': 'Unknown', 'page': page_num}
+                   for line in extracted_text.split('\n')]
+
+
+_ENGINE_ITERATORS = {
+    'pymupdf': iter_pages_pymupdf,
+    'pdfplumber': iter_pages_pdfplumber,
+}
+
+
+def extract_pages(engine, file_path, start=0, end=None, with_images=True, skip_xrefs=frozenset()):
+    """Extrai uma faixa de páginas como lista (usada pelos processos de cada shard)"""
+    return list(_ENGINE_ITERATORS[engine](file_path, start, end, with_images, skip_xrefs))
+
+
+def _iter_sharded(engine, file_path, pages_to_read, shard_pages, workers, with_images, scanner):
+    """
+    Extrai faixas de páginas em processos paralelos e entrega as páginas na ordem
+
+    No máximo ``2 * workers`` shards ficam em andamento ou aguardando consumo,
+    o que limita a memória ao tamanho dos shards e não ao do documento. As
+    imagens decorativas de cada shard são identificadas (``scanner``) só
+    quando ele é submetido.
+    """
+    def submit(start, end):
+        skip_xrefs = frozenset(scanner.covering(end)) if scanner else frozenset()
+        return executor.submit(extract_pages, engine, file_path, start, end, with_images, skip_xrefs)
+
+    shards = [(start, min(start + shard_pages, pages_to_read))
+              for start in range(0, pages_to_read, shard_pages)]
+    workers = min(workers, len(shards))
+    logger.info(f"Extraindo {pages_to_read} páginas em {len(shards)} shards com {workers} processos")
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        remaining = iter(shards)
+        for start, end in remaining:
+            pending.append(submit(start, end))
+            if len(pending) >= 2 * workers:
+                break
+
+        while pending:
+            shard = pending.popleft().result()
+            next_shard = next(remaining, None)
+            if next_shard:
+                pending.append(submit(*next_shard))
+            yield from shard
+    finally:
+        # Consumidor parou antes do fim (ou erro): descartar shards ainda não iniciados
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pdf_pages(file_path, engine='pymupdf', max_pages=None, progress=None,
+                   shard_pages=25, workers=1, with_images=True, repeat_pages=3):
+    """
+    Extrai texto estruturado e referências de imagens de um PDF com o motor configurado,
+    recorrendo ao PyPDF2 (a partir da página que falhou) se o motor escolhido falhar
+
+    Args:
+        file_path: Caminho do arquivo PDF
+        engine: 'pymupdf' (padrão) ou 'pdfplumber'
+        max_pages: Número máximo de páginas lidas (None ou 0 para todas)
+        progress: ProgressReporter do job (opcional)
+        shard_pages: Páginas por shard na extração paralela
+        workers: Processos usados na extração paralela (1 para extração serial)
+        with_images: Incluir os xrefs das imagens de cada página
+        repeat_pages: Imagens presentes em tantas páginas ou mais são tratadas como decorativas
+
+    Yields:
+        Lista de linhas estruturadas de cada página, na ordem do documento
+    """
+    if engine not in ENGINES:
+        logger.warning(f"Motor de PDF desconhecido '{engine}', usando pymupdf")
+        engine = 'pymupdf'
+
+    import fitz  # PyMuPDF
+
+    pages_done = 0
+    pages_to_read = max_pages or None
+    scanner = None
+    try:
+        # Documento aberto enquanto a extração durar: as imagens decorativas são
+        # procuradas só nas páginas que o consumidor chegar a pedir
+        with fitz.open(file_path) as doc:
+            num_pages = len(doc)
+            pages_to_read = min(num_pages, max_pages) if max_pages else num_pages
+            logger.info(f"PDF tem {num_pages} páginas, lendo até {pages_to_read}")
+            if with_images and repeat_pages:
+                scanner = DecorativeImageScanner(doc, pages_to_read, repeat_pages)
+
+            serial = workers <= 1 or pages_to_read <= shard_pages
+            if not serial:
+                pages = _iter_sharded(engine, file_path, pages_to_read, shard_pages, workers,
+                                      with_images, scanner)
+            else:
+                skip_xrefs = scanner.xrefs if scanner else frozenset()
+                pages = _ENGINE_ITERATORS[engine](file_path, 0, pages_to_read, with_images, skip_xrefs)
+
+            try:
+                while True:
+                    if scanner and serial:
+                        scanner.covering(pages_done + 1)
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    pages_done += 1
+                    if progress:
+                        progress.stage('text_extraction', pages_done, pages_to_read)
+                    yield page
+            finally:
+                pages.close()
+                if scanner and scanner.xrefs:
+                    logger.info(f"Ignoradas {len(scanner.xrefs)} imagens repetidas em {repeat_pages}+ páginas "
+                                f"(examinadas {scanner.scanned} de {pages_to_read})")
+    except Exception as pdfex:
+        logger.error(f"Erro ao processar PDF com {engine} (página {pages_done + 1}): {pdfex}")
+        logger.info("Tentando método alternativo com PyPDF2...")
+        for page in iter_pages_pypdf2(file_path, pages_done, pages_to_read):
+            pages_done += 1
+            if progress:
+                progress.stage('text_extraction', pages_done, pages_to_read)
+            yield page
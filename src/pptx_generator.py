@@ -0,0 +1,339 @@
+"""
+DocToPPT - PPTX Generator
+Renderização dos slides a partir das seções produzidas pelo document_processor
+"""
+
+import copy
+import re
+import logging
+from xml.sax.saxutils import escape
+
+from src.stage_timer import StageTimer
+from src.text_extractor import CODE_LINE_PREFIX
+from src.text_fit import TextPacker
+
+logger = logging.getLogger(__name__)
+
+
+# Marcador de lista no início da linha: "•", "-", "*"... e/ou numeração "1." / "2)"
+_BULLET = re.compile(r'^\s*(?:[•\-\*\+◦○●■]\s+(?:[0-9]+[\.\)]\s+)?|[0-9]+[\.\)]\s+)')
+
+# Caracteres de controle que não podem aparecer em XML (escritos como _xHHHH_, como no python-pptx)
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Final de frase: a linha seguinte começa um novo parágrafo
+_PARAGRAPH_END = ('.', '!', '?', '…', ':', ';', ']')
+
+# Limite padrão de slides de conteúdo, incluindo os de continuação e sem contar os
+# slides de título e de conclusão (ver Config.MAX_SLIDES)
+MAX_CONTENT_SLIDES = 20
+
+_NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+
+def body_paragraphs(content):
+    """
+    Parágrafos do corpo de um slide a partir do conteúdo da seção
+
+    Linhas com marcador de lista viram itens de nível 1 (sem o marcador),
+    separados do texto corrido por uma linha em branco. Linhas de texto que
+    não terminam uma frase (quebras de linha do PDF, por exemplo) são unidas
+    à linha seguinte em um único parágrafo; linhas de código (prefixo
+    CODE_LINE_PREFIX) ficam cada uma em seu parágrafo.
+
+    Args:
+        content: Lista de linhas ou texto
+
+    Returns:
+        Lista de tuplas (nível, texto)
+    """
+    if isinstance(content, list):
+        formatted = []
+        bullet_mode = False
+        for line in content:
+            match = None if line.startswith(CODE_LINE_PREFIX) else _BULLET.match(line)
+            if match:
+                if not bullet_mode:
+                    bullet_mode = True
+                    if formatted and formatted[-1].strip():
+                        formatted.append('')  # Linha em branco antes da lista
+                formatted.append('• ' + line[match.end():].strip())
+            else:
+                if bullet_mode and line.strip():
+                    bullet_mode = False
+                    formatted.append('')  # Linha em branco depois da lista
+                formatted.append(line)
+        content = "\n".join(formatted)
+
+    has_bullets = '• ' in content
+    paragraphs = []
+    prose = []  # linhas do parágrafo de texto em aberto
+
+    def close_prose():
+        if prose:
+            paragraphs.append((0, ' '.join(prose)))
+            prose.clear()
+
+    for line in content.split('\n'):
+        if has_bullets and line.startswith('• '):
+            close_prose()
+            paragraphs.append((1, line[2:]))
+        elif line.startswith(CODE_LINE_PREFIX):
+            close_prose()
+            paragraphs.append((0, line[len(CODE_LINE_PREFIX):]))
+        elif not line.strip():
+            close_prose()
+            paragraphs.append((0, line))
+        else:
+            prose.append(line.strip() if prose else line)
+            if line.rstrip().endswith(_PARAGRAPH_END):
+                close_prose()
+    close_prose()
+    return paragraphs
+
+
+def fill_text(sp, paragraphs):
+    """
+    Substitui os parágrafos de uma forma (p:sp) de uma só vez, montando o XML
+    de todos os parágrafos e interpretando-o em uma única chamada
+
+    Args:
+        sp: Elemento p:sp do placeholder
+        paragraphs: Lista de tuplas (nível, texto); vazia deixa um parágrafo vazio
+    """
+    from pptx.oxml import parse_xml
+
+    parts = []
+    for level, text in paragraphs:
+        ppr = f'<a:pPr lvl="{level}"/>' if level else ''
+        text = _XML_INVALID.sub(lambda m: f'_x{ord(m.group()):04X}_', text)
+        if text:
+            parts.append(f'<a:p>{ppr}<a:r><a:t>{escape(text)}</a:t></a:r></a:p>')
+        else:
+            parts.append(f'<a:p>{ppr}</a:p>')
+    if not parts:
+        parts.append('<a:p/>')  # o txBody exige ao menos um parágrafo (ex.: corpo vazio)
+    new_paragraphs = parse_xml(f'<a:txBody xmlns:a="{_NS_A}">{"".join(parts)}</a:txBody>')
+
+    tx_body = sp.get_or_add_txBody()
+    for old in tx_body.findall(f'{{{_NS_A}}}p'):
+        tx_body.remove(old)
+    tx_body.extend(list(new_paragraphs))
+
+
+class SlideRenderer:
+    """
+    Cria slides de conteúdo a partir de um modelo de placeholders por layout
+
+    Na primeira vez que um layout é usado, os placeholders são clonados do
+    layout pelo python-pptx e guardados como modelo, junto com a posição dos
+    placeholders de título e corpo (idx do catálogo de layouts). Os slides
+    seguintes do mesmo layout recebem uma cópia do modelo, sem percorrer os
+    placeholders de novo.
+
+    A parte do slide é criada e relacionada diretamente: a apresentação acaba
+    de receber o slide, então não é preciso procurar uma relação existente
+    nem o maior id de slide a cada slide (ambos percorrem o deck inteiro).
+    """
+
+    def __init__(self, prs, layout_catalog):
+        self.prs = prs
+        self._layouts = list(prs.slide_layouts)
+        self._catalog = {entry['index']: entry for entry in layout_catalog['layouts']}
+        self._slide_ids = prs.element.get_or_add_sldIdLst()
+        self._next_slide_id = max((int(sld_id.get('id')) for sld_id in self._slide_ids), default=255) + 1
+        self._prototypes = {}  # índice do layout -> (formas, posição do título, posição do corpo)
+
+    def has_text_placeholders(self, layout_index):
+        """Se o layout tem placeholders de título e de corpo"""
+        entry = self._catalog.get(layout_index)
+        return bool(entry) and entry['title'] is not None and entry['body'] is not None
+
+    def body_box(self, layout_index):
+        """Área de texto do corpo do layout (None = caixa padrão, ver text_fit.body_box)"""
+        return self._catalog[layout_index].get('body_box')
+
+    def _new_slide(self, layout):
+        """Slide vazio (sem formas) baseado em ``layout``, já incluído na apresentação"""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from pptx.opc.packuri import PackURI
+        from pptx.oxml.ns import qn
+        from pptx.parts.slide import SlidePart
+
+        prs_part = self.prs.part
+        partname = PackURI(f"/ppt/slides/slide{len(self._slide_ids) + 1}.xml")
+        slide_part = SlidePart.new(partname, prs_part.package, layout.part)
+        add_relationship = getattr(prs_part.rels, '_add_relationship', None)
+        if add_relationship is not None and self._next_slide_id <= 2147483647:
+            rId = add_relationship(RT.SLIDE, slide_part)
+            sld_id = self._slide_ids.makeelement(qn('p:sldId'), {'id': str(self._next_slide_id), qn('r:id'): rId})
+            self._slide_ids.append(sld_id)
+            self._next_slide_id += 1
+        else:
+            # Versões do python-pptx sem o atalho: caminho público
+            self._slide_ids.add_sldId(prs_part.relate_to(slide_part, RT.SLIDE))
+        return slide_part.slide
+
+    def add_slide(self, layout_index):
+        """
+        Adiciona um slide com os placeholders do layout
+
+        Returns:
+            Tupla (Slide, p:sp do título, p:sp do corpo)
+        """
+        layout = self._layouts[layout_index]
+        slide = self._new_slide(layout)
+        sp_tree = slide.element.cSld.spTree
+
+        prototype = self._prototypes.get(layout_index)
+        if prototype is None:
+            slide.shapes.clone_layout_placeholders(layout)
+            shapes = list(sp_tree.iter_shape_elms())
+            positions = {shape.ph_idx: pos for pos, shape in enumerate(shapes) if getattr(shape, 'has_ph_elm', False)}
+            entry = self._catalog[layout_index]
+            prototype = ([copy.deepcopy(shape) for shape in shapes], positions[entry['title']], positions[entry['body']])
+            self._prototypes[layout_index] = prototype
+            return slide, shapes[prototype[1]], shapes[prototype[2]]
+
+        shapes, title_pos, body_pos = prototype
+        copies = [copy.deepcopy(shape) for shape in shapes]
+        sp_tree.extend(copies)
+        return slide, copies[title_pos], copies[body_pos]
+
+
+def render_presentation(prs, layout_catalog, slide_sections, output_filename, use_template=False,
+                        image_store=None, timer=None, max_slides=MAX_CONTENT_SLIDES, progress=None):
+    """
+    Adiciona à apresentação o slide de título, um slide por seção e o slide de conclusão
+
+    As seções são puxadas uma a uma de ``slide_sections``; ao atingir
+    ``max_slides`` o renderizador para de pedir seções, e as etapas anteriores
+    (extração, imagens, IA) não processam o restante do documento.
+
+    Args:
+        prs: Presentation (cópia do template ou apresentação padrão)
+        layout_catalog: Catálogo de layouts (ver template_processor.build_layout_catalog)
+        slide_sections: Iterável de seções {"title", "content", "images"}
+        output_filename: Nome do documento, usado no slide de título
+        use_template: Se a apresentação veio de um template (reaproveita o primeiro slide)
+        image_store: PdfImageStore para materializar as imagens das seções (opcional)
+        timer: StageTimer que recebe o tempo de extração de imagens (opcional)
+        max_slides: Máximo de slides de conteúdo (0 ou None para não limitar); os
+            slides de título e de conclusão não entram na conta
+        progress: ProgressReporter do job (opcional): etapas slide_rendering e
+            image_extraction, contadas em slides de ``max_slides``
+    """
+    from pptx.util import Inches
+
+    timer = timer or StageTimer()
+    
+    # Slide de título (adicionar ou usar o primeiro slide existente)
+    if len(prs.slides) > 0 and use_template:
+        # Usar o primeiro slide do template como título
+        slide = prs.slides[0]
+        try:
+            for shape in slide.shapes:
+                if shape.has_text_frame:
+                    if shape == slide.shapes.title:
+                        shape.text = f"{output_filename} - Apresentação"
+                    else:
+                        shape.text = "Gerado automaticamente por DocToPPT"
+                    break
+        except Exception as e:
+            logger.warning(f"Não foi possível editar o slide de título do template: {str(e)}")
+    else:
+        # Criar slide de título
+        title_slide_layout = prs.slide_layouts[0]
+        slide = prs.slides.add_slide(title_slide_layout)
+        title = slide.shapes.title
+        subtitle = slide.placeholders[1]
+        
+        title.text = f"{output_filename} - Apresentação"
+        subtitle.text = "Gerado automaticamente por DocToPPT"
+    
+    # Determinar qual layout usar para os slides de conteúdo
+    # Preferir layouts do template (com título e conteúdo), conforme o catálogo
+    content_layouts = []
+    if use_template and len(prs.slide_layouts) > 1:
+        content_layouts = list(layout_catalog['content_layouts'])
+    
+    # Se não encontrou layouts adequados no template, usar o padrão
+    if not content_layouts:
+        content_layouts = [1]  # Layout de título e conteúdo padrão
+    
+    renderer = SlideRenderer(prs, layout_catalog)
+    slide_total = max_slides or None
+    max_slides = max_slides or float('inf')
+    
+    # Criar slides conforme as seções são fechadas; o texto de cada seção é
+    # distribuído pelos slides de continuação que forem necessários
+    slide_count = 0
+    for section in slide_sections:
+        packer = TextPacker(body_paragraphs(section["content"]))
+        part = 0
+        while slide_count < max_slides and (part == 0 or not packer.done):
+            # Escolher layout apropriado
+            layout_index = content_layouts[slide_count % len(content_layouts)]
+            slide_count += 1
+            
+            # Se não tem os placeholders esperados, pular esta seção
+            if not renderer.has_text_placeholders(layout_index):
+                logger.warning(f"Layout {layout_index} não tem placeholders esperados, pulando.")
+                break
+            slide, title, content = renderer.add_slide(layout_index)
+            if progress:
+                progress.stage('slide_rendering', slide_count, slide_total)
+            
+            # Adicionar as imagens encontradas nesta seção (até 2, no primeiro slide da seção)
+            section_images = section.get("images", [])[:2] if part == 0 else []
+            if section_images and image_store:
+                if progress:
+                    progress.stage('image_extraction', slide_count, slide_total)
+                if len(section_images) == 1:
+                    # Uma imagem - posicionar à direita, largura menor para não cobrir texto
+                    placements = [(5, 2, 4)]
+                else:
+                    # Múltiplas imagens - distribuir abaixo do conteúdo
+                    placements = [(1 + (idx * 3), 4, 3) for idx in range(len(section_images))]
+                
+                for idx, (xref, (left, top, width)) in enumerate(zip(section_images, placements)):
+                    try:
+                        # Imagem extraída e reduzida para a largura em que será colocada
+                        with timer.stage('image_extraction'):
+                            img_path = image_store.image_for_slide(xref, width)
+                        if img_path:
+                            slide.shapes.add_picture(img_path, Inches(left), Inches(top), width=Inches(width))
+                            timer.add('images')
+                            logger.info(f"Imagem {idx+1} adicionada ao slide {slide_count}: {img_path}")
+                    except Exception as img_err:
+                        logger.error(f"Erro ao adicionar imagem {idx+1} ao slide {slide_count}: {img_err}")
+            
+            title_text = section["title"] if part == 0 else f"{section['title']} (cont. {part + 1})"
+            fill_text(title, [(0, title_text)])
+            fill_text(content, packer.take(renderer.body_box(layout_index)))
+            part += 1
+        if slide_count >= max_slides:
+            logger.info(f"Limite de {slide_count} slides de conteúdo atingido, encerrando a leitura do documento")
+            break
+    
+    # Adicionar slide de conclusão (primeiro layout de conteúdo)
+    if renderer.has_text_placeholders(content_layouts[0]):
+        _, title, content = renderer.add_slide(content_layouts[0])
+        fill_text(title, [(0, "Conclusão")])
+        fill_text(content, [(0, "Obrigado!"), (0, ""),
+                            (0, "Este documento foi gerado automaticamente pelo DocToPPT.")])
+
+
+def write_error_presentation(output_path, error):
+    """Grava um PPTX de um slide informando o erro ao usuário"""
+    from pptx import Presentation
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title = slide.shapes.title
+    subtitle = slide.placeholders[1]
+
+    title.text = "Erro no Processamento"
+    subtitle.text = f"Ocorreu um erro ao processar o documento: {str(error)}"
+
+    prs.save(output_path)
@@ -0,0 +1,145 @@
+"""
+DocToPPT - Result Cache
+Cache em disco das apresentações geradas, endereçado pelo conteúdo da entrada
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path, hasher=None):
+    """Calcula o SHA-256 de um arquivo lendo em blocos (sem carregar tudo na memória)"""
+    hasher = hasher or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher
+
+
+class ResultCache:
+    """
+    Armazena o .pptx gerado para cada combinação documento + template + configurações.
+
+    As entradas ficam em ``cache_dir/<chave>.pptx``; o mtime de cada arquivo é
+    atualizado a cada acerto e serve de ordem LRU para a remoção quando o
+    tamanho total passa de ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(document_path, template_path=None, settings=None, document_digest=None, template_digest=None):
+        """
+        Gera a chave do cache
+
+        Args:
+            document_path: Caminho do documento de entrada
+            template_path: Caminho do template PPTX (opcional)
+            settings: Dict com as configurações que afetam o resultado
+            document_digest: SHA-256 (bytes) do documento já calculado, por
+                exemplo durante o upload; evita uma segunda leitura do arquivo
+            template_digest: SHA-256 (bytes) do template já calculado (ex.: o
+                mesmo template aplicado a vários documentos no CLI)
+
+        Returns:
+            Hash SHA-256 (hex) do documento, template e configurações
+        """
+        hasher = hashlib.sha256()
+        hasher.update(b'document\0')
+        hasher.update(document_digest or file_digest(document_path).digest())
+        hasher.update(b'template\0')
+        if template_digest:
+            hasher.update(template_digest)
+        elif template_path and os.path.exists(template_path):
+            hasher.update(file_digest(template_path).digest())
+        hasher.update(b'settings\0')
+        hasher.update(json.dumps(settings or {}, sort_keys=True).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pptx")
+
+    def get(self, key, destination):
+        """
+        Copia o resultado em cache para ``destination``
+
+        Returns:
+            True em caso de acerto, False caso a chave não esteja no cache
+        """
+        entry = self._entry_path(key)
+        try:
+            shutil.copyfile(entry, destination)
+            os.utime(entry)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"Resultado encontrado no cache: {key[:12]}")
+        return True
+
+    def put(self, key, source_path):
+        """Adiciona uma apresentação gerada ao cache e aplica o limite de tamanho"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Não foi possível armazenar resultado no cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove as entradas menos usadas até o cache caber em ``max_bytes``"""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.pptx'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        """Contadores de acertos, falhas e remoções"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
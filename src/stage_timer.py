@@ -0,0 +1,85 @@
+"""
+DocToPPT - Stage Timer
+Medição do tempo gasto em cada etapa do pipeline de conversão
+"""
+
+import time
+from contextlib import contextmanager
+
+# Etapas medidas por process_document, na ordem em que aparecem nos relatórios
+PIPELINE_STAGES = (
+    'template_loading',
+    'text_extraction',
+    'heading_detection',
+    'section_detection',
+    'ai_generation',
+    'image_extraction',
+    'slide_rendering',
+    'save'
+)
+
+
+class StageTimer:
+    """
+    Acumula o tempo exclusivo de cada etapa
+
+    Como o pipeline é feito de geradores encadeados, as etapas se intercalam:
+    pedir a próxima seção executa a detecção de cabeçalhos, que por sua vez
+    lê páginas do PDF. Cada intervalo medido desconta o tempo das etapas
+    aninhadas, de modo que a soma das etapas corresponde ao tempo total.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.counts = {}
+        self.failure = None  # tipo da exceção que interrompeu o pipeline, se houver
+        self._stack = []  # [nome, tempo das etapas aninhadas]
+
+    def begin(self, name):
+        """Inicia um intervalo da etapa ``name``; retorna o token para ``end``"""
+        self._stack.append([name, 0.0])
+        return time.perf_counter()
+
+    def end(self, start):
+        """Encerra o intervalo mais recente iniciado com ``begin``"""
+        elapsed = time.perf_counter() - start
+        name, nested = self._stack.pop()
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    @contextmanager
+    def stage(self, name):
+        """Mede o bloco ``with`` como parte da etapa ``name``"""
+        start = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(start)
+
+    def iterate(self, name, iterable):
+        """Repassa os itens de ``iterable`` atribuindo a ``name`` o tempo gasto para produzi-los"""
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = self.begin(name)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.end(start)
+                self.add(name)
+                yield item
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    def add(self, name, amount=1):
+        """Soma ``amount`` ao contador ``name`` (ex.: imagens inseridas)"""
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def as_dict(self):
+        """Tempos por etapa em segundos (dict serializável, devolvido pelo worker)"""
+        return dict(self.seconds)
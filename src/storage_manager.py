@@ -0,0 +1,251 @@
+"""
+DocToPPT - Storage Manager
+Ciclo de vida dos arquivos dos jobs (uploads, apresentações e imagens
+intermediárias): expiração por TTL, cota de disco com LRU e varredura em
+segundo plano
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+
+from src.job_store import QUEUED, PROCESSING
+
+logger = logging.getLogger(__name__)
+
+IMAGE_DIR_PREFIX = 'images_'
+
+# Arquivos varridos por vez antes de ceder a CPU às requisições
+_YIELD_EVERY = 200
+
+
+def _path_size(path):
+    """Tamanho de um arquivo, ou a soma dos arquivos de um diretório"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class StorageManager:
+    """
+    Remove os artefatos dos jobs em ``upload_dir`` e ``output_dir``.
+
+    Os artefatos de um job compartilham o nome base: ``relatorio.pdf`` (upload),
+    ``relatorio.pptx`` e ``images_relatorio/`` (saída). Cada grupo expira
+    inteiro quando não é usado há mais de ``ttl`` segundos (o uso é a última
+    alteração dos arquivos ou dos jobs do nome, ou o último ``touch`` ao exibir
+    ou baixar o resultado); se o total passar de
+    ``quota_bytes``, os grupos usados há mais tempo são removidos primeiro.
+    Arquivos de jobs na fila ou em execução nunca são removidos, e diretórios
+    de imagens sem job ativo (ex.: worker interrompido) são sempre descartados.
+    Os registros dos jobs cujos arquivos foram removidos, e os de jobs
+    terminados há mais de ``job_history_ttl`` segundos, saem do JobStore na
+    mesma varredura.
+    """
+
+    def __init__(self, upload_dir, output_dir, job_store, ttl=604800, quota_bytes=0,
+                 upload_store=None, metrics=None, job_history_ttl=0):
+        self.upload_dir = upload_dir
+        self.output_dir = output_dir
+        self.job_store = job_store
+        self.ttl = ttl  # 0 = sem expiração
+        self.quota_bytes = quota_bytes  # 0 = sem cota
+        self.job_history_ttl = job_history_ttl  # 0 = registros mantidos
+        self.upload_store = upload_store
+        self.metrics = metrics
+        self.reclaimed_bytes = 0
+        self.removed = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self, name):
+        """
+        Marca os artefatos do nome base como usados agora (base do LRU e do
+        TTL). O uso fica no JobStore, e não no atime/mtime dos arquivos:
+        leituras comuns (ex.: cálculo do ETag, backup) e as opções de montagem
+        do disco não alteram a ordem de remoção, e o mtime continua
+        identificando a versão do conteúdo.
+        """
+        try:
+            self.job_store.mark_used(name)
+        except Exception as e:
+            logger.warning(f"Não foi possível registrar o uso de {name}: {e}")
+
+    def _active_names(self):
+        """Nomes base dos jobs na fila ou em execução"""
+        return {job['output_filename'] for job in self.job_store.list_by_status(QUEUED, PROCESSING)}
+
+    def _scan(self):
+        """
+        Agrupa os artefatos em disco por nome base
+
+        Returns:
+            Dict nome -> {'paths': [(caminho, tamanho)], 'last_used': última alteração dos arquivos}
+        """
+        groups = {}
+        scanned = 0
+        for directory in (self.upload_dir, self.output_dir):
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue  # ex.: .gitkeep
+                if entry.name.startswith(IMAGE_DIR_PREFIX) and entry.is_dir():
+                    name = entry.name[len(IMAGE_DIR_PREFIX):]
+                elif entry.is_file():
+                    name = os.path.splitext(entry.name)[0]
+                else:
+                    continue
+                try:
+                    size = _path_size(entry.path)
+                    last_used = entry.stat().st_mtime
+                except OSError:
+                    continue
+                group = groups.setdefault(name, {'paths': [], 'last_used': 0.0})
+                group['paths'].append((entry.path, size))
+                group['last_used'] = max(group['last_used'], last_used)
+
+                scanned += 1
+                if scanned % _YIELD_EVERY == 0:
+                    time.sleep(0)
+        return groups
+
+    def _remove(self, paths, reason):
+        reclaimed = 0
+        for path, size in paths:
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Não foi possível remover {path}: {e}")
+                continue
+            reclaimed += size
+            self.removed += 1
+        self.reclaimed_bytes += reclaimed
+        if self.metrics is not None and reclaimed:
+            self.metrics.storage_reclaimed.inc(reclaimed, reason=reason)
+        return reclaimed
+
+    def _remove_group(self, name, paths, reason):
+        """
+        Remove arquivos do grupo ``name``, consultando os jobs ativos de novo
+        logo antes: um job com esse nome pode ter sido criado depois do início
+        da varredura
+
+        Returns:
+            Bytes liberados, ou None se o grupo passou a ter um job ativo
+        """
+        if self.job_store.is_active(name):
+            return None
+        return self._remove(paths, reason)
+
+    def _forget_jobs(self, name):
+        """Os jobs cujos arquivos foram removidos deixam de ser listados (status, resultado, download)"""
+        try:
+            self.job_store.delete_for_output(name)
+        except Exception as e:
+            logger.warning(f"Não foi possível remover os registros dos jobs de {name}: {e}")
+
+    def sweep(self):
+        """
+        Uma varredura completa: imagens órfãs, expiração por TTL e cota
+
+        Returns:
+            Dict com os bytes liberados por motivo e o total ocupado ao final
+        """
+        with self._lock:
+            now = time.time()
+            reclaimed = {'intermediate': 0, 'ttl': 0, 'quota': 0}
+            active = self._active_names()
+            groups = self._scan()
+            last_used = self.job_store.last_used_by_output()
+
+            for name, group in list(groups.items()):
+                if name in active:
+                    del groups[name]
+                    continue
+                group['last_used'] = max(group['last_used'], last_used.get(name, 0.0))
+
+                # Imagens intermediárias sem job em andamento não serão mais usadas
+                images = [(p, s) for p, s in group['paths'] if os.path.basename(p).startswith(IMAGE_DIR_PREFIX)]
+                if images:
+                    freed = self._remove_group(name, images, 'intermediate')
+                    if freed is None:
+                        del groups[name]
+                        continue
+                    reclaimed['intermediate'] += freed
+                    group['paths'] = [item for item in group['paths'] if item not in images]
+
+                if self.ttl and now - group['last_used'] > self.ttl:
+                    freed = self._remove_group(name, group['paths'], 'ttl')
+                    if freed is not None:
+                        reclaimed['ttl'] += freed
+                        self._forget_jobs(name)
+                    del groups[name]
+
+            total = sum(size for group in groups.values() for _, size in group['paths'])
+            if self.quota_bytes and total > self.quota_bytes:
+                for name, group in sorted(groups.items(), key=lambda item: item[1]['last_used']):
+                    if total <= self.quota_bytes:
+                        break
+                    freed = self._remove_group(name, group['paths'], 'quota')
+                    if freed is None:
+                        continue
+                    self._forget_jobs(name)
+                    reclaimed['quota'] += freed
+                    total -= freed
+
+            if self.upload_store is not None:
+                self.upload_store.sweep()
+            if self.job_history_ttl:
+                pruned = self.job_store.prune_finished(self.job_history_ttl)
+                if pruned:
+                    logger.info(f"Armazenamento: {pruned} registros de jobs antigos removidos")
+
+            if self.metrics is not None:
+                self.metrics.storage_bytes.set(total)
+            freed = sum(reclaimed.values())
+            if freed:
+                logger.info(f"Armazenamento: {freed} bytes liberados {reclaimed}, {total} bytes em uso")
+            return dict(reclaimed, total=total)
+
+    def _run(self, interval):
+        # Prioridade baixa para a thread de varredura (no Linux cada thread tem a sua)
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Erro na varredura de armazenamento: {e}")
+
+    def start(self, interval):
+        """Inicia a varredura periódica em uma thread daemon"""
+        if self._thread is None and interval > 0:
+            self._thread = threading.Thread(target=self._run, args=(interval,),
+                                            name='storage-sweeper', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {'reclaimed_bytes': self.reclaimed_bytes, 'removed': self.removed}
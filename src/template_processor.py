@@ -0,0 +1,201 @@
+"""
+DocToPPT - Template Processor
+Registro de templates PPTX por hash de conteúdo e cache dos templates já interpretados
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+from src.text_fit import body_box
+
+logger = logging.getLogger(__name__)
+
+# Tipos de placeholder (pptx.enum.shapes.PP_PLACEHOLDER)
+PLACEHOLDER_TITLE = (1,)        # TITLE
+PLACEHOLDER_BODY = (2, 7)       # BODY, OBJECT (conteúdo)
+PLACEHOLDER_PICTURE = (18,)     # PICTURE
+
+# Templates interpretados mantidos por processo worker
+_PARSED_CACHE_SIZE = 8
+_parsed_templates = OrderedDict()
+_parsed_lock = threading.Lock()
+
+
+def build_layout_catalog(prs):
+    """
+    Indexa os layouts de uma apresentação pelos placeholders que possuem
+
+    Returns:
+        Dict com 'layouts' (índice, nome e idx dos placeholders de título,
+        corpo e imagem de cada layout, e a área de texto do corpo, ver
+        text_fit.body_box) e 'content_layouts' (índices dos layouts com
+        título e corpo, adequados para slides de conteúdo)
+    """
+    layouts = []
+    content_layouts = []
+    for index, layout in enumerate(prs.slide_layouts):
+        entry = {'index': index, 'name': layout.name, 'title': None, 'body': None, 'pictures': []}
+        for placeholder in layout.placeholders:
+            ph_type = placeholder.placeholder_format.type
+            ph_idx = placeholder.placeholder_format.idx
+            if ph_type in PLACEHOLDER_TITLE and entry['title'] is None:
+                entry['title'] = ph_idx
+            elif ph_type in PLACEHOLDER_BODY and entry['body'] is None:
+                entry['body'] = ph_idx
+            elif ph_type in PLACEHOLDER_PICTURE:
+                entry['pictures'].append(ph_idx)
+        if entry['title'] is not None and entry['body'] is not None:
+            entry['body_box'] = body_box(layout, entry['body'])
+            content_layouts.append(index)
+        layouts.append(entry)
+    return {'layouts': layouts, 'content_layouts': content_layouts}
+
+
+def load_template(template_path=None):
+    """
+    Retorna uma cópia de trabalho do template e o seu catálogo de layouts
+
+    O template é interpretado (zip + XML) apenas na primeira vez em cada
+    processo; os jobs seguintes recebem uma cópia profunda do objeto já
+    carregado. Templates registrados nunca mudam (o nome é o hash do
+    conteúdo), então caminho + mtime identificam a versão em cache.
+
+    Args:
+        template_path: Caminho do PPTX de template, ou None para a apresentação padrão
+
+    Returns:
+        Tupla (Presentation, catálogo de layouts)
+    """
+    from pptx import Presentation
+
+    if template_path:
+        key = (os.path.abspath(template_path), os.path.getmtime(template_path))
+    else:
+        key = None
+
+    with _parsed_lock:
+        cached = _parsed_templates.get(key)
+        if cached is not None:
+            _parsed_templates.move_to_end(key)
+
+    if cached is None:
+        prs = Presentation(template_path) if template_path else Presentation()
+        cached = (prs, build_layout_catalog(prs))
+        with _parsed_lock:
+            _parsed_templates[key] = cached
+            while len(_parsed_templates) > _PARSED_CACHE_SIZE:
+                _parsed_templates.popitem(last=False)
+    else:
+        logger.info(f"Template em cache: {template_path or 'padrão'}")
+
+    prs, catalog = cached
+    return copy.deepcopy(prs), catalog
+
+
+class TemplateRegistry:
+    """
+    Templates registrados, armazenados em ``template_dir/<sha256>.pptx``
+    junto com o catálogo de layouts em ``<sha256>.json``
+    """
+
+    def __init__(self, template_dir):
+        self.template_dir = template_dir
+        self._templates = {}
+        self._lock = threading.Lock()
+        os.makedirs(template_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        for name in os.listdir(self.template_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.template_dir, name), encoding='utf-8') as f:
+                    info = json.load(f)
+                if os.path.exists(self.path_for(info['id'])):
+                    self._templates[info['id']] = info
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Índice de template inválido {name}: {e}")
+
+    def path_for(self, template_id):
+        """Caminho do PPTX de um template registrado"""
+        return os.path.join(self.template_dir, f"{template_id}.pptx")
+
+    def get(self, template_id):
+        """Informações (nome e catálogo) de um template registrado, ou None"""
+        with self._lock:
+            return self._templates.get(template_id)
+
+    def list(self):
+        """Lista os templates registrados, ordenados por nome"""
+        with self._lock:
+            return sorted(self._templates.values(), key=lambda info: info['name'].lower())
+
+    def register(self, path, name=None):
+        """
+        Registra um arquivo PPTX como template
+
+        Args:
+            path: Caminho do arquivo PPTX
+            name: Nome exibido (padrão: nome do arquivo)
+
+        Returns:
+            ID do template (SHA-256 do conteúdo)
+
+        Raises:
+            ValueError: se o arquivo não for um PPTX válido
+        """
+        from pptx import Presentation
+
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        template_id = hasher.hexdigest()
+
+        existing = self.get(template_id)
+        if existing:
+            return template_id
+
+        try:
+            catalog = build_layout_catalog(Presentation(path))
+        except Exception as e:
+            raise ValueError(f"Template inválido: {e}") from e
+
+        stored_path = self.path_for(template_id)
+        tmp_path = f"{stored_path}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, stored_path)
+
+        info = {
+            'id': template_id,
+            'name': name or os.path.basename(path),
+            'catalog': catalog
+        }
+        with open(os.path.join(self.template_dir, f"{template_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+
+        with self._lock:
+            self._templates[template_id] = info
+        logger.info(f"Template registrado: {info['name']} ({template_id[:12]}), "
+                    f"{len(catalog['content_layouts'])} layouts de conteúdo")
+        return template_id
+
+    def register_directory(self, directory):
+        """Registra todos os arquivos .pptx de um diretório (ex.: examples/templates)"""
+        if not os.path.isdir(directory):
+            return []
+        registered = []
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith('.pptx'):
+                try:
+                    registered.append(self.register(os.path.join(directory, name)))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Não foi possível registrar o template {name}: {e}")
+        return registered
@@ -0,0 +1,216 @@
+"""
+DocToPPT - Text Extractor
+Caminho rápido para Markdown e texto simples: as seções e os marcadores de
+lista saem direto da sintaxe, em uma única passada pelas linhas, sem a
+classificação por fonte/heurísticas usada para PDFs
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Acima deste tamanho o arquivo é lido linha a linha em vez de inteiro
+STREAM_THRESHOLD = 4 * 1024 * 1024
+
+# Título de linha isolada em texto simples (TXT)
+_MAX_TITLE_LENGTH = 80
+_SENTENCE_END = ('.', ',', ';', '!', '?')
+_BULLETS = ('- ', '* ', '+ ', '• ', '◦ ', '▪ ')
+_ITEM_START = frozenset('-*+•◦▪0123456789')
+
+# Prefixo das linhas de blocos de código no conteúdo das seções: cada uma vira
+# um parágrafo próprio no slide, sem ser unida ao texto vizinho (ver
+# pptx_generator.body_paragraphs). Os marcadores de lista aninhados usam espaços.
+CODE_LINE_PREFIX = '\t'
+
+
+def _read_lines(file_path):
+    if os.path.getsize(file_path) <= STREAM_THRESHOLD:
+        with open(file_path, 'r', encoding='utf-8-sig', errors='ignore') as text_file:
+            yield from text_file.read().splitlines()
+        return
+    with open(file_path, 'r', encoding='utf-8-sig', errors='ignore') as text_file:
+        for line in text_file:
+            yield line.rstrip('\r\n')
+
+
+def _atx_heading(stripped):
+    """Nível e texto de um título '# ...' (1-6), ou (0, None)"""
+    level = len(stripped) - len(stripped.lstrip('#'))
+    if 1 <= level <= 6 and (len(stripped) == level or stripped[level] in ' \t'):
+        return level, stripped[level:].strip().rstrip('#').strip()
+    return 0, None
+
+
+def _setext_level(stripped):
+    """Sublinhado de título: '===' (nível 1) ou '---' (nível 2)"""
+    if len(stripped) >= 3 and stripped.strip('=') == '':
+        return 1
+    if len(stripped) >= 3 and stripped.strip('-') == '':
+        return 2
+    return 0
+
+
+def _list_item(line):
+    """
+    Marcador de lista da linha
+
+    Returns:
+        Tupla (nível de recuo, texto do item) ou None
+    """
+    stripped = line.lstrip(' \t')
+    indent = line[:len(line) - len(stripped)].replace('\t', '    ')
+    level = len(indent) // 2
+    if stripped[:2] in _BULLETS:
+        return level, stripped[2:].strip()
+    digits = 0
+    while digits < len(stripped) and stripped[digits].isdigit():
+        digits += 1
+    if 0 < digits <= 9 and stripped[digits:digits + 2] in ('. ', ') '):
+        return level, stripped[digits + 2:].strip()
+    return None
+
+
+def _clean_inline(text):
+    """Remove ênfase e código inline do Markdown"""
+    return text.replace('**', '').replace('__', '').replace('`', '')
+
+
+class _SectionBuilder:
+    def __init__(self):
+        self.section = {"title": "Introdução", "content": [], "images": [], "level": 1, "parent": None}
+        self.ancestors = []  # (nível, título) dos títulos abertos, como em iter_sections
+        self.emitted = 0
+
+    def heading(self, title, level):
+        """Abre uma seção; retorna a anterior se ela tinha conteúdo"""
+        while self.ancestors and self.ancestors[-1][0] >= level:
+            self.ancestors.pop()
+        parent = self.ancestors[-1][1] if self.ancestors else None
+        self.ancestors.append((level, title))
+        done = None
+        if self.section["content"]:
+            done = self.section
+            self.emitted += 1
+            self.section = {"title": title, "content": [], "images": [], "level": level, "parent": parent}
+        else:
+            # Título seguido de outro título: fica o mais recente, como em iter_sections
+            self.section.update(title=title, level=level, parent=parent)
+        return done
+
+    def text(self, text):
+        self.section["content"].append(text)
+
+    def finish(self):
+        if self.section["content"]:
+            self.emitted += 1
+            return self.section
+        return None
+
+
+def iter_text_sections(file_path, markdown=True):
+    """
+    Seções {"title", "content", "images", "level", "parent"} de um arquivo Markdown ou texto
+
+    Markdown: títulos '#'..'######' e sublinhados (=== / ---), itens '-', '*',
+    '+' e numerados, com o recuo virando o nível do marcador; as linhas dos
+    blocos de código são mantidas como estão, com o prefixo ``CODE_LINE_PREFIX``.
+    Texto simples: sublinhados, linhas isoladas curtas sem pontuação final e
+    linhas em maiúsculas são títulos; itens de lista como no Markdown.
+
+    Yields:
+        Seções na ordem do documento, emitidas quando o próximo título as fecha
+    """
+    builder = _SectionBuilder()
+    pending = None  # linha anterior, retida para reconhecer sublinhados e linhas isoladas
+    blank_before = True
+    in_code = False
+
+    def flush(line, isolated):
+        """Processa a linha retida; ``isolated`` = seguida de linha em branco"""
+        item = _list_item(line) if line.lstrip(' \t')[:1] in _ITEM_START else None
+        if item is not None:
+            level, text = item
+            builder.text('  ' * level + '• ' + (_clean_inline(text) if markdown else text))
+            return None
+        text = line.strip()
+        if not markdown and len(text) < _MAX_TITLE_LENGTH and (
+                (isolated and blank_before and not text.endswith(_SENTENCE_END)) or
+                (text.isupper() and len(text) > 1)):
+            return builder.heading(text, 1)
+        builder.text(_clean_inline(text) if markdown else text)
+        return None
+
+    for line in _read_lines(file_path):
+        stripped = line.strip()
+
+        if markdown and stripped.startswith(('```', '~~~')):
+            if pending is not None:
+                done = flush(pending, False)
+                pending = None
+                if done:
+                    yield done
+            in_code = not in_code
+            continue
+        if in_code:
+            if stripped:
+                builder.text(CODE_LINE_PREFIX + line.rstrip())
+            continue
+
+        if not stripped:
+            if pending is not None:
+                done = flush(pending, True)
+                pending = None
+                if done:
+                    yield done
+            blank_before = True
+            continue
+
+        # Sublinhado: a linha retida é o título
+        if pending is not None and stripped[0] in '=-':
+            level = _setext_level(stripped)
+            if level and _list_item(pending) is None:
+                done = builder.heading(_clean_inline(pending.strip()) if markdown else pending.strip(), level)
+                pending = None
+                blank_before = False
+                if done:
+                    yield done
+                continue
+
+        # Linha horizontal ('---', '***') no Markdown: só separa blocos
+        if markdown and pending is None and (_setext_level(stripped) or stripped.replace(' ', '') in ('***', '___')):
+            continue
+
+        if markdown and stripped.startswith('#'):
+            level, title = _atx_heading(stripped)
+            if level:
+                if pending is not None:
+                    done = flush(pending, False)
+                    pending = None
+                    if done:
+                        yield done
+                done = builder.heading(_clean_inline(title), level)
+                blank_before = False
+                if done:
+                    yield done
+                continue
+
+        if pending is not None:
+            done = flush(pending, False)
+            blank_before = False
+            if done:
+                yield done
+        pending = line
+
+    if pending is not None:
+        done = flush(pending, True)
+        if done:
+            yield done
+    last = builder.finish()
+    if last:
+        yield last
+
+    logger.info(f"Estrutura detectada (texto): {builder.emitted} seções")
+    if not builder.emitted:
+        yield {"title": "Conteúdo", "content": "", "images": []}
@@ -0,0 +1,387 @@
+"""
+DocToPPT - Text Fit
+Distribuição do texto das seções pelos slides conforme a caixa do placeholder
+de corpo do layout: a largura de cada caractere vem de tabelas calculadas uma
+vez por fonte e tamanho (medidas com o FreeType, sem renderizar nada) e
+frases e tópicos são empacotados de forma gulosa em slides de continuação
+"""
+
+import functools
+import logging
+import math
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+EMU_PER_PT = 12700
+
+# Espaçamento de linha simples (proporção do tamanho da fonte)
+LINE_SPACING = 1.2
+
+# Fração da altura da caixa usada (margem para diferenças de métrica entre fontes)
+FILL_FACTOR = 0.95
+
+# Margens internas padrão do DrawingML (bodyPr), em EMU: esquerda, superior, direita, inferior
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+_DEFAULT_FONT_SIZE = 18.0
+
+# Caixa de corpo da apresentação padrão do python-pptx (4:3), usada quando o
+# layout não informa as dimensões do placeholder
+DEFAULT_BODY_BOX = {
+    'width': 633.6,
+    'height': 349.2,
+    'font': 'Calibri',
+    'levels': [
+        {'size': 32.0, 'indent': 27.0, 'space_before': 7.68, 'line_spacing': LINE_SPACING},
+        {'size': 28.0, 'indent': 58.5, 'space_before': 6.72, 'line_spacing': LINE_SPACING},
+    ],
+}
+
+# Diretórios onde procurar os arquivos das fontes do tema
+_FONT_DIRS = (
+    '/usr/share/fonts', '/usr/local/share/fonts', os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'), '/Library/Fonts', '/System/Library/Fonts',
+    os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+)
+
+# Fontes com as mesmas métricas das fontes do Office, e substitutas genéricas
+_SUBSTITUTES = {
+    'calibri': ('carlito',),
+    'cambria': ('caladea',),
+    'arial': ('liberationsans', 'arimo'),
+    'helvetica': ('liberationsans', 'arimo'),
+    'timesnewroman': ('liberationserif', 'tinos'),
+    'couriernew': ('liberationmono', 'cousine'),
+}
+_FALLBACK_FONTS = ('dejavusans', 'liberationsans', 'arial')
+
+# Caracteres medidos na tabela (latim básico e estendido, pontuação comum);
+# os demais usam a largura média
+_TABLE_CHARS = ''.join(chr(c) for c in range(32, 0x250)) + '•–—…“”‘’€'
+
+_SENTENCE_END = ('.', '!', '?', '…', ':', ';')
+
+_NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_NS_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+
+
+def _normalize(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+@functools.lru_cache(maxsize=1)
+def _font_index():
+    """Arquivos de fonte instalados: nome normalizado -> caminho"""
+    index = {}
+    for directory in _FONT_DIRS:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                stem, ext = os.path.splitext(name)
+                if ext.lower() not in ('.ttf', '.otf', '.ttc'):
+                    continue
+                key = _normalize(stem)
+                index.setdefault(key, os.path.join(root, name))
+                if key.endswith('regular'):
+                    index.setdefault(key[:-len('regular')], os.path.join(root, name))
+    return index
+
+
+def find_font_file(font_name):
+    """Arquivo da fonte ``font_name``, de uma substituta compatível ou de uma fonte genérica (ou None)"""
+    index = _font_index()
+    key = _normalize(font_name or '')
+    for candidate in (key,) + _SUBSTITUTES.get(key, ()) + _FALLBACK_FONTS:
+        if candidate in index:
+            return index[candidate]
+    return None
+
+
+def _heuristic_widths():
+    """Larguras aproximadas (em em) por classe de caractere, quando não há fonte para medir"""
+    widths = {}
+    for char in _TABLE_CHARS:
+        if char in ' .,;:!|\'ilIjft()[]':
+            widths[char] = 0.28
+        elif char in 'mwMW@%':
+            widths[char] = 0.85
+        elif char.isupper() or char.isdigit():
+            widths[char] = 0.62
+        else:
+            widths[char] = 0.52
+    return widths
+
+
+@functools.lru_cache(maxsize=16)
+def _em_widths(font_name):
+    """
+    Largura de cada caractere da tabela, em em (proporção do tamanho da fonte)
+
+    Returns:
+        Tupla (dict caractere -> largura, largura padrão para os demais caracteres)
+    """
+    font = None
+    try:
+        from PIL import ImageFont
+
+        path = find_font_file(font_name)
+        if path:
+            font = ImageFont.truetype(path, 1000)
+            logger.debug(f"Métricas da fonte '{font_name}' a partir de {path}")
+        else:
+            font = ImageFont.load_default(1000)  # Pillow >= 10.1 (FreeType)
+    except (ImportError, OSError, TypeError, AttributeError) as e:
+        logger.debug(f"Sem fonte para medir '{font_name}', usando larguras aproximadas: {e}")
+
+    if font is None or not hasattr(font, 'getlength'):
+        widths = _heuristic_widths()
+    else:
+        widths = {char: font.getlength(char) / 1000 for char in _TABLE_CHARS}
+    lowercase = [widths[c] for c in 'abcdefghijklmnopqrstuvwxyz']
+    return widths, sum(lowercase) / len(lowercase)
+
+
+class GlyphTable:
+    """Larguras dos caracteres (em pontos) de uma fonte em um tamanho"""
+
+    def __init__(self, font_name, size):
+        em_widths, default = _em_widths(font_name)
+        self.widths = {char: width * size for char, width in em_widths.items()}
+        self.default = default * size
+        self.space = self.widths[' ']
+
+    def width(self, text):
+        widths, default = self.widths, self.default
+        return sum(widths.get(char, default) for char in text)
+
+
+@functools.lru_cache(maxsize=64)
+def glyph_table(font_name, size):
+    """GlyphTable em cache por fonte e tamanho"""
+    return GlyphTable(font_name, size)
+
+
+def _first(sources, find):
+    """Primeiro valor não nulo de ``find`` aplicado às fontes de estilo, em ordem de precedência"""
+    for source in sources:
+        if source is not None:
+            value = find(source)
+            if value is not None:
+                return value
+    return None
+
+
+def _theme_fonts(master):
+    """Fontes latinas (principal, secundária) do tema do slide mestre"""
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.oxml import parse_xml
+
+    try:
+        theme = parse_xml(master.part.part_related_by(RT.THEME).blob)
+    except (KeyError, ValueError) as e:
+        logger.debug(f"Tema do slide mestre indisponível: {e}")
+        return 'Calibri', 'Calibri'
+    major = theme.find(f'.//{_NS_A}majorFont/{_NS_A}latin')
+    minor = theme.find(f'.//{_NS_A}minorFont/{_NS_A}latin')
+    return (major.get('typeface') if major is not None else 'Calibri',
+            minor.get('typeface') if minor is not None else 'Calibri')
+
+
+def body_box(layout, body_idx):
+    """
+    Área de texto do placeholder de corpo de um layout, em pontos
+
+    As propriedades seguem a herança do PowerPoint: placeholder do layout,
+    placeholder de corpo do mestre e estilo de corpo do mestre (txStyles).
+
+    Args:
+        layout: SlideLayout
+        body_idx: idx do placeholder de corpo (ver build_layout_catalog)
+
+    Returns:
+        Dict {'width', 'height', 'font', 'levels': [{'size', 'indent',
+        'space_before', 'line_spacing'}, ...]} (um item por nível de
+        parágrafo usado nos slides), ou None se o layout não informa as dimensões
+    """
+    placeholder = layout.placeholders.get(idx=body_idx)
+    if placeholder is None or not placeholder.width or not placeholder.height:
+        return None
+
+    master = layout.slide_master
+    master_body = next((ph for ph in master.placeholders if ph.placeholder_format.type == 2), None)
+    body_style = master.element.find(f'{_NS_P}txStyles/{_NS_P}bodyStyle')
+
+    def tx_body(shape):
+        return shape.element.find(f'{_NS_P}txBody') if shape is not None else None
+
+    body_prs = [tx.find(f'{_NS_A}bodyPr') for tx in (tx_body(placeholder), tx_body(master_body)) if tx is not None]
+    insets = [_first(body_prs, lambda pr, a=attr: pr.get(a)) for attr in ('lIns', 'tIns', 'rIns', 'bIns')]
+    left, top, right, bottom = (int(v) if v is not None else d for v, d in zip(insets, _DEFAULT_INSETS))
+    autofit = _first(body_prs, lambda pr: pr.find(f'{_NS_A}normAutofit'))
+    scale = int(autofit.get('fontScale', 100000)) / 100000 if autofit is not None else 1.0
+
+    major_font, minor_font = _theme_fonts(master)
+    list_styles = [tx.find(f'{_NS_A}lstStyle') for tx in (tx_body(placeholder), tx_body(master_body)) if tx is not None]
+    list_styles.append(body_style)
+
+    font = minor_font
+    levels = []
+    for level in (1, 2):
+        props = [style.find(f'{_NS_A}lvl{level}pPr') for style in list_styles if style is not None]
+        size = _first(props, lambda pr: pr.find(f'{_NS_A}defRPr[@sz]'))
+        size = int(size.get('sz')) / 100 * scale if size is not None else _DEFAULT_FONT_SIZE
+        indent = _first(props, lambda pr: pr.get('marL'))
+        line = _first(props, lambda pr: pr.find(f'{_NS_A}lnSpc/{_NS_A}spcPct'))
+        line_spacing = LINE_SPACING * int(line.get('val')) / 100000 if line is not None else LINE_SPACING
+        before_pct = _first(props, lambda pr: pr.find(f'{_NS_A}spcBef/{_NS_A}spcPct'))
+        before_pts = _first(props, lambda pr: pr.find(f'{_NS_A}spcBef/{_NS_A}spcPts'))
+        if before_pts is not None:
+            space_before = int(before_pts.get('val')) / 100
+        elif before_pct is not None:
+            space_before = size * line_spacing * int(before_pct.get('val')) / 100000
+        else:
+            space_before = 0.0
+        if level == 1:
+            latin = _first(props, lambda pr: pr.find(f'{_NS_A}defRPr/{_NS_A}latin'))
+            typeface = latin.get('typeface') if latin is not None else '+mn-lt'
+            font = {'+mn-lt': minor_font, '+mj-lt': major_font}.get(typeface, typeface)
+        levels.append({
+            'size': size,
+            'indent': int(indent) / EMU_PER_PT if indent is not None else 0.0,
+            'space_before': space_before,
+            'line_spacing': line_spacing,
+        })
+
+    return {
+        'width': (placeholder.width - left - right) / EMU_PER_PT,
+        'height': (placeholder.height - top - bottom) / EMU_PER_PT,
+        'font': font,
+        'levels': levels,
+    }
+
+
+def _wrap(widths, start, space, line_width, max_lines):
+    """
+    Quebra de linha gulosa a partir da palavra ``start``
+
+    Returns:
+        Tupla (índice da primeira palavra que não coube em ``max_lines`` linhas,
+        linhas usadas)
+    """
+    lines = 1
+    current = 0.0
+    i = start
+    count = len(widths)
+    while i < count:
+        width = widths[i]
+        if current == 0.0:
+            # Palavra mais larga que a linha ocupa as linhas necessárias
+            extra = math.ceil(width / line_width) - 1 if width > line_width else 0
+            if lines + extra > max_lines and i > start:
+                break
+            lines += extra
+            current = width or 1e-9
+            i += 1
+        elif current + space + width <= line_width:
+            current += space + width
+            i += 1
+        elif lines < max_lines:
+            lines += 1
+            current = 0.0
+        else:
+            break
+    return i, lines
+
+
+class TextPacker:
+    """
+    Distribui parágrafos (nível, texto) por slides de continuação
+
+    Cada chamada a ``take`` preenche a caixa de um slide: parágrafos inteiros
+    enquanto couberem; um parágrafo de texto que não cabe é dividido na última
+    frase que cabe (ou, se nem uma frase cabe num slide vazio, na última linha);
+    tópicos (nível > 0) não são divididos, a não ser que não caibam nem sozinhos.
+    Cada palavra é medida uma vez por tamanho de fonte: o custo é linear no texto.
+    """
+
+    def __init__(self, paragraphs):
+        self._paragraphs = paragraphs
+        self._index = 0  # parágrafo atual
+        self._start = 0  # primeira palavra ainda não distribuída do parágrafo atual
+        self._words = None
+        self._widths = {}  # (fonte, tamanho) -> larguras das palavras do parágrafo atual
+
+    @property
+    def done(self):
+        return self._index >= len(self._paragraphs)
+
+    def _advance(self):
+        self._index += 1
+        self._start = 0
+        self._words = None
+        self._widths = {}
+
+    def take(self, box):
+        """
+        Parágrafos que cabem em um slide com a caixa ``box`` (ver body_box)
+
+        Returns:
+            Lista de tuplas (nível, texto)
+        """
+        box = box or DEFAULT_BODY_BOX
+        available = box['height'] * FILL_FACTOR
+        page = []
+        while not self.done:
+            level, text = self._paragraphs[self._index]
+            spec = box['levels'][min(level, len(box['levels']) - 1)]
+            line_height = spec['size'] * spec['line_spacing']
+
+            if self._words is None:
+                self._words = text.split()
+            words = self._words
+            if not words:
+                # Linha em branco: separa blocos, mas não abre um slide
+                if page:
+                    if available < line_height:
+                        break
+                    page.append((level, ''))
+                    available -= line_height
+                self._advance()
+                continue
+
+            before = spec['space_before'] if page else 0.0
+            max_lines = int((available - before) // line_height)
+            if max_lines <= 0:
+                if page:
+                    break
+                max_lines = 1  # Caixa menor que uma linha: ao menos uma linha por slide
+
+            table = glyph_table(box['font'], spec['size'])
+            key = (box['font'], spec['size'])
+            widths = self._widths.get(key)
+            if widths is None:
+                widths = self._widths[key] = [table.width(word) for word in words]
+            line_width = max(box['width'] - spec['indent'], spec['size'])
+
+            end, used = _wrap(widths, self._start, table.space, line_width, max_lines)
+            if end >= len(words):
+                page.append((level, text if self._start == 0 else ' '.join(words[self._start:])))
+                available -= before + used * line_height
+                self._advance()
+                continue
+
+            # Não coube: dividir na última frase que coube (texto) ou ir para o próximo slide
+            cut = None
+            if level == 0 or not page:
+                for i in range(end, self._start, -1):
+                    if words[i - 1].endswith(_SENTENCE_END):
+                        cut = i
+                        break
+            if cut is None:
+                if page:
+                    break
+                cut = end
+            page.append((level, ' '.join(words[self._start:cut])))
+            self._start = cut
+            break
+        return page
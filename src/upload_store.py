@@ -0,0 +1,190 @@
+"""
+DocToPPT - Upload Store
+Uploads em partes (chunks), gravados direto em disco, retomáveis e com hash
+calculado durante a transferência
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+class UploadOffsetError(Exception):
+    """A parte enviada não começa onde o upload parou; ``offset`` indica onde retomar"""
+
+    def __init__(self, offset):
+        super().__init__(f"Offset esperado: {offset}")
+        self.offset = offset
+
+
+class ChunkedUploadStore:
+    """
+    Sessões de upload em ``session_dir``: ``<id>.json`` (nome, tamanho total,
+    template) e ``<id>.part`` (bytes já recebidos). O offset atual é o tamanho
+    do ``.part``, então uma conexão interrompida pode ser retomada do ponto em
+    que parou, inclusive após um reinício.
+
+    O SHA-256 é atualizado a cada bloco gravado e fica em memória; se a sessão
+    for retomada em outro processo, o prefixo já recebido é relido uma vez.
+    """
+
+    def __init__(self, session_dir, max_size, session_ttl=86400):
+        self.session_dir = session_dir
+        self.max_size = max_size
+        self.session_ttl = session_ttl
+        self._hashers = {}  # id -> (bytes já incluídos no hash, sha256)
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(session_dir, exist_ok=True)
+
+    def _meta_path(self, upload_id):
+        return os.path.join(self.session_dir, f"{upload_id}.json")
+
+    def _part_path(self, upload_id):
+        return os.path.join(self.session_dir, f"{upload_id}.part")
+
+    def _session_lock(self, upload_id):
+        with self._lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def create(self, filename, size, template_id=None):
+        """
+        Abre uma sessão de upload
+
+        Raises:
+            ValueError: se o tamanho for inválido ou maior que ``max_size``
+        """
+        if size <= 0 or size > self.max_size:
+            raise ValueError(f"Tamanho inválido: {size} bytes (máximo {self.max_size})")
+        self.sweep()
+
+        upload_id = uuid.uuid4().hex
+        session = {
+            'id': upload_id,
+            'filename': filename,
+            'size': size,
+            'template_id': template_id,
+            'created_at': time.time()
+        }
+        with open(self._meta_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        open(self._part_path(upload_id), 'wb').close()
+        return self.get(upload_id)
+
+    def get(self, upload_id):
+        """Sessão com o offset atual, ou None se não existir"""
+        if not upload_id.isalnum():
+            return None
+        try:
+            with open(self._meta_path(upload_id), encoding='utf-8') as f:
+                session = json.load(f)
+            session['offset'] = os.path.getsize(self._part_path(upload_id))
+        except (OSError, ValueError):
+            return None
+        return session
+
+    def _hasher_at(self, upload_id, offset):
+        """Hash dos primeiros ``offset`` bytes, relendo o arquivo só se não estiver em memória"""
+        hashed, hasher = self._hashers.get(upload_id, (0, None))
+        if hasher is None or hashed != offset:
+            hasher = hashlib.sha256()
+            with open(self._part_path(upload_id), 'rb') as f:
+                remaining = offset
+                while remaining:
+                    block = f.read(min(_READ_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    hasher.update(block)
+                    remaining -= len(block)
+        return hasher
+
+    def write_chunk(self, upload_id, offset, stream):
+        """
+        Grava uma parte lida de ``stream`` (ex.: request.stream) a partir de ``offset``
+
+        Returns:
+            Sessão atualizada (``offset`` = bytes recebidos até agora)
+
+        Raises:
+            KeyError: sessão inexistente
+            UploadOffsetError: ``offset`` diferente do ponto em que o upload parou
+            ValueError: a parte ultrapassa o tamanho declarado
+        """
+        with self._session_lock(upload_id):
+            session = self.get(upload_id)
+            if session is None:
+                raise KeyError(upload_id)
+            if offset != session['offset']:
+                raise UploadOffsetError(session['offset'])
+
+            hasher = self._hasher_at(upload_id, offset)
+            written = offset
+            try:
+                with open(self._part_path(upload_id), 'r+b') as part:
+                    part.seek(offset)
+                    while True:
+                        block = stream.read(_READ_BLOCK_SIZE)
+                        if not block:
+                            break
+                        if written + len(block) > session['size']:
+                            part.truncate(written)
+                            raise ValueError("A parte ultrapassa o tamanho declarado do arquivo")
+                        part.write(block)
+                        hasher.update(block)
+                        written += len(block)
+            finally:
+                # Mesmo com a conexão interrompida, o que foi gravado vale para a retomada
+                self._hashers[upload_id] = (written, hasher)
+
+            session['offset'] = written
+            return session
+
+    def complete(self, upload_id, destination):
+        """
+        Move o arquivo completo para ``destination`` e encerra a sessão
+
+        Returns:
+            SHA-256 (bytes) do conteúdo, calculado durante o upload
+        """
+        with self._session_lock(upload_id):
+            session = self.get(upload_id)
+            if session is None or session['offset'] != session['size']:
+                raise ValueError("Upload incompleto")
+            digest = self._hasher_at(upload_id, session['offset']).digest()
+            os.replace(self._part_path(upload_id), destination)
+            self._discard(upload_id)
+        return digest
+
+    def _discard(self, upload_id):
+        self._hashers.pop(upload_id, None)
+        for path in (self._meta_path(upload_id), self._part_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._locks.pop(upload_id, None)
+
+    def sweep(self):
+        """Remove sessões abandonadas há mais de ``session_ttl`` segundos"""
+        cutoff = time.time() - self.session_ttl
+        for name in os.listdir(self.session_dir):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-5]
+            part = self._part_path(upload_id)
+            try:
+                last_activity = os.path.getmtime(part if os.path.exists(part) else self._meta_path(upload_id))
+            except OSError:
+                continue
+            if last_activity < cutoff:
+                logger.info(f"Removendo upload abandonado {upload_id}")
+                self._discard(upload_id)
@@ -3,6 +3,12 @@
  * Fixed version with proper file preview handling
  */
 
+// Limite do envio pelo formulário (MAX_CONTENT_LENGTH) e do upload em partes
+// (MAX_UPLOAD_SIZE), definidos pelo servidor nos atributos data-* do formulário
+let FORM_UPLOAD_LIMIT = 16 * 1024 * 1024;
+let MAX_UPLOAD_SIZE = 500 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Upload page loaded');
     initializeUpload();
@@ -18,6 +24,9 @@ function initializeUpload() {
         return;
     }
     
+    FORM_UPLOAD_LIMIT = Number(uploadForm.dataset.formUploadLimit) || FORM_UPLOAD_LIMIT;
+    MAX_UPLOAD_SIZE = Number(uploadForm.dataset.maxUploadSize) || MAX_UPLOAD_SIZE;
+    
     // Disable submit button initially
     const submitBtn = document.getElementById('submitBtn');
     if (submitBtn) {
@@ -42,6 +51,16 @@ function initializeUpload() {
         showUploadProgress();
         console.log('Form submitting with file:', formData.get('document').name);
         
+        // Arquivos acima do limite do formulário vão em partes pela API de upload
+        const file = formData.get('document');
+        if (file.size > FORM_UPLOAD_LIMIT) {
+            event.preventDefault();
+            chunkedUpload(file, formData).catch(function(error) {
+                console.error('Erro no upload em partes:', error);
+                showUploadError(error.message);
+            });
+        }
+        
         // Let form submit normally after showing feedback
     });
     
@@ -281,8 +300,8 @@ function validateFile(file) {
         };
     }
     
-    // Check file size (16MB)
-    const maxSize = 16 * 1024 * 1024;
+    // Check file size (acima de FORM_UPLOAD_LIMIT o envio é feito em partes)
+    const maxSize = MAX_UPLOAD_SIZE;
     if (file.size > maxSize) {
         return {
             valid: false,
@@ -342,6 +361,98 @@ function showUploadProgress() {
     console.log('Upload progress feedback shown');
 }
 
+async function chunkedUpload(file, formData) {
+    // Template enviado junto: registrar antes para usar o id na sessão
+    let templateId = formData.get('template_id') || null;
+    const templateFile = formData.get('template');
+    if (templateFile && templateFile.name) {
+        const templateData = new FormData();
+        templateData.append('template', templateFile);
+        const response = await fetch('/api/templates', { method: 'POST', body: templateData });
+        if (!response.ok) {
+            throw new Error('Não foi possível registrar o template');
+        }
+        templateId = (await response.json()).id;
+    }
+    
+    const created = await fetch('/api/uploads', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ filename: file.name, size: file.size, template_id: templateId })
+    });
+    const session = await created.json();
+    if (!created.ok) {
+        throw new Error(session.message || 'Não foi possível iniciar o upload');
+    }
+    
+    const uploadUrl = created.headers.get('Location') || `/api/uploads/${session.upload_id}`;
+    let offset = session.offset;
+    let retries = 0;
+    while (true) {
+        const end = Math.min(offset + session.chunk_size, file.size);
+        let response;
+        try {
+            response = await fetch(uploadUrl, {
+                method: 'PUT',
+                headers: { 'Content-Range': `bytes ${offset}-${end - 1}/${file.size}` },
+                body: file.slice(offset, end)
+            });
+        } catch (networkError) {
+            response = null;
+        }
+        
+        if (response && response.ok) {
+            const result = await response.json();
+            retries = 0;
+            offset = result.offset;
+            updateChunkProgress(offset, file.size);
+            if (result.redirectUrl) {
+                window.location.href = result.redirectUrl;
+                return;
+            }
+            continue;
+        }
+        if (response && response.status !== 409 && response.status < 500) {
+            const result = await response.json().catch(() => ({}));
+            throw new Error(result.message || `Erro ${response.status} no upload`);
+        }
+        
+        // Conexão interrompida, conflito de offset ou servidor ocupado: retomar de onde parou
+        if (++retries > UPLOAD_MAX_RETRIES) {
+            throw new Error('Conexão perdida durante o upload');
+        }
+        const retryAfter = response && response.headers.get('Retry-After');
+        await new Promise(resolve => setTimeout(resolve, retryAfter ? retryAfter * 1000 : 1000 * retries));
+        const status = await fetch(uploadUrl, { method: 'HEAD' });
+        if (!status.ok) {
+            throw new Error('Sessão de upload expirada');
+        }
+        offset = parseInt(status.headers.get('Upload-Offset'), 10);
+    }
+}
+
+function updateChunkProgress(offset, total) {
+    const uploadStatus = document.getElementById('uploadStatus');
+    if (uploadStatus) {
+        const percent = Math.round(offset / total * 100);
+        uploadStatus.querySelector('span:last-child').textContent =
+            `Enviando arquivo... ${percent}% (${formatFileSize(offset)} de ${formatFileSize(total)})`;
+    }
+}
+
+function showUploadError(message) {
+    const uploadStatus = document.getElementById('uploadStatus');
+    if (uploadStatus) {
+        uploadStatus.className = 'alert alert-danger mt-2 mb-0';
+        uploadStatus.textContent = message;
+    }
+    const submitBtn = document.getElementById('submitBtn');
+    if (submitBtn) {
+        submitBtn.disabled = false;
+        submitBtn.innerHTML = submitBtn.getAttribute('data-original-text') || submitBtn.innerHTML;
+    }
+}
+
 function formatFileSize(bytes) {
     if (bytes === 0) return '0 Bytes';
     const k = 1024;
@@ -0,0 +1,139 @@
+"""
+DocToPPT - Fixtures dos testes
+Servidor local que imita a API do DeepSeek (/chat/completions), com respostas
+roteirizadas (ex.: 429, 500) e contagem das requisições simultâneas, e a
+aplicação Flask com todos os diretórios em uma pasta temporária
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tokens informados em "usage" por resposta bem-sucedida
+MOCK_TOTAL_TOKENS = 130
+
+
+class MockDeepSeekHandler(BaseHTTPRequestHandler):
+    """Responde como /chat/completions; o status de cada requisição vem do roteiro do servidor"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.script.popleft() if server.script else 200
+        try:
+            time.sleep(server.latency)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+        if status == 429:
+            self._send(429, {'error': {'message': 'rate limited'}}, {'Retry-After': '0.01'})
+            return
+        if status != 200:
+            self._send(status, {'error': {'message': 'server error'}})
+            return
+
+        title = request['messages'][-1]['content'].splitlines()[0].replace('Título: ', '')
+        content = json.dumps({'title': title, 'bullets': [f'Tópico {i} de {title}' for i in range(3)]})
+        self._send(200, {
+            'id': 'mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': request['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 100, 'completion_tokens': MOCK_TOTAL_TOKENS - 100,
+                      'total_tokens': MOCK_TOTAL_TOKENS}
+        })
+
+
+@pytest.fixture
+def mock_deepseek():
+    """Servidor simulado; ``script`` (deque de status HTTP) define as próximas respostas"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockDeepSeekHandler)
+    server.daemon_threads = True
+    server.script = deque()
+    server.latency = 0.0
+    server.requests = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.lock = threading.Lock()
+    server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Fábrica da aplicação com uploads, saídas, banco e caches em ``tmp_path``;
+    argumentos nomeados substituem valores da configuração. Os processos worker
+    são encerrados no fim do teste.
+    """
+    from app import create_app
+
+    apps = []
+
+    def factory(**overrides):
+        test_config = {
+            'TESTING': True,
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'OUTPUT_FOLDER': str(tmp_path / 'outputs'),
+            'UPLOAD_SESSION_DIR': str(tmp_path / 'sessions'),
+            'JOB_DB_PATH': str(tmp_path / 'jobs.db'),
+            'RESULT_CACHE_DIR': str(tmp_path / 'cache'),
+            'TEMPLATE_STORE_DIR': str(tmp_path / 'templates'),
+            'TEMPLATE_LIBRARY_DIR': str(tmp_path / 'library'),
+            'AI_ENABLED': False,
+            'AI_CACHE_PATH': '',
+            'PREWARM_IMPORTS': False,
+            'WORKER_PROCESSES': 1,
+            'EXTRACTION_PROCESSES': 1,
+            'STORAGE_SWEEP_INTERVAL': 0,
+        }
+        test_config.update(overrides)
+        app = create_app('development', test_config)
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        app.extensions['job_executor'].shutdown(wait=False)
+
+
+def wait_for_job(store, job_id, timeout=60):
+    """Espera o job terminar (concluído, falho ou cancelado) e retorna o seu registro"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = store.get(job_id)
+        if job['status'] in ('completed', 'failed', 'cancelled') or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
@@ -0,0 +1,118 @@
+"""
+Testes do cliente de IA (src/ai_generator.py) contra o servidor DeepSeek simulado
+"""
+
+from src.ai_generator import CHARS_PER_TOKEN, AIGenerator, iter_ai_sections
+from src.llm_cache import LLMCache
+
+from conftest import MOCK_TOTAL_TOKENS
+
+
+def make_sections(count):
+    return [{'title': f'Seção {i}', 'content': ['texto da seção ' * 10], 'images': []} for i in range(count)]
+
+
+def make_generator(server, **kwargs):
+    options = dict(api_key='mock', base_url=server.base_url, model='deepseek-chat',
+                   max_tokens=200, backoff_base=0.01, backoff_max=0.05)
+    options.update(kwargs)
+    return AIGenerator(**options)
+
+
+def summarize(sections, generator, **kwargs):
+    return list(iter_ai_sections(iter(sections), generator, **kwargs))
+
+
+def test_sections_are_summarized_in_order(mock_deepseek):
+    sections = make_sections(10)
+    generator = make_generator(mock_deepseek, concurrency=4)
+
+    results = summarize(sections, generator)
+
+    assert [r['title'] for r in results] == [s['title'] for s in sections]
+    assert all(r['content'][0].startswith('• Tópico 0') for r in results)
+    assert mock_deepseek.requests == 10
+    assert generator.budget.used == 10 * MOCK_TOTAL_TOKENS
+
+
+def test_rate_limit_and_server_errors_are_retried(mock_deepseek):
+    mock_deepseek.script.extend([429, 500, 503])
+    generator = make_generator(mock_deepseek, concurrency=1, max_retries=3)
+
+    [result] = summarize(make_sections(1), generator)
+
+    assert result['content'][0].startswith('• Tópico')
+    assert generator.retries == 3
+    assert generator.failures == 0
+    assert mock_deepseek.requests == 4
+
+
+def test_section_is_kept_when_retries_are_exhausted(mock_deepseek):
+    mock_deepseek.script.extend([500, 500, 500])
+    generator = make_generator(mock_deepseek, concurrency=1, max_retries=2)
+    sections = make_sections(1)
+
+    [result] = summarize(sections, generator)
+
+    assert result is sections[0]
+    assert generator.retries == 2
+    assert generator.failures == 1
+    assert mock_deepseek.requests == 3
+
+
+def test_backoff_respects_retry_after_cap(mock_deepseek):
+    generator = make_generator(mock_deepseek, backoff_base=1.0, backoff_max=0.2)
+
+    class Response:
+        headers = {'retry-after': '30'}
+
+    class RateLimited(Exception):
+        response = Response()
+
+    assert generator._backoff(0, RateLimited()) == 0.2
+    assert all(0 <= generator._backoff(attempt, Exception()) <= 0.2 for attempt in range(6))
+
+
+def test_concurrency_limit_is_respected(mock_deepseek):
+    mock_deepseek.latency = 0.05
+    generator = make_generator(mock_deepseek, concurrency=3)
+
+    summarize(make_sections(12), generator, batch_size=12)
+
+    assert mock_deepseek.requests == 12
+    assert mock_deepseek.max_in_flight == 3
+
+
+def test_token_budget_truncates_summaries(mock_deepseek):
+    sections = make_sections(5)
+    probe = make_generator(mock_deepseek)
+    estimate = sum(len(m['content']) for m in probe.build_messages(sections[0])) // CHARS_PER_TOKEN + 200
+    # Cabem as reservas de duas seções; as demais seguem com o conteúdo original
+    generator = make_generator(mock_deepseek, concurrency=5, token_budget=estimate * 2 + estimate // 2)
+
+    results = summarize(sections, generator, batch_size=5)
+
+    summarized = [r for r, s in zip(results, sections) if r is not s]
+    assert len(summarized) == 2
+    assert results[2:] == sections[2:]
+    assert mock_deepseek.requests == 2
+    assert generator.budget.used == 2 * MOCK_TOTAL_TOKENS
+    assert generator.budget.reserved == 0
+
+
+def test_cached_sections_do_not_call_the_model(mock_deepseek, tmp_path):
+    sections = make_sections(4)
+    first = LLMCache(str(tmp_path / 'llm.db'))
+    results = summarize(sections, make_generator(mock_deepseek, cache=first))
+    assert (first.hits, first.misses) == (0, 4)
+    assert mock_deepseek.requests == 4
+
+    cache = LLMCache(str(tmp_path / 'llm.db'))
+    generator = make_generator(mock_deepseek, cache=cache)
+    cached = summarize(sections, generator)
+
+    assert cached == results
+    assert (cache.hits, cache.misses) == (4, 0)
+    assert mock_deepseek.requests == 4
+    assert generator.calls == 0
+    assert generator.budget.used == 0
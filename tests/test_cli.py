@@ -0,0 +1,72 @@
+"""
+Testes da conversão em lote (src/cli.py): manifesto de atualização e
+documentos já convertidos
+"""
+
+import json
+import os
+
+from src.cli import MANIFEST_NAME, BuildManifest, convert_document, is_up_to_date, main
+from src.result_cache import ResultCache, file_digest
+
+
+def test_manifest_keeps_the_keys_between_runs(tmp_path):
+    out_dir = str(tmp_path)
+    manifest = BuildManifest()
+    manifest.record(out_dir, 'relatorio', 'chave-1')
+    manifest.record(out_dir, 'anexo', 'chave-2')
+    manifest.forget(out_dir, 'anexo')
+
+    reloaded = BuildManifest()
+
+    assert reloaded.get(out_dir, 'relatorio') == 'chave-1'
+    assert reloaded.get(out_dir, 'anexo') is None
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8')) == {'relatorio': 'chave-1'}
+
+
+def test_unreadable_manifest_converts_everything_again(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text('{corrompido', encoding='utf-8')
+
+    assert BuildManifest().get(str(tmp_path), 'relatorio') is None
+
+
+def test_is_up_to_date(tmp_path):
+    output = tmp_path / 'relatorio.pptx'
+
+    assert not is_up_to_date(str(output), 'chave', 'chave')  # PPTX removido
+    output.write_bytes(b'pptx')
+    assert is_up_to_date(str(output), 'chave', 'chave')
+    assert not is_up_to_date(str(output), 'chave', 'outra')  # documento, template ou configurações mudaram
+    assert not is_up_to_date(str(output), 'chave', None)  # nunca convertido (ou --force)
+
+
+def test_key_computed_in_the_worker_matches_the_result_cache(tmp_path):
+    document = tmp_path / 'doc.txt'
+    document.write_text('texto', encoding='utf-8')
+    template = tmp_path / 'template.pptx'
+    template.write_bytes(b'template')
+    (tmp_path / 'doc.pptx').write_bytes(b'pptx')
+    expected = ResultCache.make_key(str(document), str(template), {'max_slides': 20})
+
+    key, stats = convert_document(str(document), str(tmp_path), 'doc', str(template), {}, {'max_slides': 20},
+                                  file_digest(str(template)).digest(), recorded_key=expected)
+
+    assert (key, stats) == (expected, None)
+
+
+def test_second_run_skips_converted_documents(tmp_path, capsys):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    for n in range(2):
+        (docs / f'doc{n}.txt').write_text(f'CAPÍTULO {n}\n\nTexto do documento {n}.\n', encoding='utf-8')
+    out = tmp_path / 'saida'
+    argv = ['convert', str(docs), '--output', str(out), '--jobs', '1']
+
+    assert main(argv) == 0
+    assert sorted(os.listdir(out)) == [MANIFEST_NAME, 'doc0.pptx', 'doc1.pptx']
+    (docs / 'doc1.txt').write_text('CAPÍTULO\n\nTexto alterado.\n', encoding='utf-8')
+    capsys.readouterr()
+
+    assert main(argv) == 0
+
+    assert 'Convertidos: 1  Falhas: 0  Ignorados: 1' in capsys.readouterr().out
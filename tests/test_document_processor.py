@@ -0,0 +1,49 @@
+"""
+Testes do pipeline completo (src/document_processor.py): limite de slides e
+leitura do documento interrompida ao atingi-lo
+"""
+
+import fitz
+from pptx import Presentation
+
+from src.document_processor import run_job
+
+PAGES = 40
+
+
+def write_pdf(path, pages=PAGES):
+    doc = fitz.open()
+    for n in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Capítulo {n}', fontsize=20)
+        for line in range(4):
+            page.insert_text((72, 120 + line * 16), f'Texto da página {n}, linha {line + 1}.', fontsize=11)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_max_slides_stops_reading_the_document(tmp_path):
+    document = tmp_path / 'longo.pdf'
+    write_pdf(document)
+
+    stats = run_job(str(document), str(tmp_path), 'longo', settings={'max_slides': 5, 'extraction_processes': 1})
+
+    assert stats['ok']
+    slides = Presentation(str(tmp_path / 'longo.pptx')).slides
+    titles = [slide.shapes.title.text for slide in slides]
+    # max_slides conta só os slides de conteúdo: o deck tem mais o título e a conclusão
+    assert len(slides) == 5 + 2
+    assert titles[1:-1] == [f'Capítulo {n}' for n in range(1, 6)]
+    assert titles[-1] == 'Conclusão'
+    # A extração parou perto do limite (amostra de títulos + leitura antecipada), longe do fim
+    assert stats['pages'] < PAGES / 2
+
+
+def test_without_a_limit_every_page_is_read(tmp_path):
+    document = tmp_path / 'longo.pdf'
+    write_pdf(document)
+
+    stats = run_job(str(document), str(tmp_path), 'longo', settings={'max_slides': 0, 'extraction_processes': 1})
+
+    assert stats['pages'] == PAGES
+    assert len(Presentation(str(tmp_path / 'longo.pptx')).slides) == PAGES + 2
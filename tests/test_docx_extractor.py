@@ -0,0 +1,72 @@
+"""
+Testes da extração em fluxo de DOCX (src/docx_extractor.py)
+"""
+
+import zipfile
+
+from src.document_processor import iter_classified_lines
+from src.docx_extractor import has_heading_styles, iter_docx_pages
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+STYLES = f"""<w:styles {NS}>
+<w:style w:type="paragraph" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+</w:styles>"""
+
+
+def p(text, style=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{ppr}<w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def sdt(content):
+    return f'<w:sdt><w:sdtPr/><w:sdtContent>{content}</w:sdtContent></w:sdt>'
+
+
+def table(*rows):
+    return '<w:tbl>' + ''.join(
+        '<w:tr>' + ''.join(f'<w:tc>{cell}</w:tc>' for cell in row) + '</w:tr>' for row in rows
+    ) + '</w:tbl>'
+
+
+def make_docx(path, body, styles=STYLES):
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document {NS}><w:body>{body}<w:sectPr/></w:body></w:document>')
+        if styles:
+            archive.writestr('word/styles.xml', styles)
+    return str(path)
+
+
+def texts(path):
+    return [line['text'] for page in iter_docx_pages(path) for line in page]
+
+
+def test_content_controls_are_read(tmp_path):
+    path = make_docx(tmp_path / 'sdt.docx', p('antes') + sdt(p('dentro') + sdt(p('aninhado'))) + p('depois'))
+
+    assert texts(path) == ['antes', 'dentro', 'aninhado', 'depois']
+
+
+def test_nested_tables_are_read_once(tmp_path):
+    nested = table([p('interna 1'), p('interna 2')])
+    path = make_docx(tmp_path / 'tabela.docx', table([p('a'), p('b') + nested], [sdt(p('c')), p('d')]))
+
+    assert texts(path) == ['a | b interna 1 interna 2', 'c | d']
+
+
+def test_heading_styles_come_from_the_styles_part(tmp_path):
+    # O primeiro título aparece depois da amostra usada pelo classificador
+    body = ''.join(p(f'PARÁGRAFO {i}') for i in range(5)) + p('Capítulo', 'Heading1') + p('texto')
+    path = make_docx(tmp_path / 'estilos.docx', body)
+    assert has_heading_styles(path)
+
+    classified = list(iter_classified_lines(iter_docx_pages(path, lines_per_page=2), 1, has_heading_styles(path)))
+
+    assert [text for _, text, level in classified if level] == ['Capítulo']
+
+
+def test_documents_without_heading_styles(tmp_path):
+    path = make_docx(tmp_path / 'simples.docx', p('texto'), styles=None)
+
+    assert not has_heading_styles(path)
@@ -0,0 +1,52 @@
+"""
+Testes do download das apresentações geradas (/download/<filename>):
+ETag do conteúdo, Range e envio pelo servidor web (DOWNLOAD_OFFLOAD)
+"""
+
+import hashlib
+
+CONTENT = bytes(range(256)) * 4
+
+
+def make_client(make_app, tmp_path, **overrides):
+    client = make_app(**overrides).test_client()
+    (tmp_path / 'outputs' / 'deck.pptx').write_bytes(CONTENT)
+    return client
+
+
+def test_matching_etag_gets_not_modified(make_app, tmp_path):
+    client = make_client(make_app, tmp_path)
+
+    response = client.get('/download/deck.pptx')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert response.data == CONTENT
+    assert etag == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+    cached = client.get('/download/deck.pptx', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+
+def test_range_gets_partial_content(make_app, tmp_path):
+    client = make_client(make_app, tmp_path)
+
+    response = client.get('/download/deck.pptx', headers={'Range': 'bytes=0-99'})
+
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f'bytes 0-99/{len(CONTENT)}'
+    assert response.data == CONTENT[:100]
+
+
+def test_accel_redirect_sends_only_headers(make_app, tmp_path):
+    client = make_client(make_app, tmp_path, DOWNLOAD_OFFLOAD='x-accel-redirect',
+                         DOWNLOAD_ACCEL_PREFIX='/protegido/')
+
+    response = client.get('/download/deck.pptx')
+
+    assert response.status_code == 200
+    assert response.data == b''
+    assert response.headers['X-Accel-Redirect'] == '/protegido/deck.pptx'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="deck.pptx"'
+    etag = response.headers['ETag']
+    assert client.get('/download/deck.pptx', headers={'If-None-Match': etag}).status_code == 304
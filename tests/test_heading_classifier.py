@@ -0,0 +1,77 @@
+"""
+Testes da classificação de títulos (src/heading_classifier.py) e da montagem
+das seções aninhadas (document_processor.iter_sections)
+"""
+
+from src.document_processor import iter_classified_lines, iter_sections
+from src.heading_classifier import HeadingClassifier, cluster_font_sizes
+
+
+def line(text, size=11.0, page=0):
+    return {'text': text, 'size': size, 'page': page}
+
+
+def levels(classifier, page):
+    return [(text, level) for _, text, level in classifier.classify(page)]
+
+
+def test_uniform_sizes_have_no_heading_levels():
+    assert cluster_font_sizes([11.0] * 5, [80] * 5) == (11.0, ())
+
+
+def test_two_sizes():
+    assert cluster_font_sizes([11.0, 11.0, 18.0, 11.2], [300, 300, 20, 40]) == (11.0, (18.0,))
+
+
+def test_three_or_more_levels_are_clustered_in_two():
+    sizes = [11.0, 24.0, 22.0, 16.0, 15.0, 11.0]
+    weights = [500, 10, 12, 20, 25, 500]
+
+    # 22-24 formam o H1 e 15-16 o H2; o limiar é o menor tamanho de cada grupo
+    assert cluster_font_sizes(sizes, weights) == (11.0, (22.0, 15.0))
+
+
+def test_lines_are_classified_by_size_then_by_text():
+    sample = [line('Título', 20.0), line('Subtítulo', 15.0), line('texto ' * 40), line('1.2 Escopo')]
+    classifier = HeadingClassifier(sample)
+
+    assert levels(classifier, sample) == [('Título', 1), ('Subtítulo', 2), (('texto ' * 40).strip(), 0),
+                                          ('1.2 Escopo', 2)]
+
+
+def test_sizes_unseen_in_the_sample_above_the_body_are_headings():
+    # Amostra só com texto do corpo: um título maior depois dela vira H1
+    uniform = HeadingClassifier([line('texto ' * 40)] * 3)
+    assert levels(uniform, [line('Resultados', 18.0), line('texto', 11.2)]) == [('Resultados', 1), ('texto', 0)]
+
+    # Amostra com H1: um tamanho novo entre o corpo e o H1 vira H2
+    with_h1 = HeadingClassifier([line('Título', 20.0), line('texto ' * 40)])
+    assert levels(with_h1, [line('Discussão', 14.0), line('Parte', 24.0)]) == [('Discussão', 2), ('Parte', 1)]
+
+
+def test_late_headings_start_sections():
+    pages = [[line('texto inicial do documento ' * 5, page=0)], [line('Resultados', 18.0, page=1), line('dados', page=1)]]
+
+    sections = list(iter_sections(iter_classified_lines(pages, sample_pages=1)))
+
+    assert [section['title'] for section in sections] == ['Introdução', 'Resultados']
+
+
+def test_nested_sections_record_their_parent():
+    classified = [
+        (line('Capítulo 1'), 'Capítulo 1', 1),
+        (line('Seção A'), 'Seção A', 2),
+        (line('a'), 'a', 0),
+        (line('Seção B'), 'Seção B', 2),
+        (line('b'), 'b', 0),
+        (line('Capítulo 2'), 'Capítulo 2', 1),
+        (line('c'), 'c', 0),
+    ]
+
+    sections = [(s['title'], s['level'], s['parent'], s['content']) for s in iter_sections(classified)]
+
+    assert sections == [
+        ('Seção A', 2, 'Capítulo 1', ['a']),
+        ('Seção B', 2, 'Capítulo 1', ['b']),
+        ('Capítulo 2', 1, None, ['c']),
+    ]
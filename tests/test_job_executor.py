@@ -0,0 +1,126 @@
+"""
+Testes do executor de jobs (src/job_executor.py): workers reaproveitados
+entre os jobs e trocados após tempo limite, cancelamento ou falha
+"""
+
+import os
+import time
+
+import pytest
+
+from src.job_executor import (JobCancelledError, JobExecutor, JobProcessError, JobTimeoutError, QueueFullError,
+                              notify_parent)
+
+_cache = {}
+
+
+def cached_pid(key):
+    """Devolve o pid do processo e se ``key`` já estava no cache do processo"""
+    hit = key in _cache
+    _cache[key] = True
+    return os.getpid(), hit
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def crash():
+    os._exit(3)
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def report_progress(times):
+    for _ in range(times):
+        notify_parent()
+    return times
+
+
+@pytest.fixture
+def executor():
+    executor = JobExecutor(max_workers=1, max_queue=2, timeout=5)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def test_worker_and_its_caches_are_kept_between_jobs(executor):
+    first_pid, first_hit = executor.submit(cached_pid, 'template').result(timeout=30)
+    second_pid, second_hit = executor.submit(cached_pid, 'template').result(timeout=30)
+
+    assert first_pid == second_pid != os.getpid()
+    assert (first_hit, second_hit) == (False, True)
+
+
+def test_job_errors_are_returned_and_keep_the_worker(executor):
+    pid = executor.submit(sleep, 0).result(timeout=30)
+    with pytest.raises(ValueError, match='documento inválido'):
+        executor.submit(fail, 'documento inválido').result(timeout=30)
+
+    assert executor.submit(sleep, 0).result(timeout=30) == pid
+
+
+def test_timeout_replaces_the_worker():
+    executor = JobExecutor(max_workers=1, timeout=1)
+    try:
+        pid = executor.submit(sleep, 0).result(timeout=30)
+        with pytest.raises(JobTimeoutError):
+            executor.submit(sleep, 30).result(timeout=30)
+
+        assert executor.submit(sleep, 0).result(timeout=30) != pid
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_cancel_running_and_queued_jobs(executor):
+    running = executor.submit(sleep, 30, job_id='em-execucao')
+    queued = executor.submit(sleep, 0, job_id='na-fila')
+    while not running.running():
+        time.sleep(0.01)
+    time.sleep(0.2)
+
+    assert executor.cancel('na-fila')
+    assert executor.cancel('em-execucao')
+    with pytest.raises(JobCancelledError):
+        running.result(timeout=30)
+    assert queued.cancelled()
+    assert executor.submit(sleep, 0).result(timeout=30)
+
+
+def test_crashed_worker_is_replaced(executor):
+    with pytest.raises(JobProcessError):
+        executor.submit(crash).result(timeout=30)
+
+    assert executor.submit(sleep, 0).result(timeout=30)
+
+
+def test_queue_is_bounded(executor):
+    futures = [executor.submit(sleep, 0.5) for _ in range(3)]
+    with pytest.raises(QueueFullError):
+        executor.submit(sleep, 0)
+    for future in futures:
+        future.result(timeout=30)
+
+
+def test_workers_are_replaced_after_max_jobs():
+    executor = JobExecutor(max_workers=1, max_jobs_per_worker=2)
+    try:
+        pids = [executor.submit(sleep, 0).result(timeout=30) for _ in range(3)]
+    finally:
+        executor.shutdown(wait=False)
+
+    assert pids[0] == pids[1] != pids[2]
+
+
+def test_job_events_reach_the_executor():
+    events = []
+    executor = JobExecutor(max_workers=1, on_event=events.append)
+    try:
+        assert executor.submit(report_progress, 3, job_id='com-progresso').result(timeout=30) == 3
+    finally:
+        executor.shutdown(wait=False)
+
+    assert events == ['com-progresso'] * 3
@@ -0,0 +1,37 @@
+"""
+Testes dos avisos de progresso em memória (src/job_notifier.py)
+"""
+
+import threading
+
+from src.job_notifier import JobNotifier
+
+
+def test_notify_wakes_only_the_watchers_of_the_job():
+    notifier = JobNotifier()
+    with notifier.watch('a') as a, notifier.watch('b') as b:
+        notifier.notify('a')
+
+        assert a.is_set()
+        assert not b.is_set()
+
+
+def test_notification_is_kept_until_the_watcher_clears_it():
+    notifier = JobNotifier()
+    with notifier.watch('job') as changed:
+        # Aviso que chega enquanto o stream ainda não está esperando
+        notifier.notify('job')
+        assert changed.wait(timeout=0)
+        changed.clear()
+
+        threading.Timer(0.05, notifier.notify, args=('job',)).start()
+        assert changed.wait(timeout=5)
+
+
+def test_watchers_are_removed_when_the_stream_ends():
+    notifier = JobNotifier()
+    with notifier.watch('job'):
+        pass
+
+    notifier.notify('job')
+    assert notifier._watchers == {}
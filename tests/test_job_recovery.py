@@ -0,0 +1,48 @@
+"""
+Testes da retomada dos jobs na fila depois de um reinício (app.recover_jobs)
+"""
+
+from conftest import wait_for_job
+from src.document_processor import settings_from_config
+from src.job_store import COMPLETED
+from src.result_cache import ResultCache
+
+
+def test_recovered_jobs_beyond_the_queue_wait_for_a_slot(make_app, tmp_path):
+    # Um worker e nenhuma vaga na fila: só um job é aceito por vez
+    app = make_app(JOB_QUEUE_SIZE=0)
+    store = app.extensions['job_store']
+    job_ids = []
+    for n in range(3):
+        path = tmp_path / f'doc{n}.txt'
+        path.write_text(f'CAPÍTULO {n}\n\nTexto do documento {n}.\n', encoding='utf-8')
+        job_ids.append(store.create(path.name, str(path), str(tmp_path / 'outputs'), f'doc{n}'))
+
+    # A primeira requisição executa a retomada
+    app.test_client().get('/')
+
+    for job_id in job_ids:
+        assert wait_for_job(store, job_id)['status'] == COMPLETED
+
+
+def test_recovered_jobs_use_the_result_cache(make_app, tmp_path):
+    app = make_app()
+    store = app.extensions['job_store']
+    result_cache = app.extensions['result_cache']
+    path = tmp_path / 'doc.txt'
+    path.write_text('CAPÍTULO\n\nTexto do documento.\n', encoding='utf-8')
+    key = ResultCache.make_key(str(path), None, settings_from_config(app.config, app.root_path))
+    first = store.create(path.name, str(path), str(tmp_path / 'outputs'), 'doc')
+
+    app.test_client().get('/')
+    assert wait_for_job(store, first)['status'] == COMPLETED
+
+    # O resultado do job retomado foi guardado com a chave de start_job...
+    assert result_cache.get(key, str(tmp_path / 'copia.pptx'))
+    # ...e um novo job retomado com o mesmo documento sai do cache
+    second = store.create(path.name, str(path), str(tmp_path / 'outputs'), 'doc2')
+    app.extensions['job_executor'].shutdown()
+    restarted = make_app()
+    restarted.test_client().get('/')
+    assert restarted.extensions['job_store'].get(second)['status'] == COMPLETED
+    assert restarted.extensions['result_cache'].stats()['hits'] == 1
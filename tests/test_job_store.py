@@ -0,0 +1,46 @@
+"""
+Testes do registro de jobs (src/job_store.py)
+"""
+
+import os
+import sqlite3
+
+from src.job_store import FAILED, PROCESSING, QUEUED, JobStore, ProgressReporter
+
+
+def make_job(store, name):
+    return store.create(f'{name}.pdf', f'/uploads/{name}.pdf', '/outputs', name)
+
+
+def test_restart_fails_jobs_of_the_previous_instance(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    stale = make_job(store, 'antigo')
+    # O pid gravado é de um processo vivo (o do teste), como um pid reutilizado depois do reinício
+    assert ProgressReporter(store.db_path, stale, instance_id='anterior').start()
+    assert store.get(stale)['worker_pid'] == os.getpid()
+    running = make_job(store, 'atual')
+    assert store.claim(running, 'atual')
+    queued = make_job(store, 'na-fila')
+
+    resubmit = store.recover_interrupted('atual')
+
+    assert store.get(stale)['status'] == FAILED
+    assert store.get(running)['status'] == PROCESSING
+    assert [job['id'] for job in resubmit] == [queued]
+    assert resubmit[0]['status'] == QUEUED
+
+
+def test_existing_database_gets_the_new_columns(tmp_path):
+    db_path = str(tmp_path / 'jobs.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE jobs (id TEXT PRIMARY KEY, filename TEXT NOT NULL, file_path TEXT NOT NULL, '
+                     'output_dir TEXT NOT NULL, output_filename TEXT NOT NULL, template_path TEXT, '
+                     'status TEXT NOT NULL, stage TEXT NOT NULL, progress INTEGER NOT NULL DEFAULT 0, '
+                     'done INTEGER, total INTEGER, message TEXT, error TEXT, worker_pid INTEGER, '
+                     'created_at REAL NOT NULL, updated_at REAL NOT NULL)')
+    conn.close()
+    store = JobStore(db_path)
+    job_id = make_job(store, 'migrado')
+
+    assert store.claim(job_id, 'atual')
+    assert store.get(job_id)['instance_id'] == 'atual'
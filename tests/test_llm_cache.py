@@ -0,0 +1,57 @@
+"""
+Testes do cache das respostas da IA (src/llm_cache.py)
+"""
+
+import sqlite3
+import time
+
+from src.llm_cache import LLMCache
+
+
+def age(cache, key, seconds, column):
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute(f'UPDATE llm_cache SET {column} = ? WHERE key = ?', (time.time() - seconds, key))
+    conn.close()
+
+
+def keys(cache):
+    with sqlite3.connect(cache.db_path) as conn:
+        rows = conn.execute('SELECT key FROM llm_cache ORDER BY key').fetchall()
+    conn.close()
+    return [key for key, in rows]
+
+
+def test_expired_entries_are_misses_and_are_removed(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.db'), ttl=60)
+    cache.put('antiga', {'title': 'Antiga'})
+    cache.put('recente', {'title': 'Recente'})
+    age(cache, 'antiga', 120, 'created_at')
+
+    # O acesso recente não prolonga a validade, que conta da criação
+    assert cache.get('antiga') is None
+    assert cache.get('recente') == {'title': 'Recente'}
+    assert keys(cache) == ['recente']
+
+    age(cache, 'recente', 120, 'created_at')
+    cache.put('nova', {'title': 'Nova'})
+
+    # A gravação descarta as demais entradas vencidas
+    assert keys(cache) == ['nova']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    value = {'bullets': ['x' * 50]}
+    cache = LLMCache(str(tmp_path / 'llm.db'), ttl=0, max_bytes=250)
+    for n, key in enumerate(['a-antiga', 'b-media', 'c-recente']):
+        cache.put(key, value)
+        age(cache, key, 100 - n, 'accessed_at')
+
+    # A leitura renova a entrada mais antiga; a próxima da fila LRU sai no lugar dela
+    assert cache.get('a-antiga') == value
+    cache.put('d-nova', value)
+
+    assert keys(cache) == ['a-antiga', 'c-recente', 'd-nova']
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= 250
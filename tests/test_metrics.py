@@ -0,0 +1,78 @@
+"""
+Testes das métricas exportadas em /metrics (src/metrics.py)
+"""
+
+import time
+
+from conftest import wait_for_job
+
+TYPES = {
+    'doctoppt_stage_duration_seconds': 'histogram',
+    'doctoppt_job_duration_seconds': 'histogram',
+    'doctoppt_jobs_total': 'counter',
+    'doctoppt_job_failures_total': 'counter',
+    'doctoppt_pages_processed_total': 'counter',
+    'doctoppt_images_processed_total': 'counter',
+    'doctoppt_bytes_in_total': 'counter',
+    'doctoppt_bytes_out_total': 'counter',
+    'doctoppt_ai_cache_lookups_total': 'counter',
+    'doctoppt_storage_reclaimed_bytes_total': 'counter',
+    'doctoppt_storage_bytes': 'gauge',
+    'doctoppt_queue_depth': 'gauge',
+    'doctoppt_http_request_duration_seconds': 'histogram',
+}
+
+
+def scrape(client):
+    """Retorna as linhas ``# TYPE`` e as amostras ({nome{rótulos}: valor})"""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    types, samples = {}, {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line.startswith('# TYPE '):
+            name, kind = line[len('# TYPE '):].split(' ')
+            types[name] = kind
+        elif line and not line.startswith('#'):
+            sample, value = line.rsplit(' ', 1)
+            samples[sample] = float(value)
+    return types, samples
+
+
+def test_metrics_are_exported_and_grow_after_a_job(make_app):
+    app = make_app()
+    client = app.test_client()
+
+    types, before = scrape(client)
+    assert types == TYPES
+    assert before['doctoppt_pages_processed_total'] == 0
+    assert before['doctoppt_queue_depth'] == 0
+    assert 'doctoppt_jobs_total{status="completed"}' not in before
+
+    content = 'CAPÍTULO 1\n\nPrimeiro parágrafo do documento.\n\nCAPÍTULO 2\n\nSegundo parágrafo.\n'.encode('utf-8')
+    response = client.post('/api/uploads', json={'filename': 'doc.txt', 'size': len(content)})
+    upload_id = response.get_json()['upload_id']
+    job_id = client.put(f'/api/uploads/{upload_id}', data=content,
+                        headers={'Content-Range': f'bytes 0-{len(content) - 1}/{len(content)}'}).get_json()['job_id']
+    assert wait_for_job(app.extensions['job_store'], job_id)['status'] == 'completed'
+
+    # O resumo do worker é registrado pelo callback do job, logo depois da conclusão
+    deadline = time.monotonic() + 10
+    while True:
+        _, after = scrape(client)
+        if after.get('doctoppt_jobs_total{status="completed"}') or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+
+    assert after['doctoppt_jobs_total{status="completed"}'] == 1
+    assert after['doctoppt_job_duration_seconds_count{status="completed"}'] == 1
+    assert after['doctoppt_job_duration_seconds_bucket{status="completed",le="+Inf"}'] == 1
+    assert after['doctoppt_job_duration_seconds_sum{status="completed"}'] > 0
+    assert any(sample.startswith('doctoppt_stage_duration_seconds_count{') and value >= 1
+               for sample, value in after.items())
+    assert after['doctoppt_pages_processed_total'] > before['doctoppt_pages_processed_total']
+    assert after['doctoppt_bytes_in_total'] == len(content)
+    assert after['doctoppt_bytes_out_total'] > 0
+    # As rotas chamadas acima entram no histograma HTTP; /metrics não
+    assert after['doctoppt_http_request_duration_seconds_count{route="/api/uploads",method="POST",status="201"}'] == 1
+    assert not any('route="/metrics"' in sample for sample in after)
@@ -0,0 +1,34 @@
+"""
+Testes do preenchimento dos placeholders (src/pptx_generator.py)
+"""
+
+from pptx import Presentation
+
+from src.pptx_generator import fill_text
+
+_NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+
+
+def body_shape():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    return slide.placeholders[1]._element
+
+
+def test_paragraphs_replace_the_placeholder_text():
+    sp = body_shape()
+
+    fill_text(sp, [(0, 'Texto'), (1, 'Tópico <1>')])
+
+    paragraphs = sp.txBody.findall(f'{_NS_A}p')
+    assert [''.join(t.text for t in p.iter(f'{_NS_A}t')) for p in paragraphs] == ['Texto', 'Tópico <1>']
+    assert paragraphs[1].find(f'{_NS_A}pPr').get('lvl') == '1'
+
+
+def test_empty_body_keeps_one_paragraph():
+    sp = body_shape()
+
+    fill_text(sp, [])
+
+    # Um txBody sem a:p é inválido (o PowerPoint pede para reparar o arquivo)
+    assert len(sp.txBody.findall(f'{_NS_A}p')) == 1
@@ -0,0 +1,63 @@
+"""
+Testes do cache de resultados por conteúdo (src/result_cache.py)
+"""
+
+import os
+
+from src.result_cache import ResultCache, file_digest
+
+
+def write(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), 1024)
+    key = ResultCache.make_key(write(tmp_path / 'doc.txt', b'documento'))
+    destination = str(tmp_path / 'saida.pptx')
+
+    assert not cache.get(key, destination)
+    cache.put(key, write(tmp_path / 'gerado.pptx', b'pptx'))
+    assert cache.get(key, destination)
+
+    with open(destination, 'rb') as f:
+        assert f.read() == b'pptx'
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'hit_rate': 0.5}
+
+
+def test_key_changes_with_template_and_settings(tmp_path):
+    document = write(tmp_path / 'doc.txt', b'documento')
+    template = write(tmp_path / 'template.pptx', b'template')
+    settings = {'max_slides': 20}
+    key = ResultCache.make_key(document, template, settings)
+
+    assert ResultCache.make_key(document, template, {'max_slides': 20}) == key
+    assert ResultCache.make_key(document, None, settings) != key
+    assert ResultCache.make_key(document, template, {'max_slides': 10}) != key
+    write(tmp_path / 'template.pptx', b'outro template')
+    assert ResultCache.make_key(document, template, settings) != key
+
+
+def test_document_digest_gives_the_same_key(tmp_path):
+    document = write(tmp_path / 'doc.txt', b'documento')
+
+    # Digest calculado durante o upload, sem reler o arquivo
+    digest = file_digest(document).digest()
+
+    assert ResultCache.make_key(document, None, {}, digest) == ResultCache.make_key(document, None, {})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), 350)
+    source = write(tmp_path / 'gerado.pptx', b'x' * 100)
+    for n, key in enumerate(['antiga', 'media', 'recente']):
+        cache.put(key, source)
+        os.utime(os.path.join(cache.cache_dir, f'{key}.pptx'), (1000 + n, 1000 + n))
+
+    # O acerto renova a entrada mais antiga; a próxima da fila LRU é removida no lugar dela
+    assert cache.get('antiga', str(tmp_path / 'saida.pptx'))
+    cache.put('nova', source)
+
+    assert sorted(name[:-len('.pptx')] for name in os.listdir(cache.cache_dir)) == ['antiga', 'nova', 'recente']
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,114 @@
+"""
+Testes da varredura de armazenamento (src/storage_manager.py)
+"""
+
+import os
+import sqlite3
+import time
+
+from src.job_store import COMPLETED, JobStore
+from src.storage_manager import StorageManager
+
+
+def make_job(store, upload_dir, output_dir, name, age=0):
+    upload = os.path.join(upload_dir, f'{name}.pdf')
+    output = os.path.join(output_dir, f'{name}.pptx')
+    for path in (upload, output):
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+        os.utime(path, (time.time() - age, time.time() - age))
+    job_id = store.create(f'{name}.pdf', upload, output_dir, name)
+    store.set_stage(job_id, 'completed')
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute('UPDATE jobs SET created_at = ?, updated_at = ? WHERE id = ?',
+                     (time.time() - age, time.time() - age, job_id))
+    conn.close()
+    return job_id
+
+
+def make_storage(tmp_path, **kwargs):
+    upload_dir, output_dir = tmp_path / 'uploads', tmp_path / 'outputs'
+    upload_dir.mkdir()
+    output_dir.mkdir()
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    return store, str(upload_dir), str(output_dir), StorageManager(str(upload_dir), str(output_dir), store, **kwargs)
+
+
+def test_expired_artifacts_remove_their_job_records(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=3600)
+    old = make_job(store, upload_dir, output_dir, 'antigo', age=7200)
+    recent = make_job(store, upload_dir, output_dir, 'recente')
+
+    storage.sweep()
+
+    assert not os.path.exists(os.path.join(output_dir, 'antigo.pptx'))
+    assert store.get(old) is None
+    assert store.get(recent)['status'] == COMPLETED
+    assert os.path.exists(os.path.join(output_dir, 'recente.pptx'))
+
+
+def test_quota_eviction_removes_job_records(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=0, quota_bytes=300)
+    old = make_job(store, upload_dir, output_dir, 'antigo', age=60)
+    recent = make_job(store, upload_dir, output_dir, 'recente')
+
+    storage.sweep()
+
+    assert store.get(old) is None
+    assert store.get(recent)['status'] == COMPLETED
+
+
+def test_touch_keeps_artifacts_without_changing_the_files(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=3600)
+    used = make_job(store, upload_dir, output_dir, 'usado', age=7200)
+    output = os.path.join(output_dir, 'usado.pptx')
+    before = os.stat(output)
+
+    storage.touch('usado')
+    storage.sweep()
+
+    assert store.get(used)['status'] == COMPLETED
+    after = os.stat(output)
+    assert (after.st_atime_ns, after.st_mtime_ns) == (before.st_atime_ns, before.st_mtime_ns)
+
+
+def test_reading_the_files_is_not_a_use(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=3600)
+    make_job(store, upload_dir, output_dir, 'lido', age=7200)
+    # Ex.: backup ou cálculo do ETag lendo o arquivo (atime atualizado)
+    output = os.path.join(output_dir, 'lido.pptx')
+    os.utime(output, (time.time(), os.stat(output).st_mtime))
+
+    storage.sweep()
+
+    assert not os.path.exists(output)
+
+
+def test_quota_evicts_the_least_recently_used(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=0, quota_bytes=300)
+    old = make_job(store, upload_dir, output_dir, 'antigo', age=120)
+    newer = make_job(store, upload_dir, output_dir, 'novo', age=60)
+
+    storage.touch('antigo')
+    storage.sweep()
+
+    assert store.get(old)['status'] == COMPLETED
+    assert store.get(newer) is None
+
+
+def test_job_created_during_the_sweep_keeps_its_files(tmp_path):
+    store, upload_dir, output_dir, storage = make_storage(tmp_path, ttl=3600)
+    make_job(store, upload_dir, output_dir, 'relatorio', age=7200)
+    scan = storage._scan
+
+    def scan_then_resubmit():
+        # O mesmo documento é enviado de novo enquanto a varredura percorre o disco
+        groups = scan()
+        store.create('relatorio.pdf', os.path.join(upload_dir, 'relatorio.pdf'), output_dir, 'relatorio')
+        return groups
+
+    storage._scan = scan_then_resubmit
+    storage.sweep()
+
+    assert os.path.exists(os.path.join(upload_dir, 'relatorio.pdf'))
+    assert os.path.exists(os.path.join(output_dir, 'relatorio.pptx'))
@@ -0,0 +1,59 @@
+"""
+Testes do caminho rápido para Markdown e texto simples (src/text_extractor.py)
+"""
+
+from src.pptx_generator import body_paragraphs
+from src.text_extractor import CODE_LINE_PREFIX, iter_text_sections
+
+
+def sections(tmp_path, text, markdown=True):
+    path = tmp_path / ('doc.md' if markdown else 'doc.txt')
+    path.write_text(text, encoding='utf-8')
+    return [(s['title'], s['level'], s['parent'], s['content']) for s in iter_text_sections(str(path), markdown)]
+
+
+def test_setext_headings(tmp_path):
+    text = 'Manual\n======\n\nApresentação.\n\nInstalação\n----------\n\nPasso único.\n'
+
+    assert sections(tmp_path, text) == [
+        ('Manual', 1, None, ['Apresentação.']),
+        ('Instalação', 2, 'Manual', ['Passo único.']),
+    ]
+
+
+def test_fenced_code_keeps_its_lines(tmp_path):
+    text = '# Exemplo\n\nPara **negrito** texto\n```python\nx = 1\n  - y\n```\nDepois do código.\n'
+
+    [(title, _, _, content)] = sections(tmp_path, text)
+
+    assert title == 'Exemplo'
+    assert content == ['Para negrito texto', f'{CODE_LINE_PREFIX}x = 1', f'{CODE_LINE_PREFIX}  - y',
+                       'Depois do código.']
+    # No slide, cada linha de código é um parágrafo e o texto vizinho não é unido a ela
+    assert body_paragraphs(content) == [(0, 'Para negrito texto'), (0, 'x = 1'), (0, '  - y'),
+                                        (0, 'Depois do código.')]
+
+
+def test_nested_list_items(tmp_path):
+    text = '# Lista\n\n- um\n  - dois\n    * três\n1. quatro\n'
+
+    [(_, _, _, content)] = sections(tmp_path, text)
+
+    assert content == ['• um', '  • dois', '    • três', '• quatro']
+    assert body_paragraphs(content) == [(1, 'um'), (1, 'dois'), (1, 'três'), (1, 'quatro')]
+
+
+def test_plain_text_headings(tmp_path):
+    text = ('INTRODUÇÃO\n'
+            'O documento começa aqui.\n'
+            '\n'
+            'Resultados obtidos\n'
+            '\n'
+            'Os números foram bons.\n'
+            'Linha curta sem ponto\n'
+            'continua o parágrafo.\n')
+
+    assert sections(tmp_path, text, markdown=False) == [
+        ('INTRODUÇÃO', 1, None, ['O documento começa aqui.']),
+        ('Resultados obtidos', 1, None, ['Os números foram bons.', 'Linha curta sem ponto', 'continua o parágrafo.']),
+    ]
@@ -0,0 +1,98 @@
+"""
+Testes da distribuição do texto pelos slides (src/text_fit.py)
+"""
+
+from pptx import Presentation
+from pptx.oxml import parse_xml
+
+from src.text_fit import DEFAULT_BODY_BOX, TextPacker, _wrap, body_box, glyph_table
+
+_NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+
+def box(level_sizes=(18.0, 18.0), width=300.0, height=200.0):
+    return {
+        'width': width,
+        'height': height,
+        'font': 'Calibri',
+        'levels': [{'size': size, 'indent': 0.0, 'space_before': 0.0, 'line_spacing': 1.2}
+                   for size in level_sizes],
+    }
+
+
+def pack(paragraphs, slide_box):
+    packer = TextPacker(paragraphs)
+    slides = []
+    while not packer.done:
+        slides.append(packer.take(slide_box))
+    return slides
+
+
+def test_long_section_is_split_without_losing_text():
+    sentences = [f'Frase número {n} do texto corrido da seção.' for n in range(120)]
+    bullets = [(1, f'Tópico {n} da lista') for n in range(30)]
+    paragraphs = [(0, ' '.join(sentences))] + bullets
+
+    slides = pack(paragraphs, DEFAULT_BODY_BOX)
+
+    assert len(slides) > 3
+    assert all(slides)
+    text = [part for slide in slides for level, part in slide if level == 0]
+    # O texto foi cortado em fins de frase e nenhuma palavra se perdeu ou repetiu
+    assert all(part.endswith('.') for part in text)
+    assert ' '.join(text).split() == ' '.join(sentences).split()
+    # Tópicos não são divididos
+    assert [item for slide in slides for item in slide if item[0] == 1] == bullets
+
+
+def test_each_slide_fits_the_box():
+    slide_box = box(height=100.0)
+    paragraphs = [(0, 'palavra ' * 400)]
+
+    slides = pack(paragraphs, slide_box)
+
+    table = glyph_table('Calibri', 18.0)
+    max_lines = int(100.0 * 0.95 // (18.0 * 1.2))
+    for (_, part), in slides:
+        widths = [table.width(word) for word in part.split()]
+        end, lines = _wrap(widths, 0, table.space, 300.0, max_lines)
+        assert end == len(widths) and lines <= max_lines
+    assert sum(len(part.split()) for (_, part), in slides) == 400
+
+
+def test_overlong_word_is_hard_wrapped():
+    # Uma palavra de 3,5 linhas ocupa 4 linhas; a seguinte começa em uma linha nova
+    assert _wrap([350.0, 50.0], 0, 5.0, 100.0, 10) == (2, 5)
+    # Mesmo sem caber em max_lines, a primeira palavra é colocada (o slide nunca fica vazio)
+    assert _wrap([350.0, 50.0], 0, 5.0, 100.0, 2) == (1, 4)
+
+    word = 'x' * 400
+    slides = pack([(0, f'{word} curto')], box(height=120.0))
+
+    assert slides == [[(0, word)], [(0, 'curto')]]
+
+
+def test_bullets_use_the_second_level_size():
+    slide_box = box(level_sizes=(10.0, 30.0), height=120.0)
+    text = 'Tópico com várias palavras que ocupa algumas linhas da caixa de texto'
+
+    as_text = pack([(0, text)] * 6, slide_box)
+    as_bullets = pack([(1, text)] * 6, slide_box)
+
+    # Com a fonte maior do nível 1, os mesmos parágrafos ocupam mais slides
+    assert len(as_bullets) > len(as_text)
+
+
+def test_body_box_reads_the_level_sizes_from_the_layout():
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    placeholder = layout.placeholders.get(idx=1)
+    lst_style = placeholder.element.txBody.find(f'{{{_NS_A}}}lstStyle')
+    lst_style.append(parse_xml(f'<a:lvl2pPr xmlns:a="{_NS_A}" marL="914400"><a:defRPr sz="1400"/></a:lvl2pPr>'))
+
+    levels = body_box(layout, 1)['levels']
+
+    # Nível 0 herda o estilo de corpo do mestre; o nível 1 vem do lvl2pPr do layout
+    assert levels[0]['size'] == 32.0
+    assert levels[1]['size'] == 14.0
+    assert levels[1]['indent'] == 72.0
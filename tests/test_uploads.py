@@ -0,0 +1,120 @@
+"""
+Testes do envio de documentos: limites exibidos pelo servidor e upload em
+partes (/api/uploads, src/upload_store.py)
+"""
+
+import io
+
+from conftest import wait_for_job
+from src.document_processor import settings_from_config
+from src.result_cache import ResultCache
+
+
+def test_upload_limits_come_from_the_configuration(make_app):
+    client = make_app(MAX_CONTENT_LENGTH=2048, MAX_UPLOAD_SIZE=3 * 1024 * 1024).test_client()
+
+    page = client.get('/upload').get_data(as_text=True)
+
+    assert 'data-form-upload-limit="2048"' in page
+    assert 'data-max-upload-size="3145728"' in page
+    assert 'Tamanho máximo:</strong> 3MB' in page
+
+
+def test_form_upload_over_the_limit(make_app):
+    client = make_app(MAX_CONTENT_LENGTH=2048).test_client()
+
+    response = client.post('/upload', data={'document': (io.BytesIO(b'x' * 4096), 'grande.txt')})
+
+    assert response.status_code == 413
+    assert 'Arquivo muito grande. Tamanho máximo: 2KB' in client.get('/').get_data(as_text=True)
+
+
+def create_upload(client, size, filename='doc.txt'):
+    response = client.post('/api/uploads', json={'filename': filename, 'size': size})
+    assert response.status_code == 201
+    return response.get_json()['upload_id']
+
+
+def put_chunk(client, upload_id, offset, chunk, total):
+    return client.put(f'/api/uploads/{upload_id}', data=chunk,
+                      headers={'Content-Range': f'bytes {offset}-{offset + len(chunk) - 1}/{total}'})
+
+
+class DroppedConnection(io.BytesIO):
+    """Corpo da requisição que cai depois de ``limit`` bytes"""
+
+    def __init__(self, content, limit):
+        super().__init__(content)
+        self.limit = limit
+
+    def read(self, size=-1):
+        if self.tell() >= self.limit:
+            raise OSError('conexão interrompida')
+        return super().read(min(size, self.limit - self.tell()) if size > 0 else self.limit - self.tell())
+
+
+def test_chunk_at_the_wrong_offset_gets_the_current_offset(make_app):
+    client = make_app().test_client()
+    upload_id = create_upload(client, 10)
+    assert put_chunk(client, upload_id, 0, b'01234', 10).status_code == 200
+
+    for response in (put_chunk(client, upload_id, 2, b'23456', 10),
+                     client.put(f'/api/uploads/{upload_id}', data=b'x', headers={'Upload-Offset': '9'})):
+        assert response.status_code == 409
+        assert response.get_json()['offset'] == 5
+        assert response.headers['Upload-Offset'] == '5'
+
+
+def test_interrupted_upload_resumes_from_the_received_bytes(make_app, tmp_path):
+    app = make_app()
+    client = app.test_client()
+    content = 'CAPÍTULO\n\nTexto do documento enviado em partes.\n'.encode('utf-8')
+    upload_id = create_upload(client, len(content))
+
+    # A conexão cai no meio da parte: o que chegou ao disco vale para a retomada
+    try:
+        app.extensions['upload_store'].write_chunk(upload_id, 0, DroppedConnection(content, 12))
+    except OSError:
+        pass
+    head = client.head(f'/api/uploads/{upload_id}')
+    assert head.headers['Upload-Offset'] == '12'
+
+    response = put_chunk(client, upload_id, 12, content[12:], len(content))
+
+    assert response.status_code == 201
+    assert (tmp_path / 'uploads' / 'doc.txt').read_bytes() == content
+
+
+def test_upload_over_the_size_limits(make_app):
+    client = make_app(MAX_CONTENT_LENGTH=1024, MAX_UPLOAD_SIZE=4096).test_client()
+
+    response = client.post('/api/uploads', json={'filename': 'doc.txt', 'size': 4097})
+    assert response.status_code == 413
+    assert 'Tamanho máximo: 4KB' in response.get_json()['message']
+
+    # Cada parte respeita MAX_CONTENT_LENGTH; a sessão continua no mesmo offset
+    upload_id = create_upload(client, 4096)
+    assert put_chunk(client, upload_id, 0, b'x' * 2048, 4096).status_code == 413
+    assert client.get(f'/api/uploads/{upload_id}').get_json()['offset'] == 0
+
+
+def test_unknown_upload(make_app):
+    client = make_app().test_client()
+
+    assert client.get('/api/uploads/inexistente').status_code == 404
+    assert put_chunk(client, 'inexistente', 0, b'x', 1).status_code == 404
+
+
+def test_streamed_digest_matches_the_result_cache_key(make_app, tmp_path):
+    app = make_app()
+    client = app.test_client()
+    content = 'CAPÍTULO\n\nTexto do documento enviado em partes.\n'.encode('utf-8')
+    upload_id = create_upload(client, len(content))
+    put_chunk(client, upload_id, 0, content[:10], len(content))
+    job_id = put_chunk(client, upload_id, 10, content[10:], len(content)).get_json()['job_id']
+    assert wait_for_job(app.extensions['job_store'], job_id)['status'] == 'completed'
+
+    # A chave calculada lendo o arquivo encontra o resultado guardado com o hash do upload
+    key = ResultCache.make_key(str(tmp_path / 'uploads' / 'doc.txt'), None,
+                               settings_from_config(app.config, app.root_path))
+    assert app.extensions['result_cache'].get(key, str(tmp_path / 'copia.pptx'))